@@ -0,0 +1,4 @@
+from .corpus import CorpusSpec, generate_corpus
+from .harness import compare_results, run_benchmark
+
+__all__ = ["CorpusSpec", "generate_corpus", "run_benchmark", "compare_results"]
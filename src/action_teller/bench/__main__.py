@@ -0,0 +1,139 @@
+import tempfile
+from pathlib import Path
+
+import click
+
+from .corpus import CorpusSpec, generate_corpus
+from .harness import (
+    DEFAULT_THRESHOLD, compare_results, load_results, run_benchmark, run_jobs_benchmark, run_refs_benchmark,
+    save_results,
+)
+
+
+def corpus_options(f):
+    for name, default in reversed(CorpusSpec._field_defaults.items()):
+        f = click.option(
+            f"--{name.replace('_', '-')}",
+            name,
+            type=int,
+            default=default,
+            show_default=True,
+            help=f"Corpus shape: {name.replace('_', ' ')}.",
+        )(f)
+    return f
+
+
+@click.group(context_settings=dict(help_option_names=['-h', '--help']))
+def bench():
+    """Benchmark cifolio over a synthetic or real corpus."""
+
+
+@bench.command()
+@click.argument("out", type=click.Path(file_okay=False, path_type=Path))
+@corpus_options
+def generate(out, **shape):
+    """Write a deterministic synthetic corpus to OUT."""
+    counts = generate_corpus(out, CorpusSpec(**shape))
+    click.echo(", ".join(f"{v} {k}" for k, v in counts.items()) + f" written to {out}")
+
+
+@bench.command()
+@click.option("--corpus", "corpus_dir", type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help="Benchmark an existing tree instead of generating one.")
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option("--json", "json_out", type=click.Path(dir_okay=False, path_type=Path),
+              help="Write machine-readable results here.")
+@corpus_options
+def run(corpus_dir, repeat, json_out, **shape):
+    """Time discovery, parsing, rendering and writing."""
+    if corpus_dir is not None:
+        results = run_benchmark(corpus_dir, repeat=repeat, corpus={"path": str(corpus_dir)})
+    else:
+        spec = CorpusSpec(**shape)
+        with tempfile.TemporaryDirectory(prefix="cifolio-corpus-") as tmp:
+            generate_corpus(Path(tmp), spec)
+            results = run_benchmark(Path(tmp), repeat=repeat, corpus=spec._asdict())
+    click.echo(f"{results['files']} file(s), {results['docs']} doc(s), {results['repeat']} run(s)")
+    for phase, t in results["phases"].items():
+        click.echo(f"  {phase:<10} median {t['median'] * 1000:9.2f} ms   min {t['min'] * 1000:9.2f} ms")
+    if json_out:
+        save_results(results, json_out)
+        click.echo(f"Wrote {json_out}")
+
+
+@bench.command()
+@click.option("--corpus", "corpus_dir", type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help="Benchmark an existing tree instead of generating one.")
+@click.option("--workers", "-w", type=click.IntRange(min=0), default=0, show_default=True,
+              help="Pool size to compare against a serial build (0 = one per CPU core).")
+@click.option("--repeat", type=click.IntRange(min=1), default=3, show_default=True)
+@click.option("--json", "json_out", type=click.Path(dir_okay=False, path_type=Path),
+              help="Write machine-readable results here.")
+@corpus_options
+def pool(corpus_dir, workers, repeat, json_out, **shape):
+    """Time the full build with a process pool against --jobs 1."""
+    if corpus_dir is not None:
+        results = run_jobs_benchmark(corpus_dir, jobs=workers, repeat=repeat, corpus={"path": str(corpus_dir)})
+    else:
+        spec = CorpusSpec(**shape)
+        with tempfile.TemporaryDirectory(prefix="cifolio-corpus-") as tmp:
+            generate_corpus(Path(tmp), spec)
+            results = run_jobs_benchmark(Path(tmp), jobs=workers, repeat=repeat, corpus=spec._asdict())
+    click.echo(f"{results['files']} file(s), {results['docs']} doc(s), {results['repeat']} run(s)")
+    for label, t in results["modes"].items():
+        click.echo(f"  {label:<6} -j {t['jobs']:<3} median {t['median'] * 1000:9.2f} ms   min {t['min'] * 1000:9.2f} ms")
+    if results["speedup"] is not None:
+        click.echo(f"  speedup x{results['speedup']:.2f}")
+    if json_out:
+        save_results(results, json_out)
+        click.echo(f"Wrote {json_out}")
+
+
+@bench.command()
+@click.option("--corpus", "corpus_dir", type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help="Benchmark an existing tree instead of generating one.")
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option("--json", "json_out", type=click.Path(dir_okay=False, path_type=Path),
+              help="Write machine-readable results here.")
+@corpus_options
+def refs(corpus_dir, repeat, json_out, **shape):
+    """Time one-pass reference extraction against the old json.dumps + regex scans."""
+    if corpus_dir is not None:
+        results = run_refs_benchmark(corpus_dir, repeat=repeat, corpus={"path": str(corpus_dir)})
+    else:
+        spec = CorpusSpec(**shape)
+        with tempfile.TemporaryDirectory(prefix="cifolio-corpus-") as tmp:
+            generate_corpus(Path(tmp), spec)
+            results = run_refs_benchmark(Path(tmp), repeat=repeat, corpus=spec._asdict())
+    click.echo(f"{results['files']} workflow(s), {results['repeat']} run(s)")
+    for label, t in results["modes"].items():
+        click.echo(f"  {label:<8} median {t['median'] * 1000:9.2f} ms   min {t['min'] * 1000:9.2f} ms")
+    if results["speedup"] is not None:
+        click.echo(f"  speedup x{results['speedup']:.2f}")
+    if json_out:
+        save_results(results, json_out)
+        click.echo(f"Wrote {json_out}")
+
+
+@bench.command()
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--threshold", type=float, default=DEFAULT_THRESHOLD * 100, show_default=True,
+              help="Percent slowdown in a phase median that counts as a regression.")
+def compare(baseline, current, threshold):
+    """Compare two result files; exit 1 if any phase regressed."""
+    rows = compare_results(load_results(baseline), load_results(current), threshold / 100)
+    regressed = False
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        regressed |= r["regression"]
+        click.echo(
+            f"  {r['phase']:<10} {r['baseline'] * 1000:9.2f} ms -> {r['current'] * 1000:9.2f} ms"
+            f"  x{r['ratio']:.2f} {flag}"
+        )
+    if regressed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,164 @@
+import random
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+import yaml
+
+WELL_KNOWN_ACTIONS = [
+    "actions/checkout@v4",
+    "actions/setup-node@v4",
+    "actions/setup-python@v5",
+    "actions/cache@v4",
+    "actions/upload-artifact@v4",
+    "actions/download-artifact@v4",
+    "docker/build-push-action@v6",
+    "aws-actions/configure-aws-credentials@v4",
+]
+
+
+class CorpusSpec(NamedTuple):
+    """Size and shape of a synthetic corpus. The same spec always yields the same files."""
+    actions: int = 200
+    workflows: int = 200
+    noise: int = 100              # non-workflow YAML (k8s manifests and the like)
+    steps: int = 12               # steps per composite action
+    jobs: int = 8                 # jobs per workflow
+    job_steps: int = 6            # steps per job
+    matrix_axes: int = 2
+    matrix_values: int = 3
+    secrets: int = 20             # size of the shared secret/var name pools
+    seed: int = 1
+
+
+def _composite(rng: random.Random, i: int, spec: CorpusSpec) -> Dict[str, Any]:
+    steps: List[Dict[str, Any]] = []
+    for s in range(spec.steps):
+        if rng.random() < 0.4:
+            steps.append({
+                "name": f"Use {s}",
+                "uses": rng.choice(WELL_KNOWN_ACTIONS),
+                "with": {"token": "${{ inputs.token }}"},
+            })
+        else:
+            steps.append({
+                "id": f"s{s}",
+                "name": f"Run {s}",
+                "shell": "bash",
+                "if": "${{ success() }}",
+                "run": "\n".join(
+                    f"echo \"${{{{ inputs.arg{k} }}}} ${{{{ github.sha }}}}\"" for k in range(3)
+                ) + f"\necho \"out{s}=x\" >> $GITHUB_OUTPUT\n",
+            })
+    return {
+        "name": f"composite-{i}",
+        "description": f"Synthetic composite action {i}",
+        "author": "bench",
+        "branding": {"icon": "box", "color": "blue"},
+        "inputs": {
+            f"arg{k}": {"description": f"Argument {k}", "required": k == 0, "default": str(k)}
+            for k in range(5)
+        },
+        "outputs": {
+            f"out{k}": {"description": f"Output {k}", "value": f"${{{{ steps.s{k}.outputs.out{k} }}}}"}
+            for k in range(3)
+        },
+        "runs": {"using": "composite", "steps": steps},
+    }
+
+
+def _node(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "name": f"node-{i}",
+        "description": f"Synthetic node action {i}",
+        "inputs": {"token": {"description": "Token", "required": True}},
+        "runs": {"using": rng.choice(["node16", "node20"]), "main": "dist/index.js", "post": "dist/post.js"},
+    }
+
+
+def _docker(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "name": f"docker-{i}",
+        "description": f"Synthetic docker action {i}",
+        "env": {"LOG_LEVEL": "info"},
+        "runs": {"using": "docker", "image": "Dockerfile", "entrypoint": "/entry.sh", "args": ["--verbose"]},
+    }
+
+
+def _workflow(rng: random.Random, i: int, spec: CorpusSpec) -> Dict[str, Any]:
+    jobs: Dict[str, Any] = {}
+    for j in range(spec.jobs):
+        job: Dict[str, Any] = {"name": f"job {j}", "runs-on": "ubuntu-latest"}
+        if j:
+            job["needs"] = [f"job{k}" for k in rng.sample(range(j), min(j, 2))]
+        if spec.matrix_axes:
+            job["strategy"] = {"matrix": {
+                f"axis{a}": [f"v{v}" for v in range(spec.matrix_values)]
+                for a in range(spec.matrix_axes)
+            }}
+        steps: List[Dict[str, Any]] = [{"uses": "actions/checkout@v4"}]
+        for s in range(spec.job_steps):
+            secret = f"SECRET_{rng.randrange(spec.secrets)}"
+            var = f"VAR_{rng.randrange(spec.secrets)}"
+            steps.append({
+                "id": f"st{s}",
+                "name": f"step {s}",
+                "if": "${{ github.event_name == 'push' }}",
+                "env": {"TOKEN": f"${{{{ secrets.{secret} }}}}", "MODE": f"${{{{ vars.{var} }}}}"},
+                "run": "echo ${{ matrix.axis0 }} ${{ runner.os }} ${{ env.MODE }}",
+            })
+        job["steps"] = steps
+        jobs[f"job{j}"] = job
+    return {
+        "name": f"workflow-{i}",
+        "on": {
+            "push": {"branches": ["main"]},
+            "pull_request": None,
+            "workflow_dispatch": {"inputs": {"debug": {"description": "Debug", "default": "false"}}},
+        },
+        "env": {"GLOBAL": "${{ vars.GLOBAL }}"},
+        "jobs": jobs,
+    }
+
+
+def _noise(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {"name": f"svc-{i}", "labels": {"app": f"svc-{i}"}},
+        "spec": {"replicas": rng.randint(1, 5), "template": {"spec": {"containers": [
+            {"name": f"c{k}", "image": f"registry/svc-{i}:{k}", "env": [{"name": "X", "value": "y"}]}
+            for k in range(5)
+        ]}}},
+    }
+
+
+def _dump(p: Path, data: Dict[str, Any]) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(yaml.safe_dump(data, sort_keys=False, width=120), encoding="utf-8")
+
+
+def generate_corpus(root: Path, spec: CorpusSpec = CorpusSpec()) -> Dict[str, int]:
+    """
+    Write a deterministic synthetic repository under root: a mix of composite,
+    node and docker actions, workflows with many jobs/matrices/secrets, and
+    unrelated YAML. Returns file counts per kind.
+    """
+    rng = random.Random(spec.seed)
+    counts = {"composite": 0, "node": 0, "docker": 0, "workflow": 0, "noise": 0}
+    for i in range(spec.actions):
+        r = rng.random()
+        if r < 0.6:
+            kind, data = "composite", _composite(rng, i, spec)
+        elif r < 0.85:
+            kind, data = "node", _node(rng, i)
+        else:
+            kind, data = "docker", _docker(rng, i)
+        _dump(root / ".github" / "actions" / f"{kind}-{i}" / "action.yml", data)
+        counts[kind] += 1
+    for i in range(spec.workflows):
+        _dump(root / ".github" / "workflows" / f"workflow-{i}.yml", _workflow(rng, i, spec))
+        counts["workflow"] += 1
+    for i in range(spec.noise):
+        _dump(root / "deploy" / f"svc-{i}" / "deployment.yaml", _noise(rng, i))
+        counts["noise"] += 1
+    return counts
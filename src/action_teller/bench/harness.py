@@ -0,0 +1,207 @@
+import json
+import platform
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .. import __version__
+from ..renderers.action_markdown import render_action_doc
+from ..renderers.workflow_markdown import index_references, render_workflow_doc
+from ..utils.pipeline import ACTION, WORKFLOW, DocTask, build_docs, resolve_jobs
+from ..utils.scanner import scan_tree
+from ..utils.writer import DocWriter
+from ..utils.yaml_loader import parse_action_yaml
+from .legacy_refs import legacy_references
+
+RESULTS_FORMAT = 1
+PHASES = ("discovery", "parse", "render", "write")
+DEFAULT_THRESHOLD = 0.10
+
+
+def _timed(fn: Callable[[], Any]):
+    started = time.perf_counter()
+    value = fn()
+    return time.perf_counter() - started, value
+
+
+def _one_run(root: Path) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    timings["discovery"], scan = _timed(lambda: scan_tree(root))
+
+    def parse():
+        parsed = []
+        for kind, files in (("action", scan.actions), ("workflow", scan.workflows)):
+            for f in files:
+                try:
+                    parsed.append((kind, f, parse_action_yaml(f)))
+                except Exception:
+                    pass
+        return parsed
+    timings["parse"], parsed = _timed(parse)
+
+    def render():
+        docs = []
+        for kind, f, data in parsed:
+            if kind == "action":
+                docs.append((f, data.get("name", f.stem), render_action_doc(data, f)))
+            elif isinstance(data, dict) and "on" in data:
+                docs.append((f, data.get("name", f.stem), render_workflow_doc(data, f)))
+        return docs
+    timings["render"], docs = _timed(render)
+
+    with tempfile.TemporaryDirectory(prefix="cifolio-bench-") as tmp:
+        def write():
+            writer = DocWriter(Path(tmp))
+            for f, name, md in docs:
+                writer.write(writer.add(f, name), {"md": md})
+            writer.write_index()
+        timings["write"], _ = _timed(write)
+
+    timings["files"] = len(scan.actions) + len(scan.workflows)
+    timings["docs"] = len(docs)
+    return timings
+
+
+def run_benchmark(root: Path, repeat: int = 5, corpus: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Time discovery, parsing, rendering and writing over the tree at root,
+    repeat times each, and return a JSON-serializable result document.
+    """
+    runs: List[Dict[str, float]] = [_one_run(root) for _ in range(max(1, repeat))]
+    phases = {}
+    for phase in PHASES:
+        samples = [r[phase] for r in runs]
+        phases[phase] = {
+            "min": min(samples),
+            "median": statistics.median(samples),
+            "mean": statistics.fmean(samples),
+            "samples": samples,
+        }
+    return {
+        "format": RESULTS_FORMAT,
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "root": str(root),
+        "corpus": corpus or {},
+        "files": runs[0]["files"],
+        "docs": runs[0]["docs"],
+        "repeat": len(runs),
+        "phases": phases,
+    }
+
+
+def _build(tasks: List[DocTask], jobs: int) -> int:
+    with tempfile.TemporaryDirectory(prefix="cifolio-bench-") as tmp:
+        writer = DocWriter(Path(tmp))
+        for result in build_docs(tasks, jobs=jobs):
+            if result.outputs is not None:
+                writer.write(writer.add(result.path, result.name), result.outputs)
+        writer.write_index()
+        return writer.count
+
+
+def run_jobs_benchmark(root: Path, jobs: int = 0, repeat: int = 3, corpus: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Time the whole build (parse, render, emit and write, as `--jobs` runs
+    it) serially and with a process pool of jobs workers (0 = one per CPU
+    core), repeat times each, and report the speedup of the medians.
+    """
+    scan = scan_tree(root)
+    tasks = [DocTask(ACTION, f) for f in scan.actions] + [DocTask(WORKFLOW, f) for f in scan.workflows]
+    workers = resolve_jobs(jobs)
+    modes = {}
+    for label, n in (("serial", 1), ("pool", workers)):
+        samples = []
+        for _ in range(max(1, repeat)):
+            seconds, docs = _timed(lambda: _build(tasks, n))
+            samples.append(seconds)
+        modes[label] = {"jobs": n, "min": min(samples), "median": statistics.median(samples), "samples": samples}
+    return {
+        "format": RESULTS_FORMAT,
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "root": str(root),
+        "corpus": corpus or {},
+        "files": len(tasks),
+        "docs": docs,
+        "repeat": max(1, repeat),
+        "modes": modes,
+        "speedup": modes["serial"]["median"] / modes["pool"]["median"] if modes["pool"]["median"] else None,
+    }
+
+
+def run_refs_benchmark(root: Path, repeat: int = 5, corpus: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Time reference extraction over every parsed workflow under root: the old
+    json.dumps + regex scans (legacy_refs) against the one-pass
+    index_references(), repeat times each, and report the speedup of the medians.
+    """
+    workflows = []
+    for f in scan_tree(root).workflows:
+        try:
+            data = parse_action_yaml(f)
+        except Exception:
+            continue
+        if isinstance(data, dict) and "on" in data:
+            workflows.append(data)
+    modes = {}
+    for label, extract in (("legacy", legacy_references), ("one-pass", index_references)):
+        samples = []
+        for _ in range(max(1, repeat)):
+            seconds, _ = _timed(lambda: [extract(data) for data in workflows])
+            samples.append(seconds)
+        modes[label] = {"min": min(samples), "median": statistics.median(samples), "samples": samples}
+    return {
+        "format": RESULTS_FORMAT,
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "root": str(root),
+        "corpus": corpus or {},
+        "files": len(workflows),
+        "repeat": max(1, repeat),
+        "modes": modes,
+        "speedup": modes["legacy"]["median"] / modes["one-pass"]["median"] if modes["one-pass"]["median"] else None,
+    }
+
+
+def save_results(results: Dict[str, Any], p: Path) -> None:
+    p.write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def load_results(p: Path) -> Dict[str, Any]:
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Compare per-phase medians. A phase is flagged as a regression when the
+    current median is more than threshold (a fraction) slower than baseline.
+    """
+    rows = []
+    for phase in PHASES:
+        base = baseline.get("phases", {}).get(phase)
+        cur = current.get("phases", {}).get(phase)
+        if not base or not cur:
+            continue
+        ratio = cur["median"] / base["median"] if base["median"] else float("inf")
+        rows.append({
+            "phase": phase,
+            "baseline": base["median"],
+            "current": cur["median"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
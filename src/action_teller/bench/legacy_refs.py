@@ -0,0 +1,62 @@
+"""
+The reference extraction render_workflow_doc used before index_references():
+json.dumps the whole workflow, then run a separate regex scan per kind of
+reference. Kept verbatim as the baseline for `bench refs` and as the oracle
+the equivalence tests compare index_references() against.
+"""
+import json
+import re
+from typing import Any, List, NamedTuple, Set
+
+from ..renderers.workflow_markdown import KNOWN_CONTEXT_ROOTS
+
+_expr_pattern = re.compile(r"\${{\s*([^}]+)\s*}}")
+_token_pattern = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\b")
+
+
+def _stringify_yaml(yaml_obj: Any) -> str:
+    try:
+        # Dump to JSON-like string for stable searching.
+        return json.dumps(yaml_obj, ensure_ascii=False, indent=2)
+    except Exception:
+        return str(yaml_obj)
+
+
+def _collect_expressions(raw: str) -> List[str]:
+    return [m.group(1) for m in _expr_pattern.finditer(raw)]
+
+
+def _collect_context_roots(exprs: List[str]) -> Set[str]:
+    roots: Set[str] = set()
+    for e in exprs:
+        # Take the first identifier token in the expression as a candidate root
+        for t in _token_pattern.findall(e):
+            if t in KNOWN_CONTEXT_ROOTS:
+                roots.add(t)
+                break
+    return roots
+
+
+def _collect_dotted_refs(raw: str, prefix: str) -> Set[str]:
+    # Find occurrences like secrets.MY_TOKEN, vars.MY_VAR
+    pattern = re.compile(rf"{re.escape(prefix)}\.([A-Za-z_][A-Za-z0-9_]*)")
+    return set(pattern.findall(raw))
+
+
+class LegacyRefs(NamedTuple):
+    expressions: Set[str]
+    contexts: Set[str]
+    secrets: Set[str]
+    vars: Set[str]
+
+
+def legacy_references(data: Any) -> LegacyRefs:
+    """What the old path found in data, in the shape of the matching RefIndex fields."""
+    raw = _stringify_yaml(data)
+    exprs = _collect_expressions(raw)
+    return LegacyRefs(
+        set(exprs),
+        _collect_context_roots(exprs),
+        _collect_dotted_refs(raw, "secrets"),
+        _collect_dotted_refs(raw, "vars"),
+    )
@@ -2,116 +2,191 @@
 import click
 from pathlib import Path
 
+from . import __version__
+
 # import CLI arguments
 from .command_arguments.out import out_option
 from .command_arguments.confluence import confluence_option
+from .command_arguments.format import format_option
+from .command_arguments.catalog import catalog_option
+from .command_arguments.index import index_option
 from .command_arguments.llm_summary import ai_summary_option  # renamed file but same path
-
-# utils
-from .utils.file_finder import find_action_files
-from .utils.yaml_loader import parse_action_yaml
-from .utils.ollama import ollama_summarize
-from .utils.workflow_finder import find_workflow_files
-
-# renderers
-from .renderers import branding, inputs, outputs, runs, permissions, env, defaults
-from .renderers.workflow_markdown import render_workflow_doc
-
-
-@click.command(context_settings=dict(help_option_names=['-h', '--help']))
+from .command_arguments.jobs import jobs_option
+from .command_arguments.cache import cache_option
+from .command_arguments.scan import scan_options
+from .command_arguments.summary_cache import summary_cache_options
+from .command_arguments.summary_scheduler import summary_scheduler_options
+from .command_arguments.watch import watch_options
+from .command_arguments.timings import timings_options
+from .command_arguments.sniff import sniff_options
+from .command_arguments.git_diff import git_diff_options
+from .command_arguments.expand import expand_options
+from .command_arguments.manifest import manifest_option
+from .command_arguments.durations import duration_hints_option
+
+# subcommands
+from .commands.lint import lint
+from .commands.query import query
+from .commands.serve import serve
+
+# Everything else is imported where a mode first needs it, so --help,
+# --version and the subcommands start without loading the YAML loader, the
+# renderers or the summary engines.
+
+
+@click.group(invoke_without_command=True, context_settings=dict(help_option_names=['-h', '--help']))
 @out_option
 @confluence_option
+@format_option
+@catalog_option
+@index_option
 @ai_summary_option
-@click.option("--path", "-p", type=click.Path(exists=True, path_type=Path), default=Path("."), help="Root directory.")
+@summary_cache_options
+@summary_scheduler_options
+@jobs_option
+@cache_option
+@scan_options
+@sniff_options
+@git_diff_options
+@manifest_option
+@expand_options
+@duration_hints_option
+@watch_options
+@timings_options
+@click.option("--path", "-p", type=click.Path(exists=True, path_type=Path), default=Path("."),
+              help="Root directory, or a .zip/.tar(.gz/.bz2/.xz) archive to read without extracting.")
 @click.option("--actions", is_flag=True, help="Generate docs for all GitHub Actions (action.yml files).")
 @click.option("--action", type=click.Path(exists=True, path_type=Path), help="Generate docs for a single Action file.")
 @click.option("--workflows", is_flag=True, help="Generate docs for all workflow YAML files.")
 @click.option("--workflow", type=click.Path(exists=True, path_type=Path), help="Generate docs for a single workflow file.")
-@click.version_option(message="cifolio %(version)s")
-def cli(path, out, confluence, ai_summary, model, actions, action, workflows, workflow):
-    """Generate Markdown docs from GitHub Actions and Workflows."""
-
-    out.mkdir(parents=True, exist_ok=True)
-    docs = []
-
-    # ---------------- ACTIONS ----------------
-    if actions or action:
-        action_files = [action] if action else find_action_files(path)
-        if not action_files:
-            click.echo(f"No action.yml/.yaml found under: {path}", err=True)
-        for f in action_files:
-            try:
-                data = parse_action_yaml(f)
-            except Exception as e:
-                click.echo(f"ERROR parsing {f}: {e}", err=True)
-                continue
-
-            name = data.get("name", f.stem)
-            desc = data.get("description", "")
-            author = data.get("author", "")
-
-            md = [f"# {name}\n"]
-            if desc:
-                md.append(desc + "\n")
-            else:
-                # generate description via AI if no description field
-                if ai_summary:
-                    summary = ollama_summarize(data, model=model)
-                    md.append(f"> {summary}\n")
-
-            if ai_summary and desc:
-                summary = ollama_summarize(data, model=model)
-                md.append(f"> {summary}\n")
-
-            md.append(f"**File:** `{f}`  ")
-            if author:
-                md.append(f"**Author:** `{author}`  ")
-            md.append("\n## Branding\n" + branding.render(data.get("branding", {})))
-            md.append("\n## Inputs\n" + inputs.render(data.get("inputs", {})))
-            md.append("\n## Outputs\n" + outputs.render(data.get("outputs", {})))
-            md.append("\n## Runs\n" + runs.render(data.get("runs", {})))
-            md.append("\n## Permissions\n" + permissions.render(data.get("permissions", {})))
-            md.append("\n## Env\n" + env.render(data.get("env", {})))
-            md.append("\n## Defaults\n" + defaults.render(data.get("defaults", {})))
-            md.append("\n---\n_Generated by cifolio_")
-
-            docs.append((f, name, "\n".join(md)))
-
-    # ---------------- WORKFLOWS ----------------
-    if workflows or workflow:
-        workflow_files = [workflow] if workflow else find_workflow_files(path)
-        if not workflow_files:
-            click.echo(f"No workflow YAML found under: {path}", err=True)
-        for wf in workflow_files:
-            try:
-                data = parse_action_yaml(wf)
-            except Exception as e:
-                click.echo(f"ERROR parsing {wf}: {e}", err=True)
-                continue
-            if not isinstance(data, dict) or "on" not in data:
-                continue
-
-            name = data.get("name", wf.stem)
-            md = render_workflow_doc(
-                data=data,
-                file_path=wf,
-                llm_summary=ai_summary,
-                llm_model=model,
-                summarize_fn=ollama_summarize if ai_summary else None,
-            )
-            docs.append((wf, name, md))
-
-    # ---------------- WRITE OUTPUT ----------------
-    if not docs:
-        click.echo("No documentation generated.")
-        raise SystemExit(2)
-
-    index_lines = ["# CIfolio — Documentation Index", ""]
-    for f, name, md in docs:
-        safe_name = name.replace(" ", "_").replace("/", "_")
-        md_filename = f"{safe_name}.md"
-        (out / md_filename).write_text(md, encoding="utf-8")
-        index_lines.append(f"- [{name}]({md_filename}) — `{f}`")
-
-    (out / "INDEX.md").write_text("\n".join(index_lines), encoding="utf-8")
-    click.echo(f"Wrote {out / 'INDEX.md'} and {len(docs)} file(s) to {out}")
+@click.version_option(__version__, message="cifolio %(version)s")
+def cli(path, out, confluence, formats, catalog, no_index, ai_summary, model, summary_engine, ollama_for, summary_cache, no_summary_cache, summary_cache_max_entries,
+        summary_cache_max_age, ai_concurrency, ai_timeout, ai_deadline, ai_retries, ollama_host, jobs, no_cache, excludes, no_gitignore, no_sniff, github_workflows_only, since, diff_range, manifest, expand_local, expand_depth, duration_hints, watch, watch_poll, poll_interval,
+        timings, timings_top, trace_file, profile, actions, action, workflows, workflow):
+    """Generate docs (Markdown, HTML, Confluence, JSON) from GitHub Actions and Workflows."""
+
+    ctx = click.get_current_context()
+    if ctx.invoked_subcommand is not None:
+        return
+    if out is None:
+        raise click.UsageError("Missing option '--out' / '-o'.")
+    if expand_local and not (manifest or path.is_dir()):
+        raise click.UsageError("--expand-local needs --path to be the repository root directory.")
+    if since and diff_range:
+        raise click.UsageError("Use either --since or --diff, not both.")
+    git_range = f"{since}..HEAD" if since else diff_range
+    if manifest and (watch or git_range or action or workflow):
+        raise click.UsageError("--manifest cannot be combined with --watch, --since/--diff, --action or --workflow.")
+    if manifest and not (actions or workflows):
+        raise click.UsageError("--manifest needs --actions and/or --workflows.")
+    from .utils.archive_source import is_archive
+    from_archive = not manifest and is_archive(path)
+    if from_archive:
+        if watch or git_range or action or workflow or expand_local:
+            raise click.UsageError(
+                "An archive --path cannot be combined with --watch, --since/--diff, --action, --workflow or --expand-local.")
+        if not (actions or workflows):
+            raise click.UsageError("An archive --path needs --actions and/or --workflows.")
+    if git_range:
+        if watch or action or workflow:
+            raise click.UsageError("--since/--diff cannot be combined with --watch, --action or --workflow.")
+        if not (actions or workflows):
+            raise click.UsageError("--since/--diff needs --actions and/or --workflows.")
+        if not path.is_dir():
+            raise click.UsageError("--since/--diff needs --path to be a directory inside a git repository.")
+
+    from .utils import timings as timing
+    from .utils.pipeline import EXTRACTIVE
+    from .commands.build import Build, BuildOptions
+
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        ctx.call_on_close(lambda: _save_profile(profiler, profile))
+        profiler.enable()
+    if timings:
+        recorder = timing.Timings()
+        timing.activate(recorder)
+        ctx.call_on_close(lambda: _report_timings(recorder, trace_file or out / "cifolio-trace.json", timings_top))
+
+    if ollama_for and summary_engine != EXTRACTIVE:
+        raise click.UsageError("--ollama-for needs --summary-engine extractive.")
+    # Pages get a summary with --ai-summary or the extractive engine; llm: some of them come from Ollama.
+    llm = bool(ollama_for) if summary_engine == EXTRACTIVE else ai_summary
+    hints = None
+    if duration_hints:
+        from .utils.matrix import load_duration_hints
+        try:
+            hints = load_duration_hints(duration_hints)
+        except Exception as e:
+            raise click.BadParameter(str(e), param_hint="--duration-hints")
+    if confluence and "confluence" not in formats:
+        formats += ("confluence",)
+    summaries = None
+    if llm and not no_summary_cache:
+        from .utils.summary_cache import SummaryCache, default_summary_cache_path
+        summaries = SummaryCache(
+            summary_cache or default_summary_cache_path(),
+            max_entries=summary_cache_max_entries,
+            max_age_days=summary_cache_max_age,
+        )
+        summaries.evict()  # workers only read, so apply the age limit up front
+    scheduler = None
+    if llm:
+        from .utils.summary_scheduler import SummaryScheduler
+        scheduler = SummaryScheduler(
+            concurrency=ai_concurrency,
+            timeout=ai_timeout,
+            deadline=ai_deadline or None,
+            retries=ai_retries,
+            host=ollama_host,
+            cache=summaries,
+        )
+    build = Build(BuildOptions(
+        path=path, out=out, formats=formats, actions=actions, action=action, workflows=workflows,
+        workflow=workflow, catalog=catalog, index=not no_index, ai_summary=ai_summary, model=model,
+        summary_engine=summary_engine, ollama_for=tuple(ollama_for), jobs=jobs, no_cache=no_cache,
+        excludes=tuple(excludes), use_gitignore=not no_gitignore, sniff=not no_sniff,
+        github_workflows_only=github_workflows_only, git_range=git_range,
+        expand_depth=expand_depth if expand_local else 0, durations=hints, timings=timings,
+    ), scheduler, summaries)
+
+    # Each mode lives in its own module under commands/.
+    if manifest:
+        from .commands.manifest import document_manifest, load_repos
+        document_manifest(build, load_repos(manifest, out))
+        return
+
+    from .commands.document import document_tree
+    writer = document_tree(build, from_archive=from_archive, watch=watch)
+    if watch:
+        from .commands.watch import watch_tree
+        watch_tree(build, writer, poll=watch_poll, poll_interval=poll_interval)
+    build.finish(prune=not git_range)
+
+
+def _save_profile(profiler, p):
+    profiler.disable()
+    profiler.dump_stats(str(p))
+    click.echo(f"Profile written to {p} (inspect with: python -m pstats {p})", err=True)
+
+
+def _report_timings(recorder, trace_path, top):
+    from .utils import timings as timing
+    timing.activate(None)
+    click.echo("Timings (wall ms, net allocated blocks):", err=True)
+    for name, (seconds, blocks) in sorted(recorder.phase_totals().items(), key=lambda kv: -kv[1][0]):
+        click.echo(f"  {name:<28} {seconds * 1000:10.2f} ms {blocks:>10}", err=True)
+    slowest = recorder.slowest_files(top)
+    if slowest:
+        click.echo(f"Slowest {len(slowest)} file(s):", err=True)
+        for f, total, parts in slowest:
+            detail = ", ".join(f"{k} {v * 1000:.2f}" for k, v in sorted(parts.items()))
+            click.echo(f"  {total * 1000:10.2f} ms  {f}  ({detail})", err=True)
+    recorder.write_trace(trace_path)
+    click.echo(f"Trace written to {trace_path}", err=True)
+
+
+cli.add_command(lint)
+cli.add_command(query)
+cli.add_command(serve)
@@ -0,0 +1,9 @@
+import click
+
+def cache_option(f):
+    return click.option(
+        "--no-cache",
+        "no_cache",
+        is_flag=True,
+        help="Ignore the build cache in the output directory and re-render every file."
+    )(f)
@@ -0,0 +1,13 @@
+import click
+from pathlib import Path
+
+def catalog_option(f):
+    return click.option(
+        "--catalog",
+        type=click.Path(dir_okay=False, allow_dash=True, path_type=Path),
+        default=None,
+        metavar="FILE",
+        help="Write one JSON record per action/workflow (schema cifolio.catalog/1) "
+             "to this NDJSON file; it is replaced as a whole when the run finishes. "
+             "Use '-' to stream records to stdout as files are processed.",
+    )(f)
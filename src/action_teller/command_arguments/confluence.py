@@ -4,5 +4,5 @@ def confluence_option(f):
     return click.option(
         "--confluence",
         is_flag=True,
-        help="Confluence-friendly Markdown (plain tables)."
+        help="Also write Confluence storage-format pages (same as adding 'confluence' to --format)."
     )(f)
@@ -0,0 +1,10 @@
+import click
+from pathlib import Path
+
+def duration_hints_option(f):
+    return click.option(
+        "--duration-hints",
+        type=click.Path(exists=True, dir_okay=False, path_type=Path),
+        help="YAML file of minutes per job instance (by job id or WORKFLOW:JOB, plus 'default'); "
+             "adds runner-minute estimates to workflow docs and the run summary.",
+    )(f)
@@ -0,0 +1,19 @@
+import click
+
+from ..utils.option_defaults import DEFAULT_EXPAND_DEPTH
+
+def expand_options(f):
+    f = click.option(
+        "--expand-local",
+        is_flag=True,
+        help="Inline the steps of local composite actions and reusable workflows "
+             "(uses: ./...) under the steps that call them. References resolve against --path.",
+    )(f)
+    f = click.option(
+        "--expand-depth",
+        type=click.IntRange(min=1),
+        default=DEFAULT_EXPAND_DEPTH,
+        show_default=True,
+        help="With --expand-local, how many levels of nested local references to expand.",
+    )(f)
+    return f
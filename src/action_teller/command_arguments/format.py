@@ -0,0 +1,31 @@
+import click
+
+from ..utils.option_defaults import FORMATS
+
+
+def _split_formats(ctx, param, value):
+    formats = []
+    for part in value.split(","):
+        fmt = part.strip().lower()
+        if not fmt:
+            continue
+        if fmt not in FORMATS:
+            raise click.BadParameter(f"unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+        if fmt not in formats:
+            formats.append(fmt)
+    if not formats:
+        raise click.BadParameter("at least one format is required")
+    return tuple(formats)
+
+
+def format_option(f):
+    return click.option(
+        "--format",
+        "formats",
+        default="md",
+        show_default=True,
+        callback=_split_formats,
+        metavar="FMT[,FMT...]",
+        help=f"Comma-separated output formats ({', '.join(FORMATS)}). "
+             "Each file is parsed and built once, then emitted in every format.",
+    )(f)
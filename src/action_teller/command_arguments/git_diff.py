@@ -0,0 +1,16 @@
+import click
+
+def git_diff_options(f):
+    f = click.option(
+        "--since",
+        metavar="REF",
+        help="Only document action/workflow files changed between REF and HEAD "
+             "(read from git objects, no checkout). INDEX.md is updated in place.",
+    )(f)
+    f = click.option(
+        "--diff",
+        "diff_range",
+        metavar="BASE..HEAD",
+        help="Like --since, for an explicit range; BASE...HEAD compares against the merge base.",
+    )(f)
+    return f
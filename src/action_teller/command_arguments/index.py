@@ -0,0 +1,8 @@
+import click
+
+def index_option(f):
+    return click.option(
+        "--no-index",
+        is_flag=True,
+        help="Do not maintain the SQLite query index (.cifolio-index.sqlite3) in the output directory.",
+    )(f)
@@ -0,0 +1,10 @@
+import click
+
+def jobs_option(f):
+    return click.option(
+        "--jobs", "-j",
+        type=click.IntRange(min=0),
+        default=1,
+        show_default=True,
+        help="Parse and render files in N worker processes (0 = one per CPU core)."
+    )(f)
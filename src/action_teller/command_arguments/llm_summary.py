@@ -1,6 +1,22 @@
 import click
 
 def ai_summary_option(f):
+    f = click.option(
+        "--ollama-for",
+        "ollama_for",
+        multiple=True,
+        metavar="GLOB",
+        help="With --summary-engine extractive, summarize files matching GLOB (relative to --path) "
+             "with Ollama instead. Repeatable.",
+    )(f)
+    f = click.option(
+        "--summary-engine",
+        type=click.Choice(["ollama", "extractive"]),
+        default="ollama",
+        show_default=True,
+        help="ollama: summaries from a local model with --ai-summary. extractive: a deterministic "
+             "summary from the parsed file on every page, offline, no --ai-summary needed.",
+    )(f)
     f = click.option(
         "--ai-summary",
         is_flag=True,
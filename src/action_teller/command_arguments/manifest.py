@@ -0,0 +1,10 @@
+import click
+from pathlib import Path
+
+def manifest_option(f):
+    return click.option(
+        "--manifest",
+        type=click.Path(exists=True, dir_okay=False, path_type=Path),
+        help="Batch mode: document every repository listed in this YAML file in one process, "
+             "each into its own directory under --out, with a shared worker pool and caches.",
+    )(f)
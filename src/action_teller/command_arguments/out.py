@@ -4,7 +4,6 @@ from pathlib import Path
 def out_option(f):
     return click.option(
         "--out", "-o",
-        required=True,
         type=click.Path(path_type=Path),
-        help="Output directory for Markdown files."
+        help="Output directory for generated docs (required unless a subcommand is given)."
     )(f)
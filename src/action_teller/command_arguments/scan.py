@@ -0,0 +1,17 @@
+import click
+
+def scan_options(f):
+    f = click.option(
+        "--exclude",
+        "excludes",
+        multiple=True,
+        metavar="DIR",
+        help="Directory name or root-relative path to skip while scanning (repeatable). "
+             "Added to the built-in list (.git, node_modules, ...).",
+    )(f)
+    f = click.option(
+        "--no-gitignore",
+        is_flag=True,
+        help="Do not honour .gitignore files while scanning.",
+    )(f)
+    return f
@@ -0,0 +1,16 @@
+import click
+
+def sniff_options(f):
+    f = click.option(
+        "--no-sniff",
+        is_flag=True,
+        help="Fully parse every YAML file in workflow mode instead of first "
+             "checking for a top-level 'on:' key. Only 'on:' is required, not 'jobs:', "
+             "the same rule applied after parsing.",
+    )(f)
+    f = click.option(
+        "--github-workflows-only",
+        is_flag=True,
+        help="In workflow mode, only consider files inside .github/workflows directories.",
+    )(f)
+    return f
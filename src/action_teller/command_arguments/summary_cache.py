@@ -0,0 +1,33 @@
+import click
+from pathlib import Path
+
+from ..utils.option_defaults import DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_ENTRIES
+
+def summary_cache_options(f):
+    f = click.option(
+        "--summary-cache",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="SQLite file caching AI summaries between runs "
+             "(default: $XDG_CACHE_HOME/cifolio/summaries.sqlite3).",
+    )(f)
+    f = click.option(
+        "--no-summary-cache",
+        is_flag=True,
+        help="Always call the model instead of reusing cached AI summaries.",
+    )(f)
+    f = click.option(
+        "--summary-cache-max-entries",
+        type=click.IntRange(min=0),
+        default=DEFAULT_MAX_ENTRIES,
+        show_default=True,
+        help="Evict least recently used summaries beyond this many entries (0 = unlimited).",
+    )(f)
+    f = click.option(
+        "--summary-cache-max-age",
+        type=click.FloatRange(min=0),
+        default=DEFAULT_MAX_AGE_DAYS,
+        show_default=True,
+        help="Drop cached summaries older than this many days (0 = never).",
+    )(f)
+    return f
@@ -0,0 +1,40 @@
+import click
+
+from ..utils.option_defaults import DEFAULT_CONCURRENCY, DEFAULT_RETRIES, DEFAULT_TIMEOUT
+
+def summary_scheduler_options(f):
+    f = click.option(
+        "--ai-concurrency",
+        type=click.IntRange(min=1),
+        default=DEFAULT_CONCURRENCY,
+        show_default=True,
+        help="Maximum number of AI summary requests in flight at once.",
+    )(f)
+    f = click.option(
+        "--ai-timeout",
+        type=click.FloatRange(min=0, min_open=True),
+        default=DEFAULT_TIMEOUT,
+        show_default=True,
+        help="Timeout in seconds for a single AI summary request.",
+    )(f)
+    f = click.option(
+        "--ai-deadline",
+        type=click.FloatRange(min=0),
+        default=0,
+        help="Seconds the whole run may spend waiting on AI summaries; "
+             "late summaries get a placeholder (0 = no deadline).",
+    )(f)
+    f = click.option(
+        "--ai-retries",
+        type=click.IntRange(min=0),
+        default=DEFAULT_RETRIES,
+        show_default=True,
+        help="Retries per AI summary request after a timeout, connection error or 5xx answer, with exponential backoff.",
+    )(f)
+    f = click.option(
+        "--ollama-host",
+        default=None,
+        envvar="OLLAMA_HOST",
+        help="Ollama server URL (default: the ollama client's default, or $OLLAMA_HOST).",
+    )(f)
+    return f
@@ -0,0 +1,31 @@
+import click
+from pathlib import Path
+
+def timings_options(f):
+    f = click.option(
+        "--timings",
+        is_flag=True,
+        help="Record per-phase and per-file wall time and allocations; "
+             "print the slowest files and write a JSON trace.",
+    )(f)
+    f = click.option(
+        "--timings-top",
+        type=click.IntRange(min=0),
+        default=10,
+        show_default=True,
+        help="Number of slowest files to list with --timings.",
+    )(f)
+    f = click.option(
+        "--trace-file",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="Where --timings writes its trace-event JSON (default: <out>/cifolio-trace.json).",
+    )(f)
+    f = click.option(
+        "--profile",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="Run under cProfile and save pstats data to this file "
+             "(main process only; combine with --jobs 1 for full coverage).",
+    )(f)
+    return f
@@ -0,0 +1,24 @@
+import click
+
+from ..utils.option_defaults import DEFAULT_POLL_INTERVAL
+
+def watch_options(f):
+    f = click.option(
+        "--watch",
+        is_flag=True,
+        help="Keep running and re-render only the files that change.",
+    )(f)
+    f = click.option(
+        "--poll",
+        "watch_poll",
+        is_flag=True,
+        help="With --watch, poll file stats instead of using inotify.",
+    )(f)
+    f = click.option(
+        "--poll-interval",
+        type=click.FloatRange(min=0, min_open=True),
+        default=DEFAULT_POLL_INTERVAL,
+        show_default=True,
+        help="Seconds between polls when --watch is polling.",
+    )(f)
+    return f
@@ -0,0 +1,24 @@
+"""An archive given as --path (or as a manifest repository), streamed without extracting."""
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from ..utils.archive_source import archive_members
+from ..utils.pipeline import DocTask
+from ..utils.scanner import DEFAULT_EXCLUDES
+from .build import Build
+
+
+def archive_tasks(build: Build, root: Optional[Path] = None, found: Optional[List[Path]] = None) -> Iterator[DocTask]:
+    """
+    Tasks for the action and workflow members of root (default --path), in
+    archive order; each member is read only when the build reaches it and,
+    with found, its path is appended there. Raises ArchiveError.
+    """
+    o = build.opts
+    root = o.path if root is None else root
+    for member in archive_members(root, want_actions=o.actions, want_workflows=o.workflows,
+                                  excludes=DEFAULT_EXCLUDES + tuple(o.excludes)):
+        for t in build.content_tasks(member.path, member.content, root):
+            if found is not None:
+                found.append(t.path)
+            yield t
@@ -0,0 +1,233 @@
+"""
+State shared by the documentation modes of the root command (a directory
+tree, --since/--diff, an archive --path, --manifest and --watch): the
+validated options, the build cache, query index and summary scheduler, and
+how a file becomes a DocTask. Each mode lives in its own module next to this
+one and takes a Build.
+"""
+from contextlib import nullcontext
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import click
+
+from ..utils.build_cache import BuildCache
+from ..utils.file_finder import YAML_FILENAMES
+from ..utils.pipeline import ACTION, EXTRACTIVE, OLLAMA, WORKFLOW, DocTask
+from ..utils.workflow_finder import CANDIDATE_EXTS
+from ..utils.workflow_sniffer import in_workflows_dir, looks_like_workflow, looks_like_workflow_bytes
+
+
+class BuildOptions(NamedTuple):
+    """The root command's options that shape a build, once validated."""
+    path: Path                              # directory, archive, or the root a single file belongs to
+    out: Path
+    formats: Tuple[str, ...] = ("md",)
+    actions: bool = False
+    action: Optional[Path] = None           # one action file instead of a scan
+    workflows: bool = False
+    workflow: Optional[Path] = None         # one workflow file instead of a scan
+    catalog: Optional[Path] = None          # NDJSON file, or "-" for stdout
+    index: bool = True                      # keep the SQLite query index in out
+    ai_summary: bool = False
+    model: str = "mistral"
+    summary_engine: str = OLLAMA
+    ollama_for: Tuple[str, ...] = ()        # with EXTRACTIVE: globs summarized by Ollama instead
+    jobs: int = 1
+    no_cache: bool = False
+    excludes: Tuple[str, ...] = ()          # on top of scanner.DEFAULT_EXCLUDES
+    use_gitignore: bool = True
+    sniff: bool = True
+    github_workflows_only: bool = False
+    git_range: Optional[str] = None         # BASE..HEAD with --since/--diff
+    expand_depth: int = 0                   # levels of local `uses:` to inline; 0 = --expand-local off
+    durations: Optional[Dict[str, float]] = None
+    timings: bool = False
+
+
+def new_stats() -> Dict[str, Any]:
+    return {"summary_hits": 0, "summary_misses": 0, "errors": 0,
+            "workflows": 0, "instances": 0, "runner_minutes": 0.0, "unhinted": 0}
+
+
+def catalog_sink(path: Optional[Path], update: bool = False):
+    """Open a catalog sink for path (CatalogUpdate to patch it, else CatalogWriter), or nothing without --catalog."""
+    if path is None:
+        return nullcontext()
+    from ..utils.catalog import CatalogUpdate, CatalogWriter
+    return (CatalogUpdate if update else CatalogWriter)(path)
+
+
+class Build:
+    """
+    One run of the root command. Opens the build cache and query index in
+    the output directory; scheduler and summaries, when AI summaries are on,
+    are the SummaryScheduler and SummaryCache the run's documents wait on.
+    """
+
+    def __init__(self, opts: BuildOptions, scheduler=None, summaries=None):
+        self.opts = opts
+        self.scheduler = scheduler
+        self.summaries = summaries
+        # Pages get a summary with --ai-summary or the extractive engine.
+        self.extractive = opts.summary_engine == EXTRACTIVE
+        self.stats = new_stats()
+        # Workers keep one expansion memo per run; a new run id (each --watch pass) starts it afresh.
+        self.expand_run = 0
+        opts.out.mkdir(parents=True, exist_ok=True)
+        # With --manifest, the index at the top of --out covers every repository.
+        self.query_index = None
+        if opts.index:
+            from ..utils.index_db import INDEX_FILENAME, IndexDB
+            self.query_index = IndexDB(opts.out / INDEX_FILENAME)
+        # Keys are source paths, so one cache serves every repository of a manifest.
+        self.cache = BuildCache(opts.out, options=self.cache_options(), fresh=opts.no_cache)
+
+    def cache_options(self) -> Dict[str, Any]:
+        """Everything besides file content that changes the output; cached entries are reused only when it matches."""
+        o = self.opts
+        return {"formats": list(o.formats), "catalog": o.catalog is not None, "index": o.index,
+                "ai_summary": o.ai_summary or self.extractive, "summary_engine": o.summary_engine,
+                "ollama_for": sorted(o.ollama_for), "model": o.model, "expand": o.expand_depth,
+                "durations": o.durations}
+
+    # ---------------- tasks ----------------
+
+    def engine_for(self, f: Path, root: Path) -> str:
+        if not self.extractive:
+            return OLLAMA
+        try:
+            rel = f.relative_to(root).as_posix()
+        except ValueError:
+            rel = f.as_posix()
+        return OLLAMA if any(fnmatch(rel, pattern) for pattern in self.opts.ollama_for) else EXTRACTIVE
+
+    def task(self, kind: str, f: Path, root: Optional[Path] = None) -> DocTask:
+        o = self.opts
+        root = o.path if root is None else root
+        engine = self.engine_for(f, root)
+        return DocTask(kind, f, o.ai_summary or self.extractive, o.model,
+                       self.summaries.path if self.summaries else None, defer_summaries=engine == OLLAMA,
+                       timings=o.timings, formats=o.formats, catalog=o.catalog is not None,
+                       index=self.query_index is not None,
+                       expand=(root, o.expand_depth, self.expand_run) if o.expand_depth else None,
+                       durations=o.durations, summary_engine=engine)
+
+    def likely_workflow(self, f: Path) -> bool:
+        # Files under .github/workflows go straight to the parser.
+        if self.opts.github_workflows_only and not in_workflows_dir(f):
+            return False
+        return not self.opts.sniff or in_workflows_dir(f) or looks_like_workflow(f)
+
+    @staticmethod
+    def kind_of(f: Path) -> str:
+        return ACTION if f.name in YAML_FILENAMES else WORKFLOW
+
+    def content_tasks(self, f: Path, content: bytes, root: Optional[Path] = None) -> Iterator[DocTask]:
+        """Tasks for a file whose content does not come from disk (git blob, archive member)."""
+        o = self.opts
+        if o.actions and f.name in YAML_FILENAMES:
+            yield self.task(ACTION, f, root)._replace(content=content)
+        if o.workflows and f.suffix.lower() in CANDIDATE_EXTS and not (o.github_workflows_only and not in_workflows_dir(f)) and (
+                not o.sniff or in_workflows_dir(f) or looks_like_workflow_bytes(content)):
+            yield self.task(WORKFLOW, f, root)._replace(content=content)
+
+    # ---------------- results ----------------
+
+    def remove(self, key: Tuple[str, Path], writer, records=None) -> None:
+        """Drop a document that no longer exists from the docs, the catalog and the query index."""
+        writer.remove(key)
+        if records is not None:
+            records.remove(key)
+        if self.query_index is not None:
+            self.query_index.remove(*key)
+
+    def write_results(self, results, writer, records=None) -> List[tuple]:
+        """
+        Write finished documents, stream their catalog records and update the
+        query index; return the documents still waiting on AI summaries.
+        """
+        from ..utils import timings as timing
+        stats = self.stats
+        awaiting_summary = []
+        recorder = timing.active()
+        for result in results:
+            if recorder is not None and result.spans:
+                recorder.extend(result.spans)
+            if result.runner is not None:
+                instances, minutes, unhinted = result.runner
+                stats["workflows"] += 1
+                stats["instances"] += instances
+                stats["runner_minutes"] += minutes
+                stats["unhinted"] += unhinted
+            stats["summary_hits"] += result.summary_hits
+            stats["summary_misses"] += result.summary_misses
+            key = (result.kind, result.path)
+            if result.error is not None:
+                click.echo(f"ERROR parsing {result.path}: {result.error}", err=True)
+                stats["errors"] += 1
+                continue
+            if result.outputs is None:
+                self.remove(key, writer, records)
+                continue
+            if records is not None and result.catalog is not None:
+                records.add(key, result.catalog)
+            if self.query_index is not None:
+                self.query_index.update(result.kind, result.path, result.digest, result.facts)
+            stem = writer.add(result.path, result.name, key=key)
+            if result.pending:
+                # Summaries start generating while the remaining files are still rendering.
+                for _, summary_model, prompt in result.pending:
+                    self.scheduler.submit(summary_model, prompt)
+                awaiting_summary.append((result, stem))
+            else:
+                writer.write(stem, result.outputs, source=result.path)
+        return awaiting_summary
+
+    def resolve_summaries(self, awaiting_summary: List[tuple], writer) -> None:
+        if not awaiting_summary:
+            return
+        from ..emitters import emit_all
+        from ..utils.pipeline import store_result
+        for result, stem in awaiting_summary:
+            keys = [key for key, _, _ in result.pending]
+            doc = self.scheduler.resolve(result.document, keys)
+            outputs = emit_all(doc, result.outputs)
+            writer.write(stem, outputs, source=result.path)
+            if result.digest and self.scheduler.succeeded(keys):
+                store_result(self.cache, result, outputs)
+
+    # ---------------- reports ----------------
+
+    def report_runners(self) -> None:
+        stats = self.stats
+        if not stats["workflows"]:
+            return
+        line = f"Runners: {stats['instances']} job instance(s) across {stats['workflows']} workflow(s), one run each"
+        if self.opts.durations and stats["unhinted"] < stats["instances"]:
+            line += f", ≈ {stats['runner_minutes']:.0f} runner-minute(s)"
+            if stats["unhinted"]:
+                line += f" ({stats['unhinted']} instance(s) without a duration hint)"
+        click.echo(line + ".", err=True)
+
+    def finish(self, prune: bool = True) -> None:
+        """Stop the scheduler and save and close the caches and the index; prune=False keeps unseen entries."""
+        scheduler = self.scheduler
+        if scheduler is not None:
+            scheduler.shutdown()
+            if scheduler.failed or scheduler.timed_out:
+                click.echo(
+                    f"AI summaries: {scheduler.failed} failed, {scheduler.timed_out} missed the deadline.",
+                    err=True,
+                )
+        self.cache.save(prune)
+        if self.query_index is not None:
+            self.query_index.save(prune)
+        if self.summaries is not None:
+            self.summaries.evict()
+            self.summaries.close()
+            click.echo(
+                f"Summary cache: {self.stats['summary_hits']} hit(s), {self.stats['summary_misses']} miss(es).",
+                err=True,
+            )
@@ -0,0 +1,60 @@
+"""Finding the files of a directory tree: one scan serves --actions and --workflows."""
+from pathlib import Path
+from typing import List, Optional
+
+import click
+
+from ..utils import timings as timing
+from ..utils.pipeline import ACTION, WORKFLOW, DocTask
+from ..utils.scanner import DEFAULT_EXCLUDES, ScanResult, scan_tree
+from .build import Build
+
+
+def discover(build: Build, root: Optional[Path] = None) -> Optional[ScanResult]:
+    """Scan root (default --path) for whatever --actions/--workflows ask for; None when a single file replaces both."""
+    o = build.opts
+    want_actions = o.actions and not o.action
+    want_workflows = o.workflows and not o.workflow
+    if not (want_actions or want_workflows):
+        return None
+    return scan_tree(
+        o.path if root is None else root,
+        want_actions=want_actions,
+        want_workflows=want_workflows,
+        excludes=DEFAULT_EXCLUDES + tuple(o.excludes),
+        use_gitignore=o.use_gitignore,
+    )
+
+
+def repo_tasks(build: Build, root: Path) -> List[DocTask]:
+    """Tasks for every action and likely workflow under root, without messages (one repository of a manifest)."""
+    scan = discover(build, root)
+    tasks = [build.task(ACTION, f, root) for f in (scan.actions if build.opts.actions else [])]
+    tasks += [build.task(WORKFLOW, f, root) for f in (scan.workflows if build.opts.workflows else [])
+              if build.likely_workflow(f)]
+    return tasks
+
+
+def tree_tasks(build: Build, scan: Optional[ScanResult]) -> List[DocTask]:
+    """Tasks for --actions/--action and --workflows/--workflow, saying what was skipped or not found."""
+    o = build.opts
+    tasks: List[DocTask] = []
+    if o.actions or o.action:
+        action_files = [o.action] if o.action else scan.actions
+        if not action_files:
+            click.echo(f"No action.yml/.yaml found under: {o.path}", err=True)
+        tasks.extend(build.task(ACTION, f) for f in action_files)
+
+    if o.workflows or o.workflow:
+        if o.workflow:
+            workflow_files = [o.workflow]
+        else:
+            with timing.span("sniff"):
+                workflow_files = [wf for wf in scan.workflows if build.likely_workflow(wf)]
+            skipped = len(scan.workflows) - len(workflow_files)
+            if skipped:
+                click.echo(f"Skipped {skipped} non-workflow YAML file(s) without parsing.", err=True)
+        if not workflow_files:
+            click.echo(f"No workflow YAML found under: {o.path}", err=True)
+        tasks.extend(build.task(WORKFLOW, wf) for wf in workflow_files)
+    return tasks
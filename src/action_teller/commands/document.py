@@ -0,0 +1,82 @@
+"""Documenting one tree: a directory, a single file, an archive --path or a --since/--diff range."""
+from itertools import chain
+
+import click
+
+from ..utils import timings as timing
+from ..utils.archive_source import ArchiveError
+from ..utils.git_source import GitError
+from ..utils.pipeline import build_docs
+from ..utils.writer import DocWriter
+from .archive import archive_tasks
+from .build import Build, catalog_sink
+from .discover import discover, tree_tasks
+from .git import git_tasks
+
+
+def document_tree(build: Build, from_archive: bool = False, watch: bool = False) -> DocWriter:
+    """
+    Build, write and index every document of --path and return the writer.
+    Without anything to document (and unless --watch or a git range keeps
+    the run meaningful), finishes the build and exits with status 2.
+    """
+    o = build.opts
+    writer = DocWriter(o.out, o.formats)
+    tasks, deleted = [], []
+    # Git blobs and archive members are read as the build reaches them, not up front.
+    streamed = ()
+    members = []
+    with timing.span("discovery"):
+        if o.git_range:
+            try:
+                git_changed, streamed, deleted = git_tasks(build)
+            except GitError as e:
+                raise click.ClickException(f"git: {e}")
+            writer.load_index(build.kind_of)
+            click.echo(f"{len(git_changed)} changed and {len(deleted)} deleted file(s) in {o.git_range}.", err=True)
+        elif from_archive:
+            streamed = archive_tasks(build, found=members)
+        scan = None if o.git_range or from_archive else discover(build)
+    if not (o.git_range or from_archive):
+        tasks = tree_tasks(build, scan)
+
+    # Each document is written as soon as it is rendered; only index entries
+    # (and documents still waiting on an AI summary) stay in memory.
+    # With --catalog -, stdout carries the NDJSON stream, so messages go to stderr.
+    catalog_on_stdout = o.catalog is not None and str(o.catalog) == "-"
+    # A --since/--diff run only sees some files, so it patches the existing catalog.
+    with catalog_sink(o.catalog, update=bool(o.git_range)) as records, \
+            timing.span("parse+render+write"):
+        for key in deleted:
+            build.remove(key, writer, records)
+        try:
+            awaiting_summary = build.write_results(
+                build_docs(chain(tasks, streamed), jobs=o.jobs, cache=build.cache), writer, records,
+            )
+        except GitError as e:
+            raise click.ClickException(f"git: {e}")
+        except ArchiveError as e:
+            raise click.ClickException(str(e))
+    if from_archive and not members:
+        click.echo(f"No action or workflow files found in archive: {o.path}", err=True)
+    with timing.span("summaries"):
+        build.resolve_summaries(awaiting_summary, writer)
+
+    if not writer.count and not watch and not o.git_range:
+        build.finish()
+        click.echo("No documentation generated.", err=catalog_on_stdout)
+        raise SystemExit(2)
+
+    with timing.span("index"):
+        index = writer.write_index()
+    click.echo(f"Wrote {index} and {writer.count} file(s) to {o.out}", err=catalog_on_stdout)
+    if o.catalog is not None and not catalog_on_stdout:
+        click.echo(f"Wrote catalog {o.catalog} ({records.count} record(s))", err=True)
+    click.echo(
+        f"Cache: {build.cache.hits} hit(s), {build.cache.misses} miss(es); {writer.changed} file(s) changed.",
+        err=True,
+    )
+    if build.query_index is not None:
+        click.echo(f"Index: {build.query_index.updated} file(s) re-indexed in {build.query_index.path}", err=True)
+    build.report_runners()
+    return writer
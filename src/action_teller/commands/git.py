@@ -0,0 +1,37 @@
+"""--since/--diff: only the files changed in a git range, read straight from the object database."""
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from ..utils.file_finder import YAML_FILENAMES
+from ..utils.git_source import BlobReader, GitChange, changed_files
+from ..utils.pipeline import ACTION, WORKFLOW, DocTask
+from ..utils.scanner import DEFAULT_EXCLUDES, excluded_path
+from ..utils.workflow_finder import CANDIDATE_EXTS
+from .build import Build
+
+
+def git_tasks(build: Build) -> Tuple[List[GitChange], Iterator[DocTask], List[Tuple[str, Path]]]:
+    """
+    The changed files of --since/--diff, a stream of their tasks and the
+    (kind, path) keys of deleted documents. Raises GitError; each blob is
+    read only when the build reaches it.
+    """
+    o = build.opts
+    changed, deleted = [], []
+    skip = DEFAULT_EXCLUDES + tuple(o.excludes)
+    for change in changed_files(o.path, o.git_range):
+        f = change.path
+        if excluded_path(f.relative_to(o.path).as_posix(), skip):
+            continue
+        is_action = o.actions and f.name in YAML_FILENAMES
+        is_workflow = o.workflows and f.suffix.lower() in CANDIDATE_EXTS
+        if change.blob is None:
+            deleted.extend((kind, f) for kind, wanted in ((ACTION, is_action), (WORKFLOW, is_workflow)) if wanted)
+        elif is_action or is_workflow:
+            changed.append(change)
+
+    def read():
+        with BlobReader(o.path) as blobs:
+            for change in changed:
+                yield from build.content_tasks(change.path, blobs.read(change.blob))
+    return changed, read(), deleted
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import click
+
+from ..command_arguments.scan import scan_options
+from ..utils.file_finder import YAML_FILENAMES
+from ..utils.scanner import DEFAULT_EXCLUDES, scan_tree
+from ..utils.workflow_finder import CANDIDATE_EXTS
+from ..utils.workflow_sniffer import in_workflows_dir, looks_like_workflow
+
+
+def _kinds(f: Path):
+    """Which schemas an explicitly named file is checked against."""
+    if f.name in YAML_FILENAMES:
+        yield "action"
+    elif f.suffix.lower() in CANDIDATE_EXTS and (in_workflows_dir(f) or looks_like_workflow(f)):
+        yield "workflow"
+
+
+@click.command()
+@click.option("--path", "-p", type=click.Path(exists=True, path_type=Path), default=Path("."),
+              help="Root directory to scan when no FILES are given.")
+@click.option("--jobs", "-j", type=click.IntRange(min=0), default=0, show_default=True,
+              help="Worker processes for large trees (0 = one per CPU core; small sets always run inline).")
+@click.option("--strict", is_flag=True, help="Exit non-zero on warnings too.")
+@click.option("--json", "as_json", is_flag=True, help="Print one JSON object per diagnostic.")
+@scan_options
+@click.argument("files", nargs=-1, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def lint(path, jobs, strict, as_json, excludes, no_gitignore, files):
+    """
+    Check actions and workflows against their schemas and report problems as
+    FILE:LINE:COLUMN. Pass FILES (e.g. from a pre-commit hook) to check only
+    those; YAML files that are neither actions nor workflows are ignored.
+    """
+    from ..utils.lint import ERROR, lint_files
+
+    if files:
+        targets = [(kind, f) for f in files for kind in _kinds(f)]
+    else:
+        scan = scan_tree(path, excludes=DEFAULT_EXCLUDES + tuple(excludes), use_gitignore=not no_gitignore)
+        targets = [("action", f) for f in scan.actions]
+        targets.extend(("workflow", f) for f in scan.workflows
+                       if f.name not in YAML_FILENAMES and (in_workflows_dir(f) or looks_like_workflow(f)))
+
+    errors = warnings = 0
+    for diagnostics in lint_files(targets, jobs=jobs):
+        for d in diagnostics:
+            if d.severity == ERROR:
+                errors += 1
+            else:
+                warnings += 1
+            click.echo(json.dumps(d._asdict()) if as_json else d.format())
+    click.echo(f"{len(targets)} file(s) checked: {errors} error(s), {warnings} warning(s).", err=True)
+    if errors or (strict and warnings):
+        raise SystemExit(1)
@@ -0,0 +1,97 @@
+"""--manifest: document many repositories in one run, sharing one worker pool, cache, scheduler, index and catalog."""
+import sqlite3
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import List
+
+import click
+
+from ..utils import timings as timing
+from ..utils.archive_source import ArchiveError, is_archive
+from ..utils.manifest import ManifestError, ManifestRepo, RepoReport, load_manifest
+from ..utils.pipeline import build_docs, resolve_jobs
+from ..utils.writer import DocWriter
+from .archive import archive_tasks
+from .build import Build, catalog_sink
+from .discover import repo_tasks
+
+
+def load_repos(manifest: Path, out: Path) -> List[ManifestRepo]:
+    try:
+        return load_manifest(manifest, out)
+    except ManifestError as e:
+        raise click.ClickException(str(e))
+
+
+def document_repo(build: Build, repo: ManifestRepo, pool=None, records=None, awaiting=None) -> RepoReport:
+    """
+    Write repo's documents into its own folder of --out. A repository that
+    cannot be read is reported, not raised; documents still waiting on AI
+    summaries are appended to awaiting with their writer.
+    """
+    started = time.perf_counter()
+    errors = build.stats["errors"]
+    try:
+        with timing.span(f"repo {repo.name}"):
+            if is_archive(repo.path):
+                tasks = archive_tasks(build, repo.path)
+            elif repo.path.is_dir():
+                tasks = repo_tasks(build, repo.path)
+            else:
+                raise OSError(f"not a directory or archive: {repo.path}")
+            repo.out.mkdir(parents=True, exist_ok=True)
+            writer = DocWriter(repo.out, build.opts.formats)
+            pending = build.write_results(
+                build_docs(tasks, jobs=build.opts.jobs, cache=build.cache, pool=pool), writer, records,
+            )
+            writer.write_index()
+            build.cache.commit()
+    except (OSError, ArchiveError, sqlite3.Error) as e:
+        click.echo(f"ERROR in {repo.name}: {e}", err=True)
+        return RepoReport(repo, seconds=time.perf_counter() - started, failure=str(e))
+    if pending and awaiting is not None:
+        # Summaries keep generating while the next repositories render.
+        awaiting.append((pending, writer))
+    return RepoReport(repo, writer.count, build.stats["errors"] - errors, time.perf_counter() - started)
+
+
+def document_manifest(build: Build, repos: List[ManifestRepo]) -> None:
+    """Document every repository, write the INDEX pages over all of them and exit 1 if any failed."""
+    from concurrent.futures import ProcessPoolExecutor
+    from ..emitters import EMITTERS
+    from ..utils.manifest import repos_index_document
+    from ..utils.writer import write_if_changed
+    o = build.opts
+    reports, awaiting = [], []
+    workers = resolve_jobs(o.jobs)
+    with (ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()) as pool, \
+            catalog_sink(o.catalog) as records:
+        for repo in repos:
+            reports.append(document_repo(build, repo, pool, records, awaiting))
+    with timing.span("summaries"):
+        for pending, writer in awaiting:
+            build.resolve_summaries(pending, writer)
+    for fmt in o.formats:
+        emitter = EMITTERS[fmt]
+        write_if_changed(o.out / f"INDEX{emitter.extension}",
+                         emitter.emit(repos_index_document(reports, o.out, emitter.extension)))
+    _report_batch(reports, o.out)
+    build.report_runners()
+    build.finish()
+    if o.catalog is not None and str(o.catalog) != "-":
+        click.echo(f"Wrote catalog {o.catalog} ({records.count} record(s))", err=True)
+    if any(r.failure for r in reports):
+        raise SystemExit(1)
+
+
+def _report_batch(reports: List[RepoReport], out: Path) -> None:
+    click.echo(f"Documented {len(reports)} repositories into {out}:", err=True)
+    width = max(len(r.repo.name) for r in reports)
+    for r in reports:
+        status = f"FAILED: {r.failure}" if r.failure else (f"{r.errors} error(s)" if r.errors else "ok")
+        click.echo(f"  {r.repo.name:<{width}} {r.seconds * 1000:10.0f} ms {r.docs:6} doc(s)  {status}", err=True)
+    total = sum(r.seconds for r in reports)
+    failed = sum(1 for r in reports if r.failure)
+    click.echo(f"  {'total':<{width}} {total * 1000:10.0f} ms {sum(r.docs for r in reports):6} doc(s)  "
+               f"{failed} failed, {sum(r.errors for r in reports)} error(s)", err=True)
@@ -0,0 +1,65 @@
+import json
+import time
+from pathlib import Path
+
+import click
+
+from ..utils.index_queries import QUERIES
+
+
+def _epilog() -> str:
+    width = max(len(k) for k in QUERIES)
+    lines = ["\b", "Subjects:"]
+    lines.extend(f"  {name:<{width}}  {q.help}" for name, q in QUERIES.items())
+    return "\n".join(lines)
+
+
+@click.command(epilog=_epilog())
+@click.option("--out", "-o", "out", required=True, type=click.Path(exists=True, path_type=Path),
+              help="Docs directory holding .cifolio-index.sqlite3 (or the index file itself).")
+@click.option("--sql", is_flag=True, help="Treat SUBJECT as a read-only SQL statement; VALUE, if given, binds to ?.")
+@click.option("--json", "as_json", is_flag=True, help="Print one JSON object per row instead of tab-separated text.")
+@click.option("--no-header", is_flag=True, help="Omit the header line in text output.")
+@click.argument("subject")
+@click.argument("value", required=False)
+def query(out, sql, as_json, no_header, subject, value):
+    """
+    Answer questions from the index written alongside the docs, e.g.
+    "query secret DEPLOY_KEY" or "query uses actions/checkout@v3".
+    """
+    import sqlite3
+    from ..utils.index_db import open_index_readonly, run_query
+
+    if sql:
+        statement, params = subject, ([value] if value is not None else [])
+    else:
+        q = QUERIES.get(subject)
+        if q is None:
+            raise click.BadParameter(f"choose from {', '.join(QUERIES)}", param_hint="SUBJECT")
+        statement = q.sql
+        params = [value] if "?" in q.sql else []
+        if params and value is None:
+            raise click.UsageError(f"'{subject}' needs a VALUE.")
+    try:
+        db = open_index_readonly(out)
+    except FileNotFoundError as e:
+        raise click.ClickException(str(e))
+    started = time.perf_counter()
+    try:
+        headers, rows = run_query(db, statement, params)
+    except sqlite3.Error as e:
+        raise click.ClickException(f"query failed: {e}")
+    finally:
+        db.close()
+    elapsed = (time.perf_counter() - started) * 1000
+    if not sql:
+        headers = list(QUERIES[subject].headers)
+    if as_json:
+        for row in rows:
+            click.echo(json.dumps(dict(zip(headers, row)), ensure_ascii=False))
+    else:
+        if not no_header and headers:
+            click.echo("\t".join(headers))
+        for row in rows:
+            click.echo("\t".join("" if v is None else str(v) for v in row))
+    click.echo(f"{len(rows)} row(s) in {elapsed:.1f} ms", err=True)
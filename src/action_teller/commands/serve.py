@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import click
+
+from ..command_arguments.format import format_option
+from ..command_arguments.scan import scan_options
+from ..utils.option_defaults import DEFAULT_SERVE_ENTRIES, DEFAULT_SERVE_PORT, DEFAULT_SERVE_WORKERS
+
+
+@click.command()
+@click.option("--path", "-p", type=click.Path(exists=True, file_okay=False, path_type=Path), default=Path("."),
+              help="Root directory served; request paths resolve against it and may not leave it.")
+@click.option("--stdio", is_flag=True, help="Speak JSON-RPC 2.0 on stdin/stdout, one message per line, instead of HTTP.")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address the HTTP server binds to.")
+@click.option("--port", type=click.IntRange(0, 65535), default=DEFAULT_SERVE_PORT, show_default=True,
+              help="HTTP port (0 = any free port).")
+@click.option("--workers", type=click.IntRange(min=1), default=DEFAULT_SERVE_WORKERS, show_default=True,
+              help="Requests handled at once; further requests wait for a free worker.")
+@click.option("--max-entries", type=click.IntRange(min=1), default=DEFAULT_SERVE_ENTRIES, show_default=True,
+              help="Parsed files, and separately rendered documents, kept in memory (least recently used go first).")
+@format_option
+@scan_options
+def serve(path, stdio, host, port, workers, max_entries, formats, excludes, no_gitignore):
+    """
+    Keep a docs renderer running for editors and portals. Parsed files and
+    rendered documents stay in memory, keyed by path and content hash, so
+    asking again for an unchanged file costs a stat. Methods: render
+    {path[, content, kind, formats]}, render_tree {[path, actions,
+    workflows, formats]} and metrics. --format sets the default formats.
+    """
+    from ..utils.doc_server import DocServer, make_http_server, serve_stdio
+
+    docs = DocServer(path, formats=formats, max_entries=max_entries, excludes=excludes,
+                     use_gitignore=not no_gitignore)
+    if stdio:
+        click.echo(f"Serving docs for {docs.root} over JSON-RPC on stdio.", err=True)
+        serve_stdio(docs, workers=workers)
+        return
+    try:
+        server = make_http_server(docs, host, port, workers=workers)
+    except OSError as e:
+        raise click.ClickException(f"cannot listen on {host}:{port}: {e.strerror or e}")
+    bound_host, bound_port = server.server_address[:2]
+    click.echo(f"Serving docs for {docs.root} on http://{bound_host}:{bound_port} (Ctrl+C to stop)", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
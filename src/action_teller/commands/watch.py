@@ -0,0 +1,75 @@
+"""--watch: keep running and re-render only the files that change."""
+import time
+from pathlib import Path
+from typing import Iterator
+
+import click
+
+from ..utils.file_finder import YAML_FILENAMES
+from ..utils.pipeline import ACTION, WORKFLOW, build_docs
+from ..utils.watcher import watch_changes
+from ..utils.workflow_finder import CANDIDATE_EXTS
+from ..utils.writer import DocWriter
+from .build import Build, catalog_sink
+from .discover import discover
+
+
+def _kinds(build: Build, f: Path) -> Iterator[str]:
+    o = build.opts
+    if (o.actions and f.name in YAML_FILENAMES) or f == o.action:
+        yield ACTION
+    if f == o.workflow or (o.workflows and f.suffix.lower() in CANDIDATE_EXTS
+                           and (not f.is_file() or build.likely_workflow(f))):
+        yield WORKFLOW
+
+
+def watch_tree(build: Build, writer: DocWriter, poll: bool = False, poll_interval: float = 1.0) -> None:
+    """
+    Re-render changed files into writer's output until Ctrl+C, patching the
+    indexes, catalog and query index in place after every batch of changes.
+    """
+    o = build.opts
+
+    def watched():
+        current = discover(build)
+        files = set(current.actions + current.workflows) if current else set()
+        dirs = list(current.dirs) if current else []
+        for single in (o.action, o.workflow):
+            if single:
+                files.add(single)
+                dirs.append(single.parent)
+        return files, dirs
+
+    click.echo(f"Watching {o.path} for changes (Ctrl+C to stop)...", err=True)
+    try:
+        for changed in watch_changes(watched, poll=poll, poll_interval=poll_interval):
+            started = time.perf_counter()
+            build.expand_run += 1
+            changed_tasks = []
+            with catalog_sink(o.catalog, update=True) as records:
+                for f in sorted(changed):
+                    for kind in _kinds(build, f):
+                        if f.is_file():
+                            changed_tasks.append(build.task(kind, f))
+                        else:
+                            build.remove((kind, f), writer, records)
+                if o.expand_depth:
+                    # Documents that inline a changed file are stale too.
+                    queued = {(t.kind, t.path) for t in changed_tasks}
+                    for f in sorted(changed):
+                        for kind, dependent in build.cache.dependents(f):
+                            if (kind, dependent) not in queued and dependent.is_file():
+                                queued.add((kind, dependent))
+                                changed_tasks.append(build.task(kind, dependent))
+                if build.scheduler is not None:
+                    build.scheduler.restart_deadline()
+                awaiting_summary = build.write_results(build_docs(changed_tasks, cache=build.cache), writer, records)
+            build.resolve_summaries(awaiting_summary, writer)
+            build.cache.commit()
+            if build.query_index is not None:
+                build.query_index.commit()
+            writer.write_index()
+            elapsed = (time.perf_counter() - started) * 1000
+            click.echo(f"Updated {len(changed)} file(s) in {elapsed:.0f} ms", err=True)
+    except KeyboardInterrupt:
+        pass
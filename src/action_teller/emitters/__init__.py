@@ -0,0 +1,29 @@
+from typing import Callable, Dict, Iterable, NamedTuple
+
+from . import confluence, html, json, markdown
+from ..renderers.model import Document
+from ..utils import option_defaults
+
+
+class Emitter(NamedTuple):
+    extension: str
+    emit: Callable[[Document], str]
+
+
+EMITTERS: Dict[str, Emitter] = {
+    "md": Emitter(markdown.EXTENSION, markdown.emit),
+    "html": Emitter(html.EXTENSION, html.emit),
+    "confluence": Emitter(confluence.EXTENSION, confluence.emit),
+    "json": Emitter(json.EXTENSION, json.emit),
+}
+
+FORMATS = tuple(EMITTERS)
+assert FORMATS == option_defaults.FORMATS, "keep utils.option_defaults.FORMATS in sync"
+
+
+def emit_all(doc: Document, formats: Iterable[str]) -> Dict[str, str]:
+    """Emit doc once per requested format."""
+    return {fmt: EMITTERS[fmt].emit(doc) for fmt in formats}
+
+
+__all__ = ["EMITTERS", "FORMATS", "Emitter", "emit_all"]
@@ -0,0 +1,44 @@
+import html
+
+from ..renderers.model import CodeBlock, Document, Quote
+from .inline import to_html
+from .xhtml import XhtmlBlocks
+
+# Confluence storage format: XHTML plus ac:* macros. Upload the body as-is with
+# the REST API (representation "storage").
+EXTENSION = ".confluence.xml"
+
+
+def _cdata(text: str) -> str:
+    return "<![CDATA[" + text.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+class _ConfluenceBlocks(XhtmlBlocks):
+    table_head = False
+
+    def quote(self, block: Quote) -> str:
+        return (
+            '<ac:structured-macro ac:name="info"><ac:rich-text-body>'
+            f"<p>{to_html(block.text)}</p>"
+            "</ac:rich-text-body></ac:structured-macro>"
+        )
+
+    def code_block(self, block: CodeBlock) -> str:
+        lang = (
+            f'<ac:parameter ac:name="language">{html.escape(block.lang)}</ac:parameter>'
+            if block.lang else ""
+        )
+        return (
+            f'<ac:structured-macro ac:name="code">{lang}'
+            f"<ac:plain-text-body>{_cdata(block.code)}</ac:plain-text-body>"
+            "</ac:structured-macro>"
+        )
+
+
+_BLOCKS = _ConfluenceBlocks()
+emit_block = _BLOCKS.block
+emit_blocks = _BLOCKS.blocks
+
+
+def emit(doc: Document) -> str:
+    return emit_blocks(doc.blocks)
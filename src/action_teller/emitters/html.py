@@ -0,0 +1,22 @@
+import html
+from typing import List
+
+from ..renderers.model import Document
+from .xhtml import XhtmlBlocks
+
+EXTENSION = ".html"
+
+_BLOCKS = XhtmlBlocks()
+emit_block = _BLOCKS.block
+emit_blocks = _BLOCKS.blocks
+
+
+def emit(doc: Document) -> str:
+    parts: List[str] = [
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8"/>',
+        f"<title>{html.escape(doc.title)}</title></head><body>",
+        emit_blocks(doc.blocks),
+        "</body></html>",
+    ]
+    return "\n".join(parts)
@@ -0,0 +1,29 @@
+import html
+import re
+
+_code_span = re.compile(r"`([^`]*)`")
+_bold = re.compile(r"\*\*(.+?)\*\*")
+_emphasis = re.compile(r"(?<![\w])_(.+?)_(?![\w])")
+_link = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_br = re.compile(r"&lt;br\s*/?&gt;")
+
+
+def _text_to_html(text: str) -> str:
+    text = html.escape(text, quote=False)
+    text = _br.sub("<br/>", text)
+    # The URL is already escaped with the rest of the text; only quotes are left.
+    text = _link.sub(lambda m: f'<a href="{m.group(2).replace(chr(34), "&quot;")}">{m.group(1)}</a>', text)
+    text = _bold.sub(r"<strong>\1</strong>", text)
+    return _emphasis.sub(r"<em>\1</em>", text)
+
+
+def to_html(text: str) -> str:
+    """Translate the inline Markdown subset used by the document model to (X)HTML."""
+    out = []
+    pos = 0
+    for m in _code_span.finditer(text):
+        out.append(_text_to_html(text[pos:m.start()]))
+        out.append(f"<code>{html.escape(m.group(1), quote=False)}</code>")
+        pos = m.end()
+    out.append(_text_to_html(text[pos:]))
+    return "".join(out)
@@ -0,0 +1,34 @@
+import json
+from typing import Any, Dict
+
+from ..renderers.model import BulletList, Document, ListItem, Rule
+
+EXTENSION = ".json"
+SCHEMA = "cifolio.document/1"
+
+
+def _block(block: Any) -> Dict[str, Any]:
+    node: Dict[str, Any] = {"type": type(block).__name__.lower()}
+    if isinstance(block, BulletList):
+        node["items"] = [_item(i) for i in block.items]
+    elif not isinstance(block, Rule):
+        node.update((k, [list(r) for r in v] if k == "rows" else (list(v) if isinstance(v, tuple) else v))
+                    for k, v in block._asdict().items())
+    return node
+
+
+def _item(item: ListItem) -> Dict[str, Any]:
+    node: Dict[str, Any] = {"text": item.text}
+    if item.children:
+        node["children"] = [_block(c) for c in item.children]
+    return node
+
+
+def emit(doc: Document) -> str:
+    return json.dumps({
+        "schema": SCHEMA,
+        "kind": doc.kind,
+        "title": doc.title,
+        "source": doc.source,
+        "blocks": [_block(b) for b in doc.blocks],
+    }, ensure_ascii=False, indent=2)
@@ -0,0 +1,51 @@
+from typing import Iterable, List
+
+from ..renderers.model import (
+    Block, BulletList, CodeBlock, Document, Heading, Paragraph, Quote, Rule, Table,
+)
+
+EXTENSION = ".md"
+
+
+def _list(lst: BulletList, indent: int) -> List[str]:
+    pad = " " * indent
+    lines: List[str] = []
+    for item in lst.items:
+        lines.append(f"{pad}- {item.text}")
+        for child in item.children:
+            if isinstance(child, BulletList):
+                lines.extend(_list(child, indent + 2))
+            else:
+                child_pad = " " * (indent + 2)
+                lines.append("")
+                lines.extend(child_pad + line if line else line
+                             for line in emit_block(child).split("\n"))
+    return lines
+
+
+def emit_block(block: Block) -> str:
+    if isinstance(block, Heading):
+        return f"{'#' * block.level} {block.text}"
+    if isinstance(block, Paragraph):
+        return block.text
+    if isinstance(block, Quote):
+        return "\n".join(f"> {line}" for line in block.text.split("\n"))
+    if isinstance(block, Table):
+        lines = ["| " + " | ".join(block.headers) + " |", "|" + "---|" * len(block.headers)]
+        lines.extend("| " + " | ".join(row) + " |" for row in block.rows)
+        return "\n".join(lines)
+    if isinstance(block, CodeBlock):
+        return f"```{block.lang}\n{block.code}\n```"
+    if isinstance(block, BulletList):
+        return "\n".join(_list(block, 0))
+    if isinstance(block, Rule):
+        return "---"
+    raise TypeError(f"Unknown block type: {type(block).__name__}")
+
+
+def emit_blocks(blocks: Iterable[Block]) -> str:
+    return "\n\n".join(emit_block(b) for b in blocks)
+
+
+def emit(doc: Document) -> str:
+    return emit_blocks(doc.blocks)
@@ -0,0 +1,60 @@
+import html
+from typing import Iterable
+
+from ..renderers.model import (
+    Block, BulletList, CodeBlock, Heading, Paragraph, Quote, Rule, Table,
+)
+from .inline import to_html
+
+
+class XhtmlBlocks:
+    """
+    Block-level XHTML shared by the HTML and Confluence emitters. Formats
+    override the methods for the blocks they write differently.
+    """
+
+    # Confluence keeps the header row in <tbody> like every other row.
+    table_head = True
+
+    def block(self, block: Block) -> str:
+        if isinstance(block, Heading):
+            return f"<h{block.level}>{to_html(block.text)}</h{block.level}>"
+        if isinstance(block, Paragraph):
+            return f"<p>{to_html(block.text)}</p>"
+        if isinstance(block, Quote):
+            return self.quote(block)
+        if isinstance(block, Table):
+            return self.table(block)
+        if isinstance(block, CodeBlock):
+            return self.code_block(block)
+        if isinstance(block, BulletList):
+            return self.bullet_list(block)
+        if isinstance(block, Rule):
+            return "<hr/>"
+        raise TypeError(f"Unknown block type: {type(block).__name__}")
+
+    def blocks(self, blocks: Iterable[Block]) -> str:
+        return "\n".join(self.block(b) for b in blocks)
+
+    def quote(self, block: Quote) -> str:
+        return f"<blockquote><p>{to_html(block.text)}</p></blockquote>"
+
+    def table(self, block: Table) -> str:
+        head = "<tr>" + "".join(f"<th>{to_html(h)}</th>" for h in block.headers) + "</tr>"
+        rows = "".join(
+            "<tr>" + "".join(f"<td>{to_html(c)}</td>" for c in row) + "</tr>" for row in block.rows
+        )
+        if self.table_head:
+            return f"<table><thead>{head}</thead><tbody>{rows}</tbody></table>"
+        return f"<table><tbody>{head}{rows}</tbody></table>"
+
+    def code_block(self, block: CodeBlock) -> str:
+        lang = f' class="language-{html.escape(block.lang)}"' if block.lang else ""
+        return f"<pre><code{lang}>{html.escape(block.code, quote=False)}</code></pre>"
+
+    def bullet_list(self, block: BulletList) -> str:
+        items = []
+        for item in block.items:
+            children = "".join(self.block(c) for c in item.children)
+            items.append(f"<li>{to_html(item.text)}{children}</li>")
+        return "<ul>" + "".join(items) + "</ul>"
@@ -0,0 +1,75 @@
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, List
+
+from . import branding, inputs, outputs, runs, permissions, env, defaults
+from .model import Block, Document, Heading, ListItem, Paragraph, Quote, Rule
+from ..emitters.markdown import emit
+from ..utils.timings import span
+
+# (heading, key in action.yml, builder) in page order
+SECTIONS = (
+    ("Branding", "branding", branding.build),
+    ("Inputs", "inputs", inputs.build),
+    ("Outputs", "outputs", outputs.build),
+    ("Runs", "runs", runs.build),
+    ("Permissions", "permissions", permissions.build),
+    ("Env", "env", env.build),
+    ("Defaults", "defaults", defaults.build),
+)
+
+
+def build_action_doc(
+    data: Dict[str, Any],
+    file_path: Path,
+    llm_summary: bool = False,
+    llm_model: str = "mistral",
+    summarize_fn: Optional[callable] = None,
+    expand_fn: Optional[Callable[[str], Optional[ListItem]]] = None,
+) -> Document:
+    """
+    Build the format-neutral Document for a single action.yml file.
+    expand_fn, when given, may expand a step's `uses:` value (see utils.expander).
+    """
+    name = data.get("name", file_path.stem)
+    desc = data.get("description", "")
+    author = data.get("author", "")
+
+    blocks: List[Block] = [Heading(1, name)]
+    if desc:
+        blocks.append(Paragraph(desc))
+    else:
+        # generate description via AI if no description field
+        if llm_summary and summarize_fn:
+            summary = summarize_fn(data, model=llm_model)
+            blocks.append(Quote(summary))
+
+    if llm_summary and summarize_fn and desc:
+        summary = summarize_fn(data, model=llm_model)
+        blocks.append(Quote(summary))
+
+    blocks.append(Paragraph(f"**File:** `{file_path}`"))
+    if author:
+        blocks.append(Paragraph(f"**Author:** `{author}`"))
+    for heading, key, build in SECTIONS:
+        with span(key, "renderer"):
+            blocks.append(Heading(2, heading))
+            if build is runs.build:
+                blocks.extend(runs.build(data.get(key, {}), expand_fn))
+            else:
+                blocks.extend(build(data.get(key, {})))
+    blocks.append(Rule())
+    blocks.append(Paragraph("_Generated by cifolio_"))
+    return Document("action", name, str(file_path), tuple(blocks))
+
+
+def render_action_doc(
+    data: Dict[str, Any],
+    file_path: Path,
+    llm_summary: bool = False,
+    llm_model: str = "mistral",
+    summarize_fn: Optional[callable] = None,
+) -> str:
+    """
+    Render a single action.yml file into Markdown.
+    """
+    return emit(build_action_doc(data, file_path, llm_summary, llm_model, summarize_fn))
@@ -1,7 +1,14 @@
-from .tables import to_table
+from typing import List
 
-def render(branding: dict) -> str:
+from .model import Block, NONE
+from .tables import table
+from ..emitters.markdown import emit_blocks
+
+def build(branding: dict) -> List[Block]:
     if not branding:
-        return "_None_"
+        return [NONE]
     rows = [(k, str(v)) for k, v in branding.items()]
-    return to_table(rows, ("key", "value"))
+    return [table(rows, ("key", "value"))]
+
+def render(branding: dict) -> str:
+    return emit_blocks(build(branding))
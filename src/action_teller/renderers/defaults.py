@@ -1,13 +1,21 @@
-from .tables import to_table
+from typing import List
 
-def render(defaults: dict) -> str:
+from .model import Block, NONE, Paragraph, bullets
+from .tables import table
+from ..emitters.markdown import emit_blocks
+
+def build(defaults: dict) -> List[Block]:
     if not defaults:
-        return "_None_"
-    blocks = []
+        return [NONE]
+    blocks: List[Block] = []
     for k, v in defaults.items():
         if isinstance(v, dict):
             rows = [(kk, str(vv)) for kk, vv in v.items()]
-            blocks.append(f"**{k}**\n\n{to_table(rows, ('key', 'value'))}")
+            blocks.append(Paragraph(f"**{k}**"))
+            blocks.append(table(rows, ('key', 'value')))
         else:
-            blocks.append(f"- **{k}:** `{v}`")
-    return "\n\n".join(blocks)
+            blocks.append(bullets([f"**{k}:** `{v}`"]))
+    return blocks
+
+def render(defaults: dict) -> str:
+    return emit_blocks(build(defaults))
@@ -1,7 +1,14 @@
-from .tables import to_table
+from typing import List
 
-def render(env: dict) -> str:
+from .model import Block, NONE
+from .tables import table
+from ..emitters.markdown import emit_blocks
+
+def build(env: dict) -> List[Block]:
     if not env:
-        return "_None_"
+        return [NONE]
     rows = [(k, str(v)) for k, v in env.items()]
-    return to_table(rows, ("env var", "value"))
+    return [table(rows, ("env var", "value"))]
+
+def render(env: dict) -> str:
+    return emit_blocks(build(env))
@@ -1,16 +1,33 @@
-from .tables import to_table
+from typing import Any, Dict, List
 
-def render(inputs: dict) -> str:
-    rows = []
+from .model import Block
+from .tables import table
+from ..emitters.markdown import emit_blocks
+
+def entries(inputs: dict) -> List[Dict[str, Any]]:
+    """Structured input metadata, one dict per input, in declaration order."""
+    result = []
     for key, meta in (inputs or {}).items():
-        desc = (meta or {}).get("description", "").strip()
-        req = (meta or {}).get("required", False)
-        default = (meta or {}).get("default", "")
-        deprec = (meta or {}).get("deprecationMessage", "")
+        meta = meta or {}
+        result.append({
+            "name": key,
+            "description": meta.get("description", "").strip(),
+            "required": meta.get("required", False),
+            "default": meta.get("default", ""),
+            "deprecationMessage": meta.get("deprecationMessage", ""),
+        })
+    return result
+
+def build(inputs: dict) -> List[Block]:
+    rows = []
+    for e in entries(inputs):
         bits = []
-        if desc: bits.append(desc)
-        bits.append(f"**required:** `{str(req).lower()}`")
-        if default != "": bits.append(f"**default:** `{default}`")
-        if deprec: bits.append(f"**deprecated:** {deprec}")
-        rows.append((key, "<br/>".join(bits)))
-    return to_table(rows, ("input", "details"))
+        if e["description"]: bits.append(e["description"])
+        bits.append(f"**required:** `{str(e['required']).lower()}`")
+        if e["default"] != "": bits.append(f"**default:** `{e['default']}`")
+        if e["deprecationMessage"]: bits.append(f"**deprecated:** {e['deprecationMessage']}")
+        rows.append((e["name"], "<br/>".join(bits)))
+    return [table(rows, ("input", "details"))]
+
+def render(inputs: dict) -> str:
+    return emit_blocks(build(inputs))
@@ -0,0 +1,78 @@
+"""
+Format-neutral document model.
+
+Every action and workflow is built into a Document once; emitters in
+action_teller.emitters turn it into Markdown, HTML, Confluence storage format
+or JSON. Inline text uses a small Markdown subset (`code`, **bold**, _emphasis_,
+[text](link), <br/>) that each emitter translates.
+"""
+from typing import Any, Dict, NamedTuple, Tuple, Union
+
+
+class Heading(NamedTuple):
+    level: int
+    text: str
+
+
+class Paragraph(NamedTuple):
+    text: str
+
+
+class Quote(NamedTuple):
+    text: str
+
+
+class Table(NamedTuple):
+    headers: Tuple[str, ...]
+    rows: Tuple[Tuple[str, ...], ...]
+
+
+class CodeBlock(NamedTuple):
+    code: str
+    lang: str = ""
+
+
+class ListItem(NamedTuple):
+    text: str
+    children: Tuple["Block", ...] = ()
+
+
+class BulletList(NamedTuple):
+    items: Tuple[ListItem, ...]
+
+
+class Rule(NamedTuple):
+    pass
+
+
+Block = Union[Heading, Paragraph, Quote, Table, CodeBlock, BulletList, Rule]
+
+
+class Document(NamedTuple):
+    kind: str                      # "action", "workflow" or "index"
+    title: str
+    source: str                    # file the document was built from
+    blocks: Tuple[Block, ...]
+
+
+NONE = Paragraph("_None_")
+
+BLOCK_TYPES = (Heading, Paragraph, Quote, Table, CodeBlock, ListItem, BulletList, Rule)
+
+
+def bullets(texts) -> BulletList:
+    return BulletList(tuple(ListItem(t) for t in texts))
+
+
+def replace_text(node: Any, mapping: Dict[str, str]) -> Any:
+    """Return a copy of node with every key of mapping replaced in its text fields."""
+    if isinstance(node, str):
+        for old, new in mapping.items():
+            if old in node:
+                node = node.replace(old, new)
+        return node
+    if isinstance(node, BLOCK_TYPES + (Document,)):
+        return type(node)(*(replace_text(v, mapping) for v in node))
+    if isinstance(node, tuple):
+        return tuple(replace_text(v, mapping) for v in node)
+    return node
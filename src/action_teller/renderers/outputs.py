@@ -1,14 +1,30 @@
-from .tables import to_table
+from typing import Any, Dict, List
 
-def render(outputs: dict) -> str:
+from .model import Block
+from .tables import table
+from ..emitters.markdown import emit_blocks
+
+def entries(outputs: dict) -> List[Dict[str, Any]]:
+    """Structured output metadata, one dict per output, in declaration order."""
+    return [
+        {
+            "name": key,
+            "description": (meta or {}).get("description", "").strip(),
+            "value": (meta or {}).get("value", ""),
+        }
+        for key, meta in (outputs or {}).items()
+    ]
+
+def build(outputs: dict) -> List[Block]:
     rows = []
-    for key, meta in (outputs or {}).items():
-        desc = (meta or {}).get("description", "").strip()
-        val = (meta or {}).get("value", "")
+    for e in entries(outputs):
         bits = []
-        if desc:
-            bits.append(desc)
-        if val != "":
-            bits.append(f"**value:** `{val}`")
-        rows.append((key, "<br/>".join(bits)))
-    return to_table(rows, ("output", "details"))
+        if e["description"]:
+            bits.append(e["description"])
+        if e["value"] != "":
+            bits.append(f"**value:** `{e['value']}`")
+        rows.append((e["name"], "<br/>".join(bits)))
+    return [table(rows, ("output", "details"))]
+
+def render(outputs: dict) -> str:
+    return emit_blocks(build(outputs))
@@ -1,7 +1,14 @@
-from .tables import to_table
+from typing import List
 
-def render(perms: dict) -> str:
+from .model import Block, NONE
+from .tables import table
+from ..emitters.markdown import emit_blocks
+
+def build(perms: dict) -> List[Block]:
     if not perms:
-        return "_None_"
+        return [NONE]
     rows = [(k, str(v).lower()) for k, v in perms.items()]
-    return to_table(rows, ("permission", "access"))
+    return [table(rows, ("permission", "access"))]
+
+def render(perms: dict) -> str:
+    return emit_blocks(build(perms))
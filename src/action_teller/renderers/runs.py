@@ -1,56 +1,85 @@
-def render(runs: dict) -> str:
+from typing import Any, Callable, Dict, List, Optional
+
+from .model import Block, BulletList, CodeBlock, Heading, ListItem, NONE, Paragraph, bullets
+from ..emitters.markdown import emit_blocks
+
+def _step_item(i: int, s: dict, expand_fn: Optional[Callable[[str], Optional[ListItem]]] = None) -> ListItem:
+    name = s.get("name") or s.get("id") or f"step-{i}"
+    details: List[ListItem] = []
+    if s.get("id"):
+        details.append(ListItem(f"id=`{s['id']}`"))
+    if s.get("if"):
+        details.append(ListItem(f"if=`{s['if']}`"))
+    if s.get("shell"):
+        details.append(ListItem(f"shell=`{s['shell']}`"))
+    if s.get("uses"):
+        uses_val = s["uses"]
+        details.append(ListItem(f"uses=`{uses_val}`"))
+        if "@" in uses_val:
+            _, version = uses_val.split("@", 1)
+            details.append(ListItem(f"version=`{version}`"))
+        expanded = expand_fn(uses_val) if expand_fn else None
+        if expanded is not None:
+            details.append(expanded)
+    if s.get("run"):
+        run_cmd = str(s["run"]).strip()
+        details.append(ListItem("run:", (CodeBlock(run_cmd, "bash"),)))
+    return ListItem(f"**{name}**", (BulletList(tuple(details)),) if details else ())
+
+_STEP_KEYS = ("name", "id", "if", "shell", "uses", "run")
+
+def describe(runs: dict) -> Dict[str, Any]:
+    """Structured view of a runs: block: using plus the fields relevant to it."""
     if not runs:
-        return "_None_"
+        return {}
     using = runs.get("using", "")
-    md = [f"**using:** `{using}`"]
+    result: Dict[str, Any] = {"using": using}
+    if using == "composite":
+        result["steps"] = [
+            {k: (str(s[k]).strip() if k == "run" else s[k]) for k in _STEP_KEYS if s.get(k)}
+            for s in (runs.get("steps") or [])
+        ]
+    elif isinstance(using, str) and using.startswith("node"):
+        result.update((k, runs[k]) for k in ("main", "pre", "post") if runs.get(k))
+    elif using == "docker":
+        result.update((k, runs[k]) for k in ("image", "entrypoint", "args") if runs.get(k))
+    return result
+
+def build(runs: dict, expand_fn: Optional[Callable[[str], Optional[ListItem]]] = None) -> List[Block]:
+    if not runs:
+        return [NONE]
+    using = runs.get("using", "")
+    blocks: List[Block] = [Paragraph(f"**using:** `{using}`")]
     if using == "composite":
         steps = runs.get("steps", []) or []
         if not steps:
-            md.append("- _No steps defined_")
+            blocks.append(bullets(["_No steps defined_"]))
         else:
-            md.append("### Steps")
-            for i, s in enumerate(steps, start=1):
-                name = s.get("name") or s.get("id") or f"step-{i}"
-                md.append(f"- **{name}**")
-                if s.get("id"):
-                    md.append(f"  - id=`{s['id']}`")
-                if s.get("if"):
-                    md.append(f"  - if=`{s['if']}`")
-                if s.get("shell"):
-                    md.append(f"  - shell=`{s['shell']}`")
-                if s.get("uses"):
-                    uses_val = s["uses"]
-                    md.append(f"  - uses=`{uses_val}`")
-                    if "@" in uses_val:
-                        _, version = uses_val.split("@", 1)
-                        md.append(f"  - version=`{version}`")
-                if s.get("run"):
-                    run_cmd = str(s["run"]).strip()
-                    indent = " " * 6
-                    md.append(
-                        "  - run:\n\n"
-                        + f"{indent}```bash\n"
-                        + "\n".join(f"{indent}{line}" for line in run_cmd.splitlines())
-                        + f"\n{indent}```"
-                    )
+            blocks.append(Heading(3, "Steps"))
+            blocks.append(BulletList(tuple(_step_item(i, s, expand_fn) for i, s in enumerate(steps, start=1))))
     elif isinstance(using, str) and using.startswith("node"):
         main = runs.get("main", "")
         pre = runs.get("pre", "")
         post = runs.get("post", "")
-        md.append(f"- **main:** `{main}`")
+        items = [f"**main:** `{main}`"]
         if pre:
-            md.append(f"- **pre:** `{pre}`")
+            items.append(f"**pre:** `{pre}`")
         if post:
-            md.append(f"- **post:** `{post}`")
+            items.append(f"**post:** `{post}`")
+        blocks.append(bullets(items))
     elif using == "docker":
         image = runs.get("image", "")
         entry = runs.get("entrypoint", "")
         args = runs.get("args", [])
-        md.append(f"- **image:** `{image}`")
+        items = [f"**image:** `{image}`"]
         if entry:
-            md.append(f"- **entrypoint:** `{entry}`")
+            items.append(f"**entrypoint:** `{entry}`")
         if args:
-            md.append(f"- **args:** `{args}`")
+            items.append(f"**args:** `{args}`")
+        blocks.append(bullets(items))
     else:
-        md.append("_Unknown `using` type_")
-    return "\n".join(md)
+        blocks.append(Paragraph("_Unknown `using` type_"))
+    return blocks
+
+def render(runs: dict) -> str:
+    return emit_blocks(build(runs))
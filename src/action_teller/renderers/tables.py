@@ -1,10 +1,17 @@
 from typing import List, Tuple
 
-def to_table(rows: List[Tuple[str, str]], headers: Tuple[str, str]) -> str:
+from .model import Block, NONE, Table
+from ..emitters.markdown import emit_block
+
+
+def table(rows: List[Tuple[str, str]], headers: Tuple[str, str]) -> Block:
     if not rows:
-        return "_None_"
-    lines = [f"| {headers[0]} | {headers[1]} |", "|---|---|"]
-    for k, v in rows:
-        v = str(v).replace("\n", "<br/>")
-        lines.append(f"| `{k}` | {v} |")
-    return "\n".join(lines)
+        return NONE
+    return Table(
+        tuple(headers),
+        tuple((f"`{k}`", str(v).replace("\n", "<br/>")) for k, v in rows),
+    )
+
+
+def to_table(rows: List[Tuple[str, str]], headers: Tuple[str, str]) -> str:
+    return emit_block(table(rows, headers))
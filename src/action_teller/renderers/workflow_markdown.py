@@ -1,37 +1,24 @@
 from pathlib import Path
-from typing import Dict, Any, Optional, Set, List, Tuple
+from typing import Callable, Dict, Any, Optional, Set, List, Tuple
 import re
 import json
 
-# Simple helpers to keep consistent formatting within this module.
-
-def _h2(title: str) -> str:
-    return f"## {title}\n"
-
-def _h3(title: str) -> str:
-    return f"### {title}\n"
-
-def _h4(title: str) -> str:
-    return f"#### {title}\n"
-
-def _table(rows: List[Tuple[str, str]], headers: Tuple[str, str]) -> str:
-    if not rows:
-        return "_None_"
-    lines = [f"| {headers[0]} | {headers[1]} |", "|---|---|"]
-    for k, v in rows:
-        v = str(v).replace("\n", "<br/>")
-        lines.append(f"| `{k}` | {v} |")
-    return "\n".join(lines)
-
-def _stringify_yaml(yaml_obj: Any) -> str:
-    try:
-        # Dump to JSON-like string for stable searching.
-        return json.dumps(yaml_obj, ensure_ascii=False, indent=2)
-    except Exception:
-        return str(yaml_obj)
+from .model import (
+    Block, BulletList, CodeBlock, Document, Heading, ListItem, NONE, Paragraph, Rule, Table, bullets,
+)
+from .tables import table
+from ..emitters.markdown import emit
+from ..utils.job_graph import analyze, job_graph, mermaid
+from ..utils.matrix import JobEstimate, job_estimates, runner_totals
+from ..utils.timings import span
 
 _expr_pattern = re.compile(r"\${{\s*([^}]+)\s*}}")
 _token_pattern = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\b")
+_dotted_patterns = {
+    prefix: re.compile(rf"{re.escape(prefix)}\.([A-Za-z_][A-Za-z0-9_]*)")
+    for prefix in ("secrets", "vars")
+}
+_output_pattern = re.compile(r"\b(steps|needs)\.([A-Za-z_][A-Za-z0-9_-]*)\.outputs\.([A-Za-z_][A-Za-z0-9_-]*)")
 
 # Roots considered as GitHub Contexts per docs
 KNOWN_CONTEXT_ROOTS = {
@@ -41,23 +28,90 @@ KNOWN_CONTEXT_ROOTS = {
     "endsWith", "contains", "join"
 }
 
-def _collect_expressions(raw: str) -> List[str]:
-    return [m.group(1) for m in _expr_pattern.finditer(raw)]
+# JSON string escaping, as used when these references were found by scanning a
+# json.dumps() of the whole workflow; kept so results stay identical.
+_json_escape = getattr(json.encoder, "c_encode_basestring", None) or json.encoder.py_encode_basestring
 
-def _collect_context_roots(exprs: List[str]) -> Set[str]:
-    roots: Set[str] = set()
-    for e in exprs:
-        # Take the first identifier token in the expression as a candidate root
-        for t in _token_pattern.findall(e):
-            if t in KNOWN_CONTEXT_ROOTS:
-                roots.add(t)
-                break
-    return roots
 
-def _collect_dotted_refs(raw: str, prefix: str) -> Set[str]:
-    # Find occurrences like secrets.MY_TOKEN, vars.MY_VAR
-    pattern = re.compile(rf"{re.escape(prefix)}\.([A-Za-z_][A-Za-z0-9_]*)")
-    return set(pattern.findall(raw))
+class RefIndex:
+    """
+    Every reference found in a parsed workflow: secrets.X, vars.X, each
+    distinct ${{ }} expression and its context root, and steps/needs outputs.
+    """
+
+    __slots__ = ("secrets", "vars", "expressions", "contexts", "step_outputs", "needs_outputs")
+
+    def __init__(self):
+        self.expressions: Set[str] = set()
+        self.secrets: Set[str] = set()
+        self.vars: Set[str] = set()
+        self.contexts: Set[str] = set()
+        self.step_outputs: Set[Tuple[str, str]] = set()
+        self.needs_outputs: Set[Tuple[str, str]] = set()
+
+
+def _expression_root(expr: str) -> Optional[str]:
+    # Take the first identifier token in the expression that is a known context root.
+    for t in _token_pattern.findall(expr):
+        if t in KNOWN_CONTEXT_ROOTS:
+            return t
+    return None
+
+
+def _scan_string(s: str, refs: RefIndex) -> None:
+    has_expr = "${{" in s
+    has_secrets = "secrets." in s
+    has_vars = "vars." in s
+    if not (has_expr or has_secrets or has_vars):
+        return
+    s = _json_escape(s)
+    if has_secrets:
+        refs.secrets.update(_dotted_patterns["secrets"].findall(s))
+    if has_vars:
+        refs.vars.update(_dotted_patterns["vars"].findall(s))
+    if has_expr:
+        for m in _expr_pattern.finditer(s):
+            expr = m.group(1)
+            # Expressions repeat a lot across jobs; tokenize each distinct one once per file.
+            if expr in refs.expressions:
+                continue
+            refs.expressions.add(expr)
+            root = _expression_root(expr)
+            if root is not None:
+                refs.contexts.add(root)
+            if ".outputs." in expr:
+                for kind, ident, out in _output_pattern.findall(expr):
+                    (refs.step_outputs if kind == "steps" else refs.needs_outputs).add((ident, out))
+
+
+def index_references(data: Any) -> RefIndex:
+    """
+    Walk the parsed workflow once and index every reference in it, without
+    serializing it. Both mapping keys and string values are scanned.
+    The page, catalog record, index facts and extractive summary of a file
+    all need the result; build it once and pass it to each of them.
+    """
+    refs = RefIndex()
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            _scan_string(node, refs)
+        elif isinstance(node, dict):
+            for k, v in node.items():
+                if isinstance(k, str):
+                    _scan_string(k, refs)
+                if isinstance(v, str):
+                    _scan_string(v, refs)
+                elif isinstance(v, (dict, list)):
+                    stack.append(v)
+        elif isinstance(node, list):
+            for v in node:
+                if isinstance(v, str):
+                    _scan_string(v, refs)
+                elif isinstance(v, (dict, list)):
+                    stack.append(v)
+    return refs
 
 def _list_on_triggers(on_field: Any) -> List[str]:
     if isinstance(on_field, dict):
@@ -68,131 +122,200 @@ def _list_on_triggers(on_field: Any) -> List[str]:
         return [on_field]
     return []
 
+def _collect_inputs(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """workflow_dispatch and workflow_call inputs as structured dicts."""
+    result: List[Dict[str, Any]] = []
+    on = data.get("on")
+    if not isinstance(on, dict):
+        return result   # `on: push` / `on: [push]` declare no inputs
+    # workflow_dispatch.inputs, then workflow_call.inputs (reusable workflows)
+    for trigger in ("workflow_dispatch", "workflow_call"):
+        for k, v in ((on.get(trigger) or {}).get("inputs") or {}).items():
+            v = v or {}
+            result.append({
+                "name": k,
+                "trigger": trigger,
+                "description": v.get("description", "") or "",
+                "required": v.get("required", False),
+                "default": v.get("default", ""),
+                "type": v.get("type", ""),
+            })
+    return result
+
 def _gather_inputs(data: Dict[str, Any]) -> List[Tuple[str, str]]:
     rows: List[Tuple[str, str]] = []
-
-    # workflow_dispatch.inputs
-    wd = ((data.get("on") or {}).get("workflow_dispatch") or {})
-    wd_inputs = (wd.get("inputs") or {})
-    for k, v in wd_inputs.items():
-        desc = (v or {}).get("description", "") or ""
-        req = str((v or {}).get("required", False)).lower()
-        default = (v or {}).get("default", "")
+    for e in _collect_inputs(data):
         bits = []
-        if desc:
-            bits.append(desc)
-        bits.append(f"**required:** `{req}`")
-        if default != "":
-            bits.append(f"**default:** `{default}`")
-        rows.append((k, "<br/>".join(bits)))
-
-    # workflow_call.inputs (reusable workflows)
-    wc = ((data.get("on") or {}).get("workflow_call") or {})
-    wc_inputs = (wc.get("inputs") or {})
-    for k, v in wc_inputs.items():
-        desc = (v or {}).get("description", "") or ""
-        req = str((v or {}).get("required", False)).lower()
-        default = (v or {}).get("default", "")
-        bits = []
-        if desc:
-            bits.append(desc)
-        bits.append(f"**required:** `{req}`")
-        if default != "":
-            bits.append(f"**default:** `{default}`")
-        rows.append((k, "<br/>".join(bits)))
-
+        if e["description"]:
+            bits.append(e["description"])
+        bits.append(f"**required:** `{str(e['required']).lower()}`")
+        if e["default"] != "":
+            bits.append(f"**default:** `{e['default']}`")
+        rows.append((e["name"], "<br/>".join(bits)))
     return rows
 
-def _gather_steps(data: Dict[str, Any]) -> List[str]:
-    lines: List[str] = []
+def _gather_steps(data: Dict[str, Any], expand_fn: Optional[Callable[[str], Optional[ListItem]]] = None) -> List[ListItem]:
+    items: List[ListItem] = []
     jobs = data.get("jobs") or {}
     for job_id, job in jobs.items():
         job_name = job.get("name") or job_id
-        lines.append(f"- **Job:** `{job_name}`")
+        details: List[ListItem] = []
         # Reusable workflow invocation
         if "uses" in job:
-            lines.append(f"  - uses=`{job['uses']}`")
+            details.append(ListItem(f"uses=`{job['uses']}`"))
             if job.get("with"):
-                lines.append(f"  - with: `{job['with']}`")
-            continue
-        steps = job.get("steps") or []
-        if not steps:
-            lines.append("  - _No steps_")
-            continue
-        for i, s in enumerate(steps, start=1):
-            step_name = s.get("name") or s.get("id") or f"step-{i}"
-            lines.append(f"  - **Step:** {step_name}")
-            if s.get("id"):
-                lines.append(f"    - id=`{s['id']}`")
-            if s.get("if"):
-                lines.append(f"    - if=`{s['if']}`")
-            if s.get("uses"):
-                lines.append(f"    - uses=`{s['uses']}`")
-            if s.get("run"):
-                run_cmd = str(s["run"]).strip()
-                indent = " " * 6
-                lines.append(
-                    "    - run:\n\n"
-                    + f"{indent}```bash\n"
-                    + "\n".join(f"{indent}{line}" for line in run_cmd.splitlines())
-                    + f"\n{indent}```"
-                )
-    return lines
-
-def _gather_secrets(data: Dict[str, Any], raw: str) -> List[str]:
+                details.append(ListItem(f"with: `{job['with']}`"))
+            expanded = expand_fn(job["uses"]) if expand_fn else None
+            if expanded is not None:
+                details.append(expanded)
+        else:
+            steps = job.get("steps") or []
+            if not steps:
+                details.append(ListItem("_No steps_"))
+            for i, s in enumerate(steps, start=1):
+                details.append(_step_item(i, s, expand_fn))
+        items.append(ListItem(f"**Job:** `{job_name}`", (BulletList(tuple(details)),)))
+    return items
+
+def _step_item(i: int, s: Dict[str, Any], expand_fn: Optional[Callable[[str], Optional[ListItem]]] = None) -> ListItem:
+    step_name = s.get("name") or s.get("id") or f"step-{i}"
+    details: List[ListItem] = []
+    if s.get("id"):
+        details.append(ListItem(f"id=`{s['id']}`"))
+    if s.get("if"):
+        details.append(ListItem(f"if=`{s['if']}`"))
+    if s.get("uses"):
+        details.append(ListItem(f"uses=`{s['uses']}`"))
+        expanded = expand_fn(s["uses"]) if expand_fn else None
+        if expanded is not None:
+            details.append(expanded)
+    if s.get("run"):
+        run_cmd = str(s["run"]).strip()
+        details.append(ListItem("run:", (CodeBlock(run_cmd, "bash"),)))
+    return ListItem(f"**Step:** {step_name}", (BulletList(tuple(details)),) if details else ())
+
+def _gather_secrets(data: Dict[str, Any], refs: RefIndex) -> List[str]:
     found: Set[str] = set()
     # From workflow_call.secrets
-    wc = ((data.get("on") or {}).get("workflow_call") or {})
+    on = data.get("on")
+    wc = ((on if isinstance(on, dict) else {}).get("workflow_call") or {})
     wc_secrets = (wc.get("secrets") or {})
     for k in wc_secrets.keys():
         found.add(k)
     # Any secrets.<NAME> usages across the file
-    found.update(_collect_dotted_refs(raw, "secrets"))
+    found.update(refs.secrets)
     return sorted(found)
 
-def _gather_variables(raw: str) -> List[str]:
+def _gather_variables(refs: RefIndex) -> List[str]:
     # Find vars.<NAME> references
-    return sorted(_collect_dotted_refs(raw, "vars"))
-
-def _gather_contexts(raw: str) -> List[str]:
-    exprs = _collect_expressions(raw)
-    roots = _collect_context_roots(exprs)
-    return sorted(roots)
-
-def render_workflow_doc(
+    return sorted(refs.vars)
+
+def _gather_contexts(refs: RefIndex) -> List[str]:
+    return sorted(refs.contexts)
+
+def _minutes(m: float) -> str:
+    return f"{m:.1f}".rstrip("0").rstrip(".")
+
+def _gather_job_instances(estimates: List[JobEstimate], hints: Optional[Dict[str, float]]) -> List[Block]:
+    """Job instances per job after matrix expansion, with runner-time estimates when hints are given."""
+    if not any(e.matrix is not None or e.instances is None for e in estimates) and not hints:
+        return []
+    rows = []
+    for e in estimates:
+        m = e.matrix
+        if e.instances is None:
+            detail = "matrix computed at run time"
+        elif m is None:
+            detail = "no matrix"
+        else:
+            detail = f"{m.combinations} combination(s)"
+            if m.excluded:
+                detail += f", {m.excluded} excluded"
+            if m.added:
+                detail += f", {m.added} added by include"
+            if m.max_parallel:
+                detail += f"; at most {m.max_parallel} in parallel"
+        instances = "?" if e.instances is None else str(e.instances)
+        if e.minutes is not None and e.instances is not None:
+            waves = -(-e.instances // m.max_parallel) if m and m.max_parallel else 1
+            detail += f"<br/>≈ {_minutes(e.instances * e.minutes)} runner-min, ≈ {_minutes(waves * e.minutes)} min wall"
+        rows.append((f"`{e.job}`", instances, detail))
+    instances, minutes, unhinted = runner_totals(estimates)
+    total = f"**Total:** {instances} job instance(s)"
+    if hints and unhinted < instances:
+        total += f", ≈ {_minutes(minutes)} runner-minutes"
+        if unhinted:
+            total += f" ({unhinted} instance(s) without a duration hint)"
+    if any(e.instances is None for e in estimates):
+        total += "; run-time matrices counted as one instance"
+    return [Heading(4, "Job instances:"), Table(("job", "instances", "details"), tuple(rows)), Paragraph(total)]
+
+def _wall_minutes(e: JobEstimate) -> Optional[float]:
+    """Wall time of a job: its matrix instances run in waves of max-parallel."""
+    if e.minutes is None:
+        return None
+    if e.instances and e.matrix and e.matrix.max_parallel:
+        return -(-e.instances // e.matrix.max_parallel) * e.minutes
+    return e.minutes
+
+def _gather_job_graph(data: Dict[str, Any], estimates: List[JobEstimate]) -> List[Block]:
+    """Mermaid diagram of the needs graph plus its critical path, width, leaves and cycles."""
+    graph = job_graph(data)
+    if len(graph.jobs) < 2:
+        return []
+    walls = {e.job: _wall_minutes(e) for e in estimates}
+    timed = all(m is not None for m in walls.values())
+    result = analyze(graph, walls if timed else None)
+    path = " → ".join(f"`{j}`" for j in result.critical_path)
+    length = f"≈ {_minutes(result.critical_length)} min" if timed else f"{len(result.critical_path)} job(s) in sequence"
+    facts = [
+        f"**Critical path:** {path} ({length})" if path else "**Critical path:** _None (every job is in a cycle)_",
+        f"**Widest level:** {result.width} ({', '.join(f'`{j}`' for j in result.widest_level)})",
+        f"**Jobs nothing depends on:** {', '.join(f'`{j}`' for j in result.leaves) or '_None_'}",
+        "**Cycles:** " + ("; ".join(" ↔ ".join(f"`{j}`" for j in c) for c in result.cycles) or "_None_"),
+    ]
+    facts.extend(f"**Unknown need:** `{job}` needs `{target}`, which is not a job in this file" for job, target in graph.unknown)
+    return [Heading(4, "Job graph:"), CodeBlock(mermaid(graph, result), "mermaid"), bullets(facts)]
+
+def _code_list(values: List[str]) -> Block:
+    return bullets(f"`{v}`" for v in values) if values else NONE
+
+def build_workflow_doc(
     data: Dict[str, Any],
     file_path: Path,
     llm_summary: bool = False,
     llm_model: str = "mistral",
     summarize_fn: Optional[callable] = None,
-) -> str:
+    expand_fn: Optional[Callable[[str], Optional[ListItem]]] = None,
+    duration_hints: Optional[Dict[str, float]] = None,
+    refs: Optional[RefIndex] = None,
+) -> Document:
     """
-    Render a single workflow file into Markdown with the required structure.
+    Build the format-neutral Document for a single workflow file.
+    duration_hints (see utils.matrix.load_duration_hints) add runner-time estimates.
+    refs, when given, is index_references(data) computed by the caller.
     """
-    md: List[str] = []
+    blocks: List[Block] = []
 
     # Title as H1 equals filename for clarity
-    md.append(f"# {file_path.stem}\n")
+    blocks.append(Heading(1, file_path.stem))
 
     # Section: File
-    md.append(_h2("File"))
-    md.append(f"{file_path.name}\n")  # exact filename
+    blocks.append(Heading(2, "File"))
+    blocks.append(Paragraph(file_path.name))  # exact filename
 
     # Section: Conditions to run
-    md.append(_h3("Conditions to run:"))
+    blocks.append(Heading(3, "Conditions to run:"))
     triggers = _list_on_triggers(data.get("on"))
-    if triggers:
-        md.append("- " + "\n- ".join(f"`{t}`" for t in triggers) + "\n")
-    else:
-        md.append("_None_\n")
+    blocks.append(_code_list(triggers))
 
     # Section: Inputs
-    md.append(_h4("Inputs"))
+    blocks.append(Heading(4, "Inputs"))
     inputs_rows = _gather_inputs(data)
-    md.append(_table(inputs_rows, ("input", "details")) + "\n")
+    blocks.append(table(inputs_rows, ("input", "details")))
 
     # Section: Purpose summary (AI)
-    md.append(_h3("Purpose summary:"))
+    blocks.append(Heading(3, "Purpose summary:"))
     if llm_summary and summarize_fn:
         # Construct a compact prompt based on workflow attributes
         compact = {
@@ -215,44 +338,55 @@ def render_workflow_doc(
             )
         except Exception as e:
             summary = f"_(Ollama error: {e})_"
-        if summary:
-            md.append(summary + "\n")
-        else:
-            md.append("_(LLM produced no summary)_\n")
+        blocks.append(Paragraph(summary or "_(LLM produced no summary)_"))
     else:
-        md.append("_(LLM summary disabled)_\n")
+        blocks.append(Paragraph("_(LLM summary disabled)_"))
 
     # Section: Steps completed
-    md.append(_h4("Steps completed:"))
-    step_lines = _gather_steps(data)
-    md.append("\n".join(step_lines) + ("\n" if step_lines else "_None_\n"))
+    blocks.append(Heading(4, "Steps completed:"))
+    with span("workflow.steps", "renderer"):
+        step_items = _gather_steps(data, expand_fn)
+    blocks.append(BulletList(tuple(step_items)) if step_items else NONE)
+
+    # Section: Job instances (matrix expansion), only when there is something to say
+    with span("workflow.matrix", "renderer"):
+        estimates = job_estimates(data, file_path, duration_hints)
+        blocks.extend(_gather_job_instances(estimates, duration_hints))
 
-    # Prepare raw text for scanning secrets/vars/contexts
-    raw = _stringify_yaml(data)
+    # Section: Job graph (needs), for workflows with more than one job
+    with span("workflow.graph", "renderer"):
+        blocks.extend(_gather_job_graph(data, estimates))
+
+    # One pass over the parsed data for secrets/vars/contexts
+    if refs is None:
+        with span("workflow.refs", "renderer"):
+            refs = index_references(data)
 
     # Section: Secrets used
-    md.append(_h3("Secrets used in the file"))
-    secrets_list = _gather_secrets(data, raw)
-    if secrets_list:
-        md.append("- " + "\n- ".join(f"`{s}`" for s in secrets_list) + "\n")
-    else:
-        md.append("_None_\n")
+    blocks.append(Heading(3, "Secrets used in the file"))
+    blocks.append(_code_list(_gather_secrets(data, refs)))
 
     # Section: Variables used
-    md.append(_h3("Variables used in the file"))
-    vars_list = _gather_variables(raw)
-    if vars_list:
-        md.append("- " + "\n- ".join(f"`{v}`" for v in vars_list) + "\n")
-    else:
-        md.append("_None_\n")
+    blocks.append(Heading(3, "Variables used in the file"))
+    blocks.append(_code_list(_gather_variables(refs)))
 
     # Section: GitHub Contexts used
-    md.append(_h3("GitHub Contexts used"))
-    ctxs = _gather_contexts(raw)
-    if ctxs:
-        md.append("- " + "\n- ".join(f"`{c}`" for c in ctxs) + "\n")
-    else:
-        md.append("_None_\n")
+    blocks.append(Heading(3, "GitHub Contexts used"))
+    blocks.append(_code_list(_gather_contexts(refs)))
+
+    blocks.append(Rule())
+    blocks.append(Paragraph("_Generated by action-teller_"))
+    name = data.get("name", file_path.stem)
+    return Document("workflow", name, str(file_path), tuple(blocks))
 
-    md.append("\n---\n_Generated by action-teller_")
-    return "\n".join(md)
+def render_workflow_doc(
+    data: Dict[str, Any],
+    file_path: Path,
+    llm_summary: bool = False,
+    llm_model: str = "mistral",
+    summarize_fn: Optional[callable] = None,
+) -> str:
+    """
+    Render a single workflow file into Markdown with the required structure.
+    """
+    return emit(build_workflow_doc(data, file_path, llm_summary, llm_model, summarize_fn))
@@ -0,0 +1,78 @@
+import posixpath
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from .file_finder import YAML_FILENAMES
+from .scanner import DEFAULT_EXCLUDES, excluded_path
+from .workflow_finder import CANDIDATE_EXTS
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class ArchiveMember(NamedTuple):
+    path: Path          # archive path joined with the member name, as documents report it
+    content: bytes
+
+
+def is_archive(path: Path) -> bool:
+    return path.is_file() and path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _member_name(name: str) -> Optional[str]:
+    """Normalized member name, or None for names that escape the archive root."""
+    name = posixpath.normpath(name.lstrip("/"))
+    if name in (".", "") or name == ".." or name.startswith("../"):
+        return None
+    return name
+
+
+def archive_members(
+    archive: Path,
+    want_actions: bool = True,
+    want_workflows: bool = True,
+    excludes: Optional[Iterable[str]] = None,
+) -> Iterator[ArchiveMember]:
+    """
+    Yield the action and workflow candidates in a zip or tar archive with
+    their content, in archive order, without extracting anything to disk.
+
+    Members are selected from the archive's member list by the same rules as
+    scan_tree; only selected members are read. Zip members are decompressed
+    individually. Tar archives, compressed or not, are read in one forward
+    pass, so the archive is never reopened or rewound.
+    """
+    import tarfile
+    import zipfile
+
+    skip = tuple(DEFAULT_EXCLUDES if excludes is None else excludes)
+
+    def wanted(name: str) -> bool:
+        base = posixpath.basename(name)
+        is_action = want_actions and base in YAML_FILENAMES
+        is_workflow = want_workflows and posixpath.splitext(base)[1].lower() in CANDIDATE_EXTS
+        return (is_action or is_workflow) and not excluded_path(name, skip)
+
+    try:
+        if zipfile.is_zipfile(archive):
+            with zipfile.ZipFile(archive) as zf:
+                for info in zf.infolist():
+                    name = None if info.is_dir() else _member_name(info.filename)
+                    if name and wanted(name):
+                        yield ArchiveMember(archive / name, zf.read(info))
+            return
+        with tarfile.open(archive, "r|*") as tf:
+            for info in tf:
+                name = _member_name(info.name) if info.isfile() else None
+                if name and wanted(name):
+                    yield ArchiveMember(archive / name, tf.extractfile(info).read())
+            # tarfile ends the member list quietly when the stream stops short
+            # of the end-of-archive block, so a cut-off download would pass
+            # for a smaller archive; that block is only read in full at the end.
+            if tf.fileobj.tell() < tf.offset + tarfile.BLOCKSIZE:
+                raise ArchiveError(f"cannot read {archive}: truncated archive")
+    except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile) as e:
+        raise ArchiveError(f"cannot read {archive}: {e}")
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .. import __version__
+
+CACHE_FILENAME = ".cifolio-cache.sqlite3"
+CACHE_FORMAT = 9
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(p: Path) -> str:
+    return content_digest(p.read_bytes())
+
+
+class BuildCache:
+    """
+    Persistent map of source file -> emitted documents (one per format), stored in the output
+    directory. An entry is reused only when the file's content hash matches and
+    the cache was written by the same tool version with the same options,
+    and every file it depends on (see utils.expander) still has the digest
+    recorded with it.
+
+    Entries live in SQLite and are fetched one at a time, so memory use does
+    not grow with the number of files.
+    """
+
+    def __init__(self, out: Path, options: Dict[str, Any], fresh: bool = False):
+        self.path = out / CACHE_FILENAME
+        self.signature = json.dumps(
+            {"format": CACHE_FORMAT, "version": __version__, "options": options},
+            sort_keys=True,
+        )
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        if fresh or row is None or row[0] != self.signature:
+            # The table layout may differ between cache formats, so start over.
+            self._db.execute("DROP TABLE IF EXISTS docs")
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)",
+                (self.signature,),
+            )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " key TEXT PRIMARY KEY,"
+            " sha256 TEXT NOT NULL,"
+            " name TEXT,"
+            " outputs TEXT,"
+            " catalog TEXT,"
+            " facts TEXT,"
+            " deps TEXT,"
+            " runner TEXT,"
+            " seen INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("UPDATE docs SET seen = 0")
+
+    @staticmethod
+    def _key(kind: str, path: Path) -> str:
+        return f"{kind}:{path}"
+
+    def check(
+        self,
+        kind: str,
+        path: Path,
+        digest: str,
+        deps_current: Optional[Callable[[List[Tuple[str, str]]], bool]] = None,
+    ) -> bool:
+        """
+        Whether a current entry exists for path, counting a hit or a miss.
+        Only the digests are read; fetch() loads the documents when they are needed.
+        """
+        key = self._key(kind, path)
+        row = self._db.execute("SELECT sha256, deps FROM docs WHERE key = ?", (key,)).fetchone()
+        deps = [tuple(d) for d in json.loads(row[1])] if row is not None and row[1] else []
+        if row is None or row[0] != digest or (deps and deps_current is not None and not deps_current(deps)):
+            self.misses += 1
+            return False
+        self.hits += 1
+        self._db.execute("UPDATE docs SET seen = 1 WHERE key = ?", (key,))
+        return True
+
+    def fetch(self, kind: str, path: Path) -> Optional[Dict[str, Any]]:
+        """The stored entry for path, as check() found it; None if there is none."""
+        row = self._db.execute(
+            "SELECT sha256, name, outputs, catalog, facts, deps, runner FROM docs WHERE key = ?",
+            (self._key(kind, path),),
+        ).fetchone()
+        if row is None:
+            return None
+        outputs = json.loads(row[2]) if row[2] is not None else None
+        return {"sha256": row[0], "name": row[1], "outputs": outputs, "catalog": row[3], "facts": row[4],
+                "deps": [tuple(d) for d in json.loads(row[5])] if row[5] else [],
+                "runner": tuple(json.loads(row[6])) if row[6] else None}
+
+    def lookup(
+        self,
+        kind: str,
+        path: Path,
+        digest: str,
+        deps_current: Optional[Callable[[List[Tuple[str, str]]], bool]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """check() and fetch() in one call."""
+        if not self.check(kind, path, digest, deps_current):
+            return None
+        return self.fetch(kind, path)
+
+    def store(
+        self,
+        kind: str,
+        path: Path,
+        digest: str,
+        name: Optional[str],
+        outputs: Optional[Dict[str, str]],
+        catalog: Optional[str] = None,
+        facts: Optional[str] = None,
+        deps: Sequence[Tuple[str, Optional[str]]] = (),
+        runner: Optional[Tuple[int, float, int]] = None,
+    ) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO docs (key, sha256, name, outputs, catalog, facts, deps, runner, seen)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)",
+            (self._key(kind, path), digest, name, json.dumps(outputs) if outputs is not None else None,
+             catalog, facts, json.dumps(list(deps)) if deps else None,
+             json.dumps(list(runner)) if runner is not None else None),
+        )
+
+    def dependents(self, path: Path) -> List[Tuple[str, Path]]:
+        """(kind, path) of every stored document that depends on path."""
+        needle = json.dumps(str(path))
+        rows = self._db.execute("SELECT key, deps FROM docs WHERE instr(deps, ?) > 0", (needle,)).fetchall()
+        result = []
+        for key, deps in rows:
+            if any(p == str(path) for p, _ in json.loads(deps)):
+                kind, _, doc = key.partition(":")
+                result.append((kind, Path(doc)))
+        return result
+
+    def commit(self) -> None:
+        self._db.commit()
+
+    def save(self, prune: bool = True) -> None:
+        # Only entries touched in this run are kept, so deleted sources drop out.
+        # Partial runs (e.g. --since) saw only some files and keep the rest.
+        if prune:
+            self._db.execute("DELETE FROM docs WHERE seen = 0")
+        self._db.commit()
+        self._db.close()
@@ -0,0 +1,183 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .matrix import job_estimates
+from .writer import replace_from_temp
+from ..renderers import inputs, outputs, runs
+from ..renderers.workflow_markdown import (
+    RefIndex, _collect_inputs, _gather_contexts, _gather_secrets, _gather_variables,
+    _list_on_triggers, index_references,
+)
+
+# Bump the major version on any incompatible change to the record layout;
+# new optional fields may be added without a bump.
+CATALOG_SCHEMA = "cifolio.catalog/1"
+
+
+def catalog_record(kind: str, path: Path, data: Dict[str, Any], refs: Optional[RefIndex] = None) -> Dict[str, Any]:
+    """
+    The structured data behind one action or workflow page, as a plain dict.
+
+    Actions carry inputs/outputs/runs; workflows carry triggers, inputs
+    (workflow_dispatch and workflow_call), jobs and the job instances each
+    starts after matrix expansion (None when computed at run time). Both carry the secrets,
+    vars and contexts referenced anywhere in the file. refs, when given, is
+    index_references(data) computed by the caller.
+    """
+    if refs is None:
+        refs = index_references(data)
+    record: Dict[str, Any] = {
+        "schema": CATALOG_SCHEMA,
+        "kind": kind,
+        "path": str(path),
+        "name": data.get("name", path.stem),
+    }
+    if kind == "action":
+        record.update(
+            description=(data.get("description") or "").strip(),
+            author=data.get("author", ""),
+            inputs=inputs.entries(data.get("inputs")),
+            outputs=outputs.entries(data.get("outputs")),
+            runs=runs.describe(data.get("runs")),
+        )
+    else:
+        record.update(
+            triggers=_list_on_triggers(data.get("on")),
+            inputs=_collect_inputs(data),
+            jobs=list((data.get("jobs") or {}).keys()),
+            instances={e.job: e.instances for e in job_estimates(data, path)},
+        )
+    record.update(
+        secrets=_gather_secrets(data, refs),
+        vars=_gather_variables(refs),
+        contexts=_gather_contexts(refs),
+    )
+    return record
+
+
+def catalog_line(record: Dict[str, Any]) -> str:
+    # YAML may yield dates and other non-JSON scalars; str() keeps the line valid.
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _record_key(line: str) -> Tuple[str, str]:
+    record = json.loads(line)
+    return record["kind"], record["path"]
+
+
+class CatalogWriter:
+    """
+    Streams NDJSON catalog records, one line per document, as results arrive.
+
+    Records go to a temp file next to path that replaces it atomically on a
+    clean close, so path shows nothing of the run until then and readers
+    never see a half-written catalog. A path of "-" streams to stdout
+    instead, flushing after every record.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._tmp: Optional[str] = None
+        if str(path) == "-":
+            self._file = sys.stdout
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, self._tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+            self._file = os.fdopen(fd, "w", encoding="utf-8")
+
+    def add(self, key: Hashable, line: str) -> None:
+        self._file.write(line + "\n")
+        self.count += 1
+        if self._tmp is None:
+            self._file.flush()
+
+    def remove(self, key: Hashable) -> None:
+        # Nothing was written for a skipped file in a fresh stream.
+        pass
+
+    def close(self, commit: bool = True) -> None:
+        if self._tmp is None:
+            self._file.flush()
+            return
+        self._file.close()
+        if commit:
+            replace_from_temp(self._tmp, self.path)
+        else:
+            try:
+                os.unlink(self._tmp)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "CatalogWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(commit=exc_type is None)
+
+
+class CatalogUpdate:
+    """
+    Collects the records of a partial run (a --watch pass, --since/--diff) and
+    merges them into an existing catalog: changed documents are replaced in
+    place, removed ones dropped and new ones appended. The old catalog is
+    streamed, never loaded whole. On stdout ("-") only the new records are
+    written.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.changes: Dict[Tuple[str, str], Optional[str]] = {}
+        self.count = 0      # records in the catalog once merged
+
+    @staticmethod
+    def _key(key: Hashable) -> Tuple[str, str]:
+        kind, path = key
+        return kind, str(path)
+
+    def add(self, key: Hashable, line: str) -> None:
+        self.changes[self._key(key)] = line
+
+    def remove(self, key: Hashable) -> None:
+        self.changes[self._key(key)] = None
+
+    def close(self, commit: bool = True) -> None:
+        if not commit or not self.changes:
+            return
+        if str(self.path) == "-":
+            with CatalogWriter(self.path) as out:
+                for key, line in self.changes.items():
+                    if line is not None:
+                        out.add(key, line)
+            self.count = out.count
+            return
+        pending = dict(self.changes)
+        with CatalogWriter(self.path) as out:
+            try:
+                with open(self.path, encoding="utf-8") as old:
+                    for line in old:
+                        line = line.rstrip("\n")
+                        if not line:
+                            continue
+                        key = _record_key(line)
+                        if key in pending:
+                            line = pending.pop(key)
+                            if line is None:
+                                continue
+                        out.add(key, line)
+            except FileNotFoundError:
+                pass
+            for key, line in pending.items():
+                if line is not None:
+                    out.add(key, line)
+        self.count = out.count
+
+    def __enter__(self) -> "CatalogUpdate":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(commit=exc_type is None)
@@ -0,0 +1,476 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .build_cache import content_digest
+from .file_finder import YAML_FILENAMES
+from .option_defaults import DEFAULT_SERVE_ENTRIES, DEFAULT_SERVE_WORKERS, FORMATS
+from .pipeline import ACTION, WORKFLOW, DocTask, render_parsed
+from .scanner import DEFAULT_EXCLUDES, scan_tree
+from .workflow_sniffer import in_workflows_dir, looks_like_workflow
+from .yaml_loader import parse_yaml_bytes
+
+# Latest requests per method kept for the latency percentiles in metrics().
+LATENCY_WINDOW = 1024
+
+# A file changed this shortly before it was read can change again without its
+# stat changing (timestamps are coarse on many filesystems), so until it has
+# been read once after settling, a matching stat is not trusted.
+RACY_NS = 2_000_000_000
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+RENDER_FAILED = -32000          # the file could not be read, parsed or rendered
+NOT_A_WORKFLOW = -32001         # parsed fine, but has no top-level `on:`
+
+_HTTP_STATUS = {PARSE_ERROR: 400, INVALID_REQUEST: 400, METHOD_NOT_FOUND: 404, INVALID_PARAMS: 400, RENDER_FAILED: 422,
+                NOT_A_WORKFLOW: 422}
+
+_CONTENT_TYPES = {
+    "md": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "confluence": "application/xml; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+}
+
+
+class RequestError(Exception):
+    """A request the server answers with an error; code is a JSON-RPC error code."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class _LRU:
+    """Bounded map that drops its least recently used entries and counts hits and misses."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._data),
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None}
+
+
+class _Latency:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def add(self, seconds: float, failed: bool) -> None:
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        recent = sorted(self.recent)
+
+        def ms(seconds: float) -> float:
+            return round(seconds * 1000, 3)
+
+        def pct(q: float) -> float:
+            return ms(recent[min(len(recent) - 1, int(q * len(recent)))])
+
+        return {"requests": self.count, "errors": self.errors, "mean_ms": ms(self.total / self.count),
+                "p50_ms": pct(0.5), "p95_ms": pct(0.95), "max_ms": ms(self.max)}
+
+
+class DocServer:
+    """
+    Renders actions and workflows on request for a long-running `serve`
+    process. Parsed files are kept in memory by content hash and rendered
+    output by path, content hash and formats, so repeated requests for an
+    unchanged file skip parsing and rendering; a file whose mtime, size,
+    inode and ctime have not changed is not even re-read. Both tables are
+    LRU-bounded.
+
+    Safe to call from several threads: the tables sit behind one lock,
+    while reading, parsing and rendering run outside it.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        formats: Iterable[str] = ("md",),
+        max_entries: int = DEFAULT_SERVE_ENTRIES,
+        excludes: Iterable[str] = (),
+        use_gitignore: bool = True,
+    ):
+        self.root = Path(os.path.realpath(root))
+        self.formats = tuple(formats)
+        self.excludes = DEFAULT_EXCLUDES + tuple(excludes)
+        self.use_gitignore = use_gitignore
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._sources = _LRU(max_entries)     # path -> (stat stamp or None, digest)
+        self._parsed = _LRU(max_entries)      # digest -> (data, error)
+        self._rendered = _LRU(max_entries)    # (kind, path, digest, formats) -> result
+        self._latency: Dict[str, _Latency] = {}
+        self.methods: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "render": self.render,
+            "render_tree": self.render_tree,
+            "metrics": lambda params: self.metrics(),
+        }
+
+    # ---------------- requests ----------------
+
+    def handle(self, method: str, params: Any) -> Any:
+        """Run one request by method name; RequestError for anything the client got wrong."""
+        started = time.perf_counter()
+        failed = True
+        try:
+            fn = self.methods.get(method)
+            if fn is None:
+                raise RequestError(METHOD_NOT_FOUND, f"unknown method {method!r}; choose from {', '.join(self.methods)}")
+            if params is None:
+                params = {}
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "params must be an object")
+            result = fn(params)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._latency.setdefault(method if method in self.methods else "?", _Latency()).add(elapsed, failed)
+
+    def render(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        params: path (relative to the root, or absolute inside it), and
+        optionally content (the text to render instead of the file, e.g. an
+        unsaved editor buffer), kind ("action" or "workflow") and formats.
+        """
+        path = self._resolve(params.get("path"))
+        content = params.get("content")
+        if content is not None and not isinstance(content, str):
+            raise RequestError(INVALID_PARAMS, "content must be a string")
+        kind = params.get("kind") or (ACTION if path.name in YAML_FILENAMES else WORKFLOW)
+        if kind not in (ACTION, WORKFLOW):
+            raise RequestError(INVALID_PARAMS, f"kind must be {ACTION!r} or {WORKFLOW!r}")
+        return self._render(kind, path, self._formats(params), None if content is None else content.encode())
+
+    def render_tree(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        params: path (a directory, default the root), actions and workflows
+        (both default true) and formats. Files that fail are listed under
+        errors; YAML files that turn out not to be workflows are counted.
+        """
+        root = self._resolve(params.get("path", "."))
+        if not root.is_dir():
+            raise RequestError(INVALID_PARAMS, f"not a directory: {root}")
+        want_actions = params.get("actions", True) is not False
+        want_workflows = params.get("workflows", True) is not False
+        formats = self._formats(params)
+        scan = scan_tree(root, want_actions=want_actions, want_workflows=want_workflows,
+                         excludes=self.excludes, use_gitignore=self.use_gitignore)
+        candidates = [f for f in scan.workflows if f.name not in YAML_FILENAMES]
+        workflows = [f for f in candidates if in_workflows_dir(f) or looks_like_workflow(f)]
+        targets = [(ACTION, f) for f in scan.actions] + [(WORKFLOW, f) for f in workflows]
+        documents, errors, skipped = [], [], len(candidates) - len(workflows)
+        for kind, f in targets:
+            try:
+                documents.append(self._render(kind, f, formats))
+            except RequestError as e:
+                if e.code == NOT_A_WORKFLOW:
+                    skipped += 1
+                else:
+                    errors.append({"path": str(f), "kind": kind, "error": str(e)})
+        return {"root": str(root), "documents": documents, "errors": errors, "skipped": skipped}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "uptime_s": round(time.time() - self.started, 1),
+                "parsed": self._parsed.stats(),
+                "rendered": self._rendered.stats(),
+                "latency": {m: l.stats() for m, l in sorted(self._latency.items())},
+            }
+
+    # ---------------- internals ----------------
+
+    def _resolve(self, raw: Any) -> Path:
+        if not isinstance(raw, str) or not raw:
+            raise RequestError(INVALID_PARAMS, "path is required")
+        p = Path(os.path.realpath(self.root / raw))
+        if p != self.root and os.path.commonpath([str(p), str(self.root)]) != str(self.root):
+            raise RequestError(INVALID_PARAMS, f"{raw} is outside the served root {self.root}")
+        return p
+
+    def _formats(self, params: Dict[str, Any]) -> Tuple[str, ...]:
+        formats = params.get("formats", self.formats)
+        if isinstance(formats, str):
+            formats = [f.strip().lower() for f in formats.split(",") if f.strip()]
+        if not isinstance(formats, (list, tuple)) or not formats or any(f not in FORMATS for f in formats):
+            raise RequestError(INVALID_PARAMS, f"formats must be a non-empty list drawn from {', '.join(FORMATS)}")
+        return tuple(dict.fromkeys(formats))
+
+    def _source(self, path: Path, content: Optional[bytes], reread: bool = False) -> Tuple[str, Optional[bytes]]:
+        """
+        (digest, bytes) of the request's content or the file; bytes is None
+        when the file's stat matches the last read, unless reread. A stat
+        taken within RACY_NS of the file's last change is not remembered.
+        """
+        if content is not None:
+            return content_digest(content), content
+        key = str(path)
+        try:
+            st = path.stat()
+        except OSError as e:
+            raise RequestError(RENDER_FAILED, f"cannot read {path}: {e.strerror or e}")
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino, st.st_ctime_ns)
+        if not reread:
+            with self._lock:
+                known = self._sources.get(key)
+            if known is not None and known[0] == stamp:
+                return known[1], None
+        try:
+            data = path.read_bytes()
+        except OSError as e:
+            raise RequestError(RENDER_FAILED, f"cannot read {path}: {e.strerror or e}")
+        digest = content_digest(data)
+        settled = time.time_ns() - max(st.st_mtime_ns, st.st_ctime_ns) >= RACY_NS
+        with self._lock:
+            self._sources.put(key, (stamp if settled else None, digest))
+        return digest, data
+
+    def _render(self, kind: str, path: Path, formats: Tuple[str, ...], content: Optional[bytes] = None) -> Dict[str, Any]:
+        digest, content = self._source(path, content)
+        with self._lock:
+            cached = self._rendered.get((kind, str(path), digest, formats))
+            parsed = None if cached is not None else self._parsed.get(digest)
+        if cached is not None:
+            return cached
+        if parsed is None:
+            if content is None:
+                # Unchanged on disk but no longer in memory: read it again (and hash what was read).
+                digest, content = self._source(path, None, reread=True)
+            try:
+                parsed = (parse_yaml_bytes(content), None)
+            except Exception as e:
+                parsed = (None, str(e))
+            with self._lock:
+                self._parsed.put(digest, parsed)
+        data, error = parsed
+        if error is not None:
+            raise RequestError(RENDER_FAILED, f"cannot parse {path}: {error}")
+        try:
+            result = render_parsed(DocTask(kind, path, formats=formats), data)
+        except Exception as e:
+            raise RequestError(RENDER_FAILED, f"cannot render {path}: {e}")
+        if result.outputs is None:
+            raise RequestError(NOT_A_WORKFLOW, f"{path} is not a workflow (no top-level 'on')")
+        rendered = {"path": str(path), "kind": kind, "name": result.name, "digest": digest, "outputs": result.outputs}
+        with self._lock:
+            self._rendered.put((kind, str(path), digest, formats), rendered)
+        return rendered
+
+
+# ---------------- JSON-RPC over stdio ----------------
+
+def _rpc_error(msg_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}}
+
+
+def _rpc_call(server: DocServer, message: Any) -> Optional[Dict[str, Any]]:
+    """Answer one JSON-RPC 2.0 request; None for notifications (no id)."""
+    if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+        return _rpc_error(message.get("id") if isinstance(message, dict) else None, INVALID_REQUEST, "invalid request")
+    msg_id = message.get("id")
+    try:
+        result = server.handle(message["method"], message.get("params"))
+    except RequestError as e:
+        response = _rpc_error(msg_id, e.code, str(e))
+    except Exception as e:
+        response = _rpc_error(msg_id, RENDER_FAILED, f"{type(e).__name__}: {e}")
+    else:
+        response = {"jsonrpc": "2.0", "id": msg_id, "result": result}
+    return response if "id" in message else None
+
+
+def rpc_answer(server: DocServer, line: str) -> Optional[Any]:
+    """The response to one line of JSON-RPC input (a request or a batch), or None when nothing is owed."""
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        return _rpc_error(None, PARSE_ERROR, f"parse error: {e}")
+    if isinstance(message, list):
+        if not message:
+            return _rpc_error(None, INVALID_REQUEST, "empty batch")
+        responses = [r for r in (_rpc_call(server, m) for m in message) if r is not None]
+        return responses or None
+    return _rpc_call(server, message)
+
+
+def serve_stdio(server: DocServer, workers: int = DEFAULT_SERVE_WORKERS,
+                stdin: Optional[IO[str]] = None, stdout: Optional[IO[str]] = None) -> None:
+    """
+    Read JSON-RPC 2.0 messages from stdin, one per line, and write one
+    response line per request to stdout as each finishes, so responses can
+    arrive out of order (match them by id). At most `workers` requests run
+    at once and as many more are queued before reading pauses. A "shutdown"
+    request or end of input stops reading; requests in flight still finish.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def respond(line: str) -> None:
+        try:
+            response = rpc_answer(server, line)
+            if response is not None:
+                text = json.dumps(response, ensure_ascii=False)
+                with write_lock:
+                    stdout.write(text + "\n")
+                    stdout.flush()
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            if _is_shutdown(line):
+                with write_lock:
+                    stdout.write(json.dumps({"jsonrpc": "2.0", "id": json.loads(line).get("id"), "result": None}) + "\n")
+                    stdout.flush()
+                break
+            slots.acquire()
+            pool.submit(respond, line)
+
+
+def _is_shutdown(line: str) -> bool:
+    if '"shutdown"' not in line:
+        return False
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(message, dict) and message.get("method") == "shutdown"
+
+
+# ---------------- HTTP ----------------
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    GET  /metrics                        metrics as JSON
+    GET  /render?path=P[&format=F][&kind=K]
+                                         the document itself, in one format
+    POST /render, /render_tree, ...      JSON params in, JSON result out
+    POST /rpc                            a JSON-RPC 2.0 request or batch
+    """
+
+    server_version = "cifolio-serve"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            self._call("metrics", {})
+        elif url.path == "/render":
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            fmt = query.pop("format", None) or self.server.docs.formats[0]
+            query["formats"] = [fmt]
+            with self.server.slots:
+                try:
+                    result = self.server.docs.handle("render", query)
+                except RequestError as e:
+                    return self._send_json(_HTTP_STATUS[e.code], {"error": {"code": e.code, "message": str(e)}})
+                except Exception as e:
+                    return self._send_json(500, {"error": {"code": RENDER_FAILED, "message": f"{type(e).__name__}: {e}"}})
+            self._send(200, result["outputs"][fmt].encode(), _CONTENT_TYPES[fmt])
+        else:
+            self._send_json(404, {"error": {"code": METHOD_NOT_FOUND, "message": f"no such resource: {url.path}"}})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", "replace") if length else ""
+        path = urlsplit(self.path).path
+        if path == "/rpc":
+            with self.server.slots:
+                response = rpc_answer(self.server.docs, body)
+            if response is None:
+                return self._send(204, b"", "application/json")
+            return self._send_json(200, response)
+        try:
+            params = json.loads(body) if body.strip() else {}
+        except ValueError as e:
+            return self._send_json(400, {"error": {"code": PARSE_ERROR, "message": f"parse error: {e}"}})
+        self._call(path.strip("/"), params)
+
+    def _call(self, method: str, params: Any) -> None:
+        with self.server.slots:
+            try:
+                result = self.server.docs.handle(method, params)
+            except RequestError as e:
+                return self._send_json(_HTTP_STATUS[e.code], {"error": {"code": e.code, "message": str(e)}})
+            except Exception as e:
+                return self._send_json(500, {"error": {"code": RENDER_FAILED, "message": f"{type(e).__name__}: {e}"}})
+        self._send_json(200, result)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode(), _CONTENT_TYPES["json"])
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass    # latencies are in /metrics; stderr stays quiet
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], docs: DocServer, workers: int):
+        super().__init__(address, _Handler)
+        self.docs = docs
+        self.slots = threading.BoundedSemaphore(workers)
+
+
+def make_http_server(docs: DocServer, host: str, port: int, workers: int = DEFAULT_SERVE_WORKERS) -> _HTTPServer:
+    """
+    An HTTP server for docs; call serve_forever() on it. Each connection
+    gets a thread, but at most `workers` requests are handled at once.
+    """
+    return _HTTPServer((host, port), docs, workers)
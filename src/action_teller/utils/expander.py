@@ -0,0 +1,136 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .option_defaults import DEFAULT_EXPAND_DEPTH
+from .yaml_loader import parse_action_yaml
+from ..renderers import runs
+from ..renderers.model import BulletList, ListItem
+from ..renderers.workflow_markdown import _gather_steps
+
+
+ACTION_FILENAMES = ("action.yml", "action.yaml")
+
+
+class LocalExpander:
+    """
+    expand_fn for the renderers: turns a local `uses: ./...` reference into a
+    list item holding the steps it runs, recursively.
+
+    References resolve against root, like GitHub resolves them against the
+    repository checkout: a directory means the action.yml inside it, a file
+    a reusable workflow. Each referenced file is parsed at most once, and
+    each expansion is built once per remaining depth and then reused, so a
+    composite used by hundreds of workflows costs one parse and one build.
+    References that resolve outside root, through `..` or a symlink, are
+    never read. References back into the chain being expanded are reported as cycles;
+    chains deeper than max_depth are cut off with a note. Expansions that
+    ran into a cycle depend on where they were entered and are not stored;
+    stored ones are only reused where they cannot close a cycle.
+
+    deps() names every file the current document's expansions read, for
+    cache invalidation.
+    """
+
+    def __init__(self, root: Path, max_depth: int = DEFAULT_EXPAND_DEPTH):
+        self.root = Path(root)
+        self.max_depth = max_depth
+        self._real_root = os.path.realpath(self.root)
+        self._resolved: Dict[str, Path] = {}
+        self._outside: Set[str] = set()           # references resolving outside root
+        self._parsed: Dict[Path, Any] = {}        # path -> data, or the error message
+        self._expanded: Dict[Tuple[Path, int], Tuple[ListItem, FrozenSet[Path]]] = {}
+        self._chain: List[Path] = []
+        self._deps: List[Set[Path]] = [set()]
+        self.cycles = 0
+
+    def begin_document(self, path: Path) -> None:
+        """Start tracking a new document; a reference back to path itself is a cycle."""
+        self._chain = [Path(path)]
+        self._deps = [set()]
+
+    def deps(self) -> Tuple[str, ...]:
+        return tuple(sorted(str(p) for p in self._deps[0]))
+
+    def resolve(self, uses: str) -> Optional[Path]:
+        if not isinstance(uses, str) or not uses.startswith("./"):
+            return None
+        path = self._resolved.get(uses)
+        if path is None:
+            path = self.root / uses[2:].rstrip("/")
+            if path.is_dir():
+                path = next((path / n for n in ACTION_FILENAMES if (path / n).is_file()), path / ACTION_FILENAMES[0])
+            if not self._within_root(path):
+                self._outside.add(uses)
+            self._resolved[uses] = path
+        return path
+
+    def _within_root(self, path: Path) -> bool:
+        real = os.path.realpath(path)
+        return real == self._real_root or os.path.commonpath([real, self._real_root]) == self._real_root
+
+    def _load(self, path: Path) -> Any:
+        if path not in self._parsed:
+            try:
+                self._parsed[path] = parse_action_yaml(path)
+            except FileNotFoundError:
+                self._parsed[path] = f"`{self._rel(path)}` not found"
+            except Exception as e:
+                self._parsed[path] = f"cannot read `{self._rel(path)}`: {e}"
+        return self._parsed[path]
+
+    def _rel(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def __call__(self, uses: str) -> Optional[ListItem]:
+        path = self.resolve(uses)
+        if path is None:
+            return None
+        if uses in self._outside:
+            return ListItem(f"_Not expanded: `{uses}` resolves outside the repository_")
+        if path in self._chain:
+            self.cycles += 1
+            return ListItem(f"_Not expanded: `{uses}` is already being expanded (cycle)_")
+        remaining = self.max_depth - len(self._chain) + 1
+        if remaining <= 0:
+            return ListItem(f"_Not expanded: depth limit ({self.max_depth}) reached_")
+        hit = self._expanded.get((path, remaining))
+        # A memoized expansion that reads a file on the current chain would hide a cycle here.
+        if hit is not None and hit[1].isdisjoint(self._chain):
+            item, deps = hit
+            self._deps[-1] |= deps
+            return item
+
+        cycles = self.cycles
+        self._chain.append(path)
+        self._deps.append({path})
+        try:
+            item = self._expand(path)
+        finally:
+            self._chain.pop()
+            deps = self._deps.pop()
+        self._deps[-1] |= deps
+        if self.cycles == cycles:
+            self._expanded[(path, remaining)] = (item, frozenset(deps))
+        return item
+
+    def _expand(self, path: Path) -> ListItem:
+        data = self._load(path)
+        rel = self._rel(path)
+        if isinstance(data, str):
+            return ListItem(f"_Not expanded: {data}_")
+        if not isinstance(data, dict):
+            return ListItem(f"_Not expanded: `{rel}` is not a mapping_")
+        if "jobs" in data:
+            items = _gather_steps(data, self)
+            return ListItem(f"**Expands** `{rel}` (reusable workflow):", (BulletList(tuple(items)),) if items else ())
+        spec = data.get("runs") or {}
+        using = spec.get("using", "") if isinstance(spec, dict) else ""
+        steps = spec.get("steps") if using == "composite" else None
+        if not steps:
+            return ListItem(f"**Expands** `{rel}`: runs `{using or 'unknown'}`")
+        items = tuple(runs._step_item(i, s, self) for i, s in enumerate(steps, start=1) if isinstance(s, dict))
+        return ListItem(f"**Expands** `{rel}` (composite):", (BulletList(items),))
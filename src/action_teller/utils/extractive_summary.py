@@ -0,0 +1,82 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..renderers.workflow_markdown import (
+    RefIndex, _collect_inputs, _gather_secrets, _list_on_triggers, index_references,
+)
+
+# How many names a sentence lists before it switches to "and N more".
+MAX_LISTED = 5
+
+_RUNTIMES = {"composite": "Composite", "docker": "Docker container"}
+
+
+def _names(values: Iterable[str]) -> str:
+    values = list(values)
+    listed = ", ".join(f"`{v}`" for v in values[:MAX_LISTED])
+    rest = len(values) - MAX_LISTED
+    return f"{listed} and {rest} more" if rest > 0 else listed
+
+
+def _used_actions(steps: Iterable[Any]) -> List[str]:
+    """Marketplace actions (owner/repo[/path]) used by steps, without versions, in first-use order."""
+    seen: Dict[str, None] = {}
+    for s in steps:
+        uses = s.get("uses") if isinstance(s, dict) else None
+        if isinstance(uses, str) and not uses.startswith(("./", "docker://")):
+            seen.setdefault(uses.split("@", 1)[0], None)
+    return list(seen)
+
+
+def _workflow_steps(data: Dict[str, Any]) -> Iterable[Any]:
+    for job in (data.get("jobs") or {}).values():
+        if isinstance(job, dict):
+            yield job                       # a job-level `uses:` calls a reusable workflow
+            yield from job.get("steps") or []
+
+
+def extractive_summary(kind: str, data: Dict[str, Any], refs: Optional[RefIndex] = None) -> str:
+    """
+    A short summary assembled from the parsed file alone: what runs it,
+    what triggers it, the actions it uses, its inputs and outputs and the
+    secrets it touches. Deterministic, offline and fast enough to run on
+    every file of every build. refs, when given, is index_references(data)
+    computed by the caller.
+    """
+    name = data.get("name") or ""
+    sentences: List[str] = []
+    if refs is None:
+        refs = index_references(data)
+    if kind == "action":
+        runs = data.get("runs") if isinstance(data.get("runs"), dict) else {}
+        using = str(runs.get("using") or "")
+        runtime = _RUNTIMES.get(using) or (f"JavaScript ({using})" if using.startswith("node") else "")
+        lead = f"{runtime} action" if runtime else "Action"
+        sentences.append(f"{lead} `{name}`." if name else f"{lead}.")
+        inputs = data.get("inputs") if isinstance(data.get("inputs"), dict) else {}
+        outputs = data.get("outputs") if isinstance(data.get("outputs"), dict) else {}
+        steps = runs.get("steps") if using == "composite" else None
+    else:
+        sentences.append(f"Workflow `{name}`." if name else "Workflow.")
+        triggers = _list_on_triggers(data.get("on"))
+        if triggers:
+            sentences.append(f"Runs on {_names(triggers)}.")
+        jobs = [str(j) for j in (data.get("jobs") or {})]
+        if jobs:
+            sentences.append(f"{len(jobs)} job(s): {_names(jobs)}.")
+        inputs = {e["name"]: e for e in _collect_inputs(data)}
+        outputs = {}
+        steps = _workflow_steps(data)
+
+    used = _used_actions(steps or [])
+    if used:
+        sentences.append(f"Uses {_names(used)}.")
+    if inputs:
+        required = [k for k, v in inputs.items() if isinstance(v, dict) and v.get("required") is True]
+        line = f"Takes {len(inputs)} input(s): {_names(inputs)}"
+        sentences.append(line + (f" ({len(required)} required)." if required else "."))
+    if outputs:
+        sentences.append(f"Produces {_names(outputs)}.")
+    secrets = _gather_secrets(data, refs) if kind != "action" else sorted(refs.secrets)
+    if secrets:
+        sentences.append(f"Reads secrets {_names(secrets)}.")
+    return " ".join(sentences)
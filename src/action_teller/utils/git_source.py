@@ -0,0 +1,103 @@
+import subprocess
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+# git file modes that are not regular blobs: symlinks and submodules.
+_SKIP_MODES = {"120000", "160000"}
+
+
+class GitError(Exception):
+    pass
+
+
+class GitChange(NamedTuple):
+    path: Path              # under the scan root, as scan_tree would report it
+    blob: Optional[str]     # object id of the new content; None when deleted
+
+
+def parse_range(spec: str) -> Tuple[str, str]:
+    """
+    Split "BASE..HEAD" or "BASE...HEAD" (HEAD defaults to HEAD) into the
+    git diff arguments. Three dots compare against the merge base.
+    """
+    for sep in ("...", ".."):
+        if sep in spec:
+            base, head = spec.split(sep, 1)
+            if not base:
+                raise GitError(f"missing base ref in {spec!r}")
+            return f"{base}{sep}{head or 'HEAD'}", head or "HEAD"
+    raise GitError(f"expected BASE..HEAD, got {spec!r}")
+
+
+def _git(root: Path, *args: str) -> bytes:
+    try:
+        proc = subprocess.run(
+            ["git", *args], cwd=str(root), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except OSError as e:
+        raise GitError(f"cannot run git: {e}")
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.decode("utf-8", "replace").strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def changed_files(root: Path, spec: str) -> List[GitChange]:
+    """
+    Files under root that differ between the two refs of spec, read from
+    `git diff --raw` so neither side has to be checked out. Renames are
+    reported as a delete plus an add.
+    """
+    rev_range, _ = parse_range(spec)
+    _git(root, "rev-parse", "--git-dir")   # fail early, with git's one-line message, outside a repository
+    out = _git(root, "diff", "--raw", "-z", "--no-renames", "--no-abbrev", "--relative", rev_range, "--")
+    fields = out.split(b"\0")
+    changes: List[GitChange] = []
+    i = 0
+    while i + 1 < len(fields):
+        meta, rel = fields[i].decode(), fields[i + 1].decode("utf-8", "surrogateescape")
+        i += 2
+        # ":<old mode> <new mode> <old id> <new id> <status>"
+        _, new_mode, _, new_id, status = meta.lstrip(":").split(" ")
+        path = root / rel
+        if status.startswith("D"):
+            changes.append(GitChange(path, None))
+        elif new_mode not in _SKIP_MODES:
+            changes.append(GitChange(path, new_id))
+    return changes
+
+
+class BlobReader:
+    """
+    Reads blobs through one long-lived `git cat-file --batch` process instead
+    of spawning git per file.
+    """
+
+    def __init__(self, root: Path):
+        try:
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=str(root), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            )
+        except OSError as e:
+            raise GitError(f"cannot run git: {e}")
+
+    def read(self, object_id: str) -> bytes:
+        self._proc.stdin.write(object_id.encode() + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3:
+            raise GitError(f"cannot read object {object_id}: {b' '.join(header).decode()}")
+        size = int(header[2])
+        data = self._proc.stdout.read(size + 1)   # content plus the trailing newline
+        return data[:size]
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
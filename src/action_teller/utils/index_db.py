@@ -0,0 +1,245 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+INDEX_FILENAME = ".cifolio-index.sqlite3"
+INDEX_FORMAT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT,
+    mtime_ns INTEGER,
+    size INTEGER,
+    sha256 TEXT,
+    seen INTEGER NOT NULL DEFAULT 1,
+    UNIQUE (kind, path)
+);
+CREATE TABLE IF NOT EXISTS actions (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    name TEXT, description TEXT, author TEXT, runs_using TEXT
+);
+CREATE TABLE IF NOT EXISTS workflows (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS triggers (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    event TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inputs (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    name TEXT NOT NULL, trigger TEXT, description TEXT, required TEXT, default_value TEXT
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    name TEXT NOT NULL, description TEXT, value TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    job_id TEXT NOT NULL, name TEXT, runs_on TEXT, uses TEXT
+);
+CREATE TABLE IF NOT EXISTS steps (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    job_id TEXT, idx INTEGER NOT NULL, name TEXT, step_id TEXT, uses TEXT, run TEXT
+);
+CREATE TABLE IF NOT EXISTS uses (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    job_id TEXT, step_idx INTEGER, ref TEXT NOT NULL, target TEXT NOT NULL, version TEXT
+);
+CREATE TABLE IF NOT EXISTS secrets (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vars (
+    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS uses_target ON uses (target, version);
+CREATE INDEX IF NOT EXISTS secrets_name ON secrets (name);
+CREATE INDEX IF NOT EXISTS vars_name ON vars (name);
+CREATE INDEX IF NOT EXISTS inputs_name ON inputs (name);
+CREATE INDEX IF NOT EXISTS outputs_name ON outputs (name);
+CREATE INDEX IF NOT EXISTS triggers_event ON triggers (event);
+"""
+
+# Tables holding per-file facts, in the column order index_facts() produces.
+_FACT_TABLES = {
+    "actions": ("name", "description", "author", "runs_using"),
+    "workflows": ("name",),
+    "triggers": ("event",),
+    "inputs": ("name", "trigger", "description", "required", "default_value"),
+    "outputs": ("name", "description", "value"),
+    "jobs": ("job_id", "name", "runs_on", "uses"),
+    "steps": ("job_id", "idx", "name", "step_id", "uses", "run"),
+    "uses": ("job_id", "step_idx", "ref", "target", "version"),
+    "secrets": ("name",),
+    "vars": ("name",),
+}
+
+
+def _text(v: Any) -> Optional[str]:
+    if v is None or isinstance(v, str):
+        return v
+    if isinstance(v, bool):
+        return str(v).lower()
+    return json.dumps(v, default=str) if isinstance(v, (list, dict)) else str(v)
+
+
+def _uses_row(job_id: Optional[str], step_idx: Optional[int], ref: Any) -> list:
+    ref = str(ref)
+    target, _, version = ref.partition("@")
+    return [job_id, step_idx, ref, target, version or None]
+
+
+def _step_rows(job_id: Optional[str], steps: Any, facts: Dict[str, list]) -> None:
+    for i, s in enumerate(steps or [], start=1):
+        if not isinstance(s, dict):
+            continue
+        facts["steps"].append([job_id, i, _text(s.get("name")), _text(s.get("id")),
+                               _text(s.get("uses")), _text(s.get("run"))])
+        if s.get("uses"):
+            facts["uses"].append(_uses_row(job_id, i, s["uses"]))
+
+
+def index_facts(kind: str, path: Path, data: Dict[str, Any], refs=None) -> str:
+    """
+    Rows for every fact table, extracted from one parsed file and encoded as
+    JSON so worker processes and the build cache can pass them around cheaply.
+    refs, when given, is index_references(data) computed by the caller.
+    """
+    # Only builds extract facts; `query` opens the index without the renderers.
+    from ..renderers import inputs, outputs
+    from ..renderers.workflow_markdown import (
+        _collect_inputs, _gather_secrets, _gather_variables, _list_on_triggers, index_references,
+    )
+    facts: Dict[str, list] = {table: [] for table in _FACT_TABLES}
+    if refs is None:
+        refs = index_references(data)
+    name = data.get("name", path.stem)
+    if kind == "action":
+        runs = data.get("runs") or {}
+        facts["actions"].append([_text(name), (data.get("description") or "").strip(),
+                                 _text(data.get("author", "")), _text(runs.get("using"))])
+        for e in inputs.entries(data.get("inputs")):
+            facts["inputs"].append([e["name"], None, e["description"], _text(e["required"]), _text(e["default"])])
+        for e in outputs.entries(data.get("outputs")):
+            facts["outputs"].append([e["name"], e["description"], _text(e["value"])])
+        _step_rows(None, runs.get("steps"), facts)
+    else:
+        facts["workflows"].append([_text(name)])
+        facts["triggers"].extend([t] for t in _list_on_triggers(data.get("on")))
+        for e in _collect_inputs(data):
+            facts["inputs"].append([e["name"], e["trigger"], e["description"], _text(e["required"]), _text(e["default"])])
+        for job_id, job in (data.get("jobs") or {}).items():
+            if not isinstance(job, dict):
+                continue
+            facts["jobs"].append([str(job_id), _text(job.get("name")), _text(job.get("runs-on")), _text(job.get("uses"))])
+            if job.get("uses"):
+                facts["uses"].append(_uses_row(str(job_id), None, job["uses"]))
+            _step_rows(str(job_id), job.get("steps"), facts)
+    facts["secrets"].extend([s] for s in _gather_secrets(data, refs))
+    facts["vars"].extend([v] for v in _gather_variables(refs))
+    return json.dumps({"name": _text(name), "rows": facts}, separators=(",", ":"), default=str)
+
+
+class IndexDB:
+    """
+    Queryable SQLite index of actions, workflows and what they reference,
+    kept next to the generated docs.
+
+    Updates are incremental: a file whose content hash (or, when no hash is
+    known, mtime and size) is unchanged only gets its stat refreshed, and only
+    really changed files have their rows replaced. Rows are linked to
+    their file with ON DELETE CASCADE, so replacing or dropping a file is one
+    DELETE.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.updated = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.execute("PRAGMA foreign_keys = ON")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_FORMAT:
+            for table in ("files",) + tuple(_FACT_TABLES):
+                self._db.execute(f"DROP TABLE IF EXISTS {table}")
+        self._db.executescript(_SCHEMA)
+        self._db.execute(f"PRAGMA user_version = {INDEX_FORMAT}")
+        self._db.execute("UPDATE files SET seen = 0")
+
+    def update(self, kind: str, path: Path, digest: Optional[str], facts: Optional[str]) -> bool:
+        """Bring the rows for one file up to date. Returns True if they were rewritten."""
+        try:
+            st = os.stat(path)
+            stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            # Content that is not on disk (a git blob) is tracked by hash alone.
+            stat = (None, None)
+        row = self._db.execute(
+            "SELECT id, mtime_ns, size, sha256 FROM files WHERE kind = ? AND path = ?",
+            (kind, str(path)),
+        ).fetchone()
+        if row is not None:
+            file_id, mtime_ns, size, sha256 = row
+            unchanged = digest == sha256 if digest else stat[0] is not None and (mtime_ns, size) == stat
+            if unchanged:
+                self._db.execute(
+                    "UPDATE files SET seen = 1, mtime_ns = ?, size = ? WHERE id = ?",
+                    (*stat, file_id),
+                )
+                return False
+            self._db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        if facts is None:
+            return False
+        decoded = json.loads(facts)
+        cur = self._db.execute(
+            "INSERT INTO files (kind, path, name, mtime_ns, size, sha256, seen) VALUES (?, ?, ?, ?, ?, ?, 1)",
+            (kind, str(path), decoded["name"], *stat, digest),
+        )
+        file_id = cur.lastrowid
+        for table, rows in decoded["rows"].items():
+            if not rows:
+                continue
+            columns = _FACT_TABLES[table]
+            self._db.executemany(
+                f"INSERT INTO {table} (file_id, {', '.join(columns)})"
+                f" VALUES (?{', ?' * len(columns)})",
+                [(file_id, *r) for r in rows],
+            )
+        self.updated += 1
+        return True
+
+    def remove(self, kind: str, path: Path) -> None:
+        self._db.execute("DELETE FROM files WHERE kind = ? AND path = ?", (kind, str(path)))
+
+    def commit(self) -> None:
+        self._db.commit()
+
+    def save(self, prune: bool = True) -> None:
+        # As with the build cache, files not seen in a full run are dropped.
+        if prune:
+            self._db.execute("DELETE FROM files WHERE seen = 0")
+        self._db.commit()
+        self._db.close()
+
+
+def open_index_readonly(path: Path) -> sqlite3.Connection:
+    """Open an existing index for querying; raises FileNotFoundError if there is none."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / INDEX_FILENAME
+    if not path.is_file():
+        raise FileNotFoundError(f"No index at {path}; generate docs into that directory first.")
+    return sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def run_query(db: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> Tuple[List[str], List[tuple]]:
+    cur = db.execute(sql, tuple(params))
+    headers = [d[0] for d in cur.description or ()]
+    return headers, cur.fetchall()
@@ -0,0 +1,60 @@
+from typing import Dict, NamedTuple, Tuple
+
+
+class Query(NamedTuple):
+    help: str
+    sql: str
+    headers: Tuple[str, ...]
+
+
+# Canned queries for `query SUBJECT VALUE`; "?" is bound to VALUE. They live
+# apart from index_db so the CLI and `query --help` load without sqlite3.
+QUERIES: Dict[str, Query] = {
+    "secret": Query(
+        "Files that use or declare secret VALUE.",
+        "SELECT f.kind, f.name, f.path FROM secrets s JOIN files f ON f.id = s.file_id"
+        " WHERE s.name = ? ORDER BY f.path",
+        ("kind", "name", "path"),
+    ),
+    "var": Query(
+        "Files that reference vars.VALUE.",
+        "SELECT f.kind, f.name, f.path FROM vars v JOIN files f ON f.id = v.file_id"
+        " WHERE v.name = ? ORDER BY f.path",
+        ("kind", "name", "path"),
+    ),
+    "uses": Query(
+        "Jobs and steps that use VALUE (owner/repo[/path] matches every version; add @ref to pin one).",
+        "SELECT f.kind, f.path, u.job_id, u.step_idx, u.ref FROM uses u JOIN files f ON f.id = u.file_id"
+        " WHERE u.ref = ?1 OR (instr(?1, '@') = 0 AND u.target = ?1) ORDER BY f.path, u.job_id, u.step_idx",
+        ("kind", "path", "job", "step", "ref"),
+    ),
+    "input": Query(
+        "Actions and workflows declaring input VALUE.",
+        "SELECT f.kind, f.name, f.path, i.trigger, i.required, i.default_value FROM inputs i"
+        " JOIN files f ON f.id = i.file_id WHERE i.name = ? ORDER BY f.path",
+        ("kind", "name", "path", "trigger", "required", "default"),
+    ),
+    "output": Query(
+        "Actions declaring output VALUE.",
+        "SELECT f.name, f.path, o.value FROM outputs o JOIN files f ON f.id = o.file_id"
+        " WHERE o.name = ? ORDER BY f.path",
+        ("name", "path", "value"),
+    ),
+    "trigger": Query(
+        "Workflows triggered by event VALUE.",
+        "SELECT f.name, f.path FROM triggers t JOIN files f ON f.id = t.file_id"
+        " WHERE t.event = ? ORDER BY f.path",
+        ("name", "path"),
+    ),
+    "actions": Query(
+        "All indexed actions.",
+        "SELECT a.name, a.runs_using, f.path FROM actions a JOIN files f ON f.id = a.file_id ORDER BY f.path",
+        ("name", "using", "path"),
+    ),
+    "workflows": Query(
+        "All indexed workflows.",
+        "SELECT w.name, f.path, (SELECT count(*) FROM jobs j WHERE j.file_id = f.id)"
+        " FROM workflows w JOIN files f ON f.id = w.file_id ORDER BY f.path",
+        ("name", "path", "jobs"),
+    ),
+}
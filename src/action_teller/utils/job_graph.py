@@ -0,0 +1,182 @@
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class JobGraph(NamedTuple):
+    jobs: List[str]                     # in file order
+    needs: Dict[str, List[str]]         # job -> the jobs it needs (known jobs only, deduplicated)
+    unknown: List[Tuple[str, str]]      # (job, target) for needs naming no job in the file
+
+
+class GraphAnalysis(NamedTuple):
+    critical_path: List[str]            # the longest chain of needs, by duration
+    critical_length: float              # its total duration (jobs, or minutes with hints)
+    width: int                          # most jobs at one longest-path depth (ASAP), not max concurrency
+    widest_level: List[str]
+    leaves: List[str]                   # jobs nothing depends on
+    cycles: List[List[str]]             # strongly connected groups of jobs that need each other
+
+
+def job_graph(data: Dict[str, Any]) -> JobGraph:
+    jobs_data = data.get("jobs") or {}
+    jobs = [str(j) for j in jobs_data]
+    known = set(jobs)
+    needs: Dict[str, List[str]] = {}
+    unknown: List[Tuple[str, str]] = []
+    for job_id, job in jobs_data.items():
+        job_id = str(job_id)
+        raw = job.get("needs") if isinstance(job, dict) else None
+        targets = [raw] if isinstance(raw, str) else (raw if isinstance(raw, list) else [])
+        seen: Dict[str, None] = {}      # ordered set
+        for t in map(str, targets):
+            if t in seen or "${{" in t:
+                continue
+            if t in known:
+                seen[t] = None
+            else:
+                unknown.append((job_id, t))
+        needs[job_id] = list(seen)
+    return JobGraph(jobs, needs, unknown)
+
+
+def _cycles(nodes: List[str], needs: Dict[str, List[str]]) -> List[List[str]]:
+    """Tarjan's strongly connected components over nodes, iteratively; keeps the ones that form a cycle."""
+    members = set(nodes)
+    position = {v: i for i, v in enumerate(nodes)}
+    targets: Dict[str, List[str]] = {}
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    found: List[List[str]] = []
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                index[v] = low[v] = len(index)
+                stack.append(v)
+                on_stack.add(v)
+                targets[v] = [t for t in needs.get(v, ()) if t in members]
+            if i < len(targets[v]):
+                work.append((v, i + 1))
+                w = targets[v][i]
+                if w not in index:
+                    work.append((w, 0))
+                elif w in on_stack:
+                    low[v] = min(low[v], index[w])
+                continue
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    component.append(w)
+                    if w == v:
+                        break
+                if len(component) > 1 or v in needs.get(v, ()):
+                    found.append(sorted(component, key=position.__getitem__))
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+    return found
+
+
+def analyze(graph: JobGraph, durations: Optional[Dict[str, float]] = None) -> GraphAnalysis:
+    """
+    Critical path, widest dependency level, leaf jobs and cycles of a needs
+    graph in O(jobs + edges): one topological pass (Kahn's algorithm) and,
+    only for jobs left over by it, one strongly-connected-components pass.
+
+    durations maps a job to its wall time; jobs without one count as 1.
+
+    A job's level is the length of the longest needs chain ending at it, so
+    the widest level is the busiest step of an as-soon-as-possible schedule.
+    Its jobs can all run at once, but it is only a lower bound on how many
+    can: jobs on different levels that do not need each other may overlap.
+    """
+    jobs, needs = graph.jobs, graph.needs
+    weight = {j: (durations or {}).get(j, 1.0) for j in jobs}
+    position = {j: i for i, j in enumerate(jobs)}
+    dependents: Dict[str, List[str]] = {j: [] for j in jobs}
+    pending = {j: len(needs[j]) for j in jobs}
+    for j in jobs:
+        for t in needs[j]:
+            dependents[t].append(j)
+
+    level: Dict[str, int] = {}
+    finish: Dict[str, float] = {}
+    before: Dict[str, Optional[str]] = {}
+    queue = deque(j for j in jobs if not pending[j])
+    for j in queue:
+        level[j], finish[j], before[j] = 0, weight[j], None
+    while queue:
+        u = queue.popleft()
+        for v in dependents[u]:
+            if v not in level or level[u] + 1 > level[v]:
+                level[v] = level[u] + 1
+            if v not in finish or finish[u] + weight[v] > finish[v]:
+                finish[v], before[v] = finish[u] + weight[v], u
+            pending[v] -= 1
+            if not pending[v]:
+                queue.append(v)
+    # Jobs in or behind a cycle never become ready, but the jobs they need may
+    # already have relaxed them; keep them out of the path and the levels.
+    left = [j for j in jobs if pending[j]]
+    for j in left:
+        level.pop(j, None)
+        finish.pop(j, None)
+
+    path: List[str] = []
+    if finish:
+        j: Optional[str] = max(finish, key=lambda k: (finish[k], -position[k]))
+        length = finish[j]
+        while j is not None:
+            path.append(j)
+            j = before[j]
+        path.reverse()
+    else:
+        length = 0.0
+
+    levels: Dict[int, List[str]] = {}
+    for j in jobs:
+        if j in level:
+            levels.setdefault(level[j], []).append(j)
+    widest = max(levels.values(), key=len) if levels else []
+
+    return GraphAnalysis(
+        critical_path=path,
+        critical_length=length,
+        width=len(widest),
+        widest_level=widest,
+        leaves=[j for j in jobs if not dependents[j]],
+        cycles=_cycles(left, needs) if left else [],
+    )
+
+
+def _mermaid_label(text: str) -> str:
+    return text.replace('"', "#quot;")
+
+
+def mermaid(graph: JobGraph, analysis: GraphAnalysis) -> str:
+    """A Mermaid flowchart of the needs graph; critical-path and cycle jobs are highlighted."""
+    ids = {j: f"j{i}" for i, j in enumerate(graph.jobs)}
+    lines = ["flowchart LR"]
+    lines.extend(f'    {ids[j]}["{_mermaid_label(j)}"]' for j in graph.jobs)
+    on_path = set(zip(analysis.critical_path, analysis.critical_path[1:]))
+    for j in graph.jobs:
+        for t in graph.needs[j]:
+            arrow = "==>" if (t, j) in on_path else "-->"
+            lines.append(f"    {ids[t]} {arrow} {ids[j]}")
+    for n, (j, t) in enumerate(graph.unknown):
+        lines.append(f'    u{n}["{_mermaid_label(t)} (missing)"] -.-> {ids[j]}')
+    if len(analysis.critical_path) > 1:
+        lines.append("    classDef critical stroke-width:3px")
+        lines.append("    class " + ",".join(ids[j] for j in analysis.critical_path) + " critical")
+    in_cycle = [j for c in analysis.cycles for j in c]
+    if in_cycle:
+        lines.append("    classDef cycle stroke:#d00,stroke-dasharray:4")
+        lines.append("    class " + ",".join(ids[j] for j in in_cycle) + " cycle")
+    return "\n".join(lines)
@@ -0,0 +1,199 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import yaml
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from .yaml_loader import yaml12_loader
+
+ERROR = "error"
+WARNING = "warning"
+
+KNOWN_USING = {"composite", "docker", "node12", "node16", "node20", "node24"}
+DEPRECATED_USING = {"node12", "node16"}
+
+# Below this many files a process pool costs more than it saves.
+PARALLEL_MIN_FILES = 32
+
+
+class Diagnostic(NamedTuple):
+    path: str
+    line: int       # 1-based
+    column: int     # 1-based
+    severity: str
+    code: str
+    message: str
+
+    def format(self) -> str:
+        return f"{self.path}:{self.line}:{self.column}: {self.severity}: {self.message} [{self.code}]"
+
+
+class _Linter:
+    def __init__(self, path: Path):
+        self.path = str(path)
+        self.diagnostics: List[Diagnostic] = []
+
+    def report(self, node: Node, severity: str, code: str, message: str) -> None:
+        mark = node.start_mark
+        self.diagnostics.append(Diagnostic(self.path, mark.line + 1, mark.column + 1, severity, code, message))
+
+    def mapping(self, node: Node, what: str) -> Optional[Dict[str, Tuple[Node, Node]]]:
+        """Keys of a mapping node with their (key, value) nodes; reports non-mappings and duplicates."""
+        if not isinstance(node, MappingNode):
+            self.report(node, ERROR, "not-mapping", f"{what} must be a mapping")
+            return None
+        result: Dict[str, Tuple[Node, Node]] = {}
+        for k, v in node.value:
+            key = k.value if isinstance(k, ScalarNode) else str(k.value)
+            if key in result:
+                self.report(k, ERROR, "duplicate-key", f"duplicate key '{key}' in {what}")
+            result[key] = (k, v)
+        return result
+
+    def require(self, node: Node, keys: Dict[str, Tuple[Node, Node]], names: Sequence[str], what: str) -> None:
+        for name in names:
+            if name not in keys:
+                self.report(node, ERROR, "missing-key", f"{what} is missing required key '{name}'")
+
+    def steps(self, node: Node, what: str, composite: bool = False) -> None:
+        if not isinstance(node, SequenceNode):
+            self.report(node, ERROR, "not-sequence", f"{what}.steps must be a list")
+            return
+        for i, step in enumerate(node.value, start=1):
+            keys = self.mapping(step, f"{what} step {i}")
+            if keys is None:
+                continue
+            if "uses" not in keys and "run" not in keys:
+                self.report(step, ERROR, "step-action", f"{what} step {i} has neither 'uses' nor 'run'")
+            elif "uses" in keys and "run" in keys:
+                self.report(keys["run"][0], ERROR, "step-action", f"{what} step {i} has both 'uses' and 'run'")
+            elif composite and "run" in keys and "shell" not in keys:
+                self.report(keys["run"][0], ERROR, "shell-required",
+                            f"{what} step {i}: 'run' steps in composite actions need 'shell'")
+
+    def inputs(self, node: Node, what: str, severity: str) -> None:
+        keys = self.mapping(node, what)
+        for name, (k, v) in (keys or {}).items():
+            meta = self.mapping(v, f"input '{name}'") if isinstance(v, MappingNode) else None
+            if meta is None or "description" not in meta:
+                self.report(k, severity, "input-description", f"input '{name}' has no description")
+
+    # ---------------- actions ----------------
+    def action(self, root: Node) -> None:
+        keys = self.mapping(root, "action")
+        if keys is None:
+            return
+        self.require(root, keys, ("name", "description", "runs"), "action")
+        if "inputs" in keys:
+            self.inputs(keys["inputs"][1], "inputs", ERROR)
+        if "runs" not in keys:
+            return
+        runs_node = keys["runs"][1]
+        runs = self.mapping(runs_node, "runs")
+        if runs is None:
+            return
+        if "using" not in runs:
+            self.report(runs_node, ERROR, "missing-key", "runs is missing required key 'using'")
+            return
+        using_node = runs["using"][1]
+        using = using_node.value if isinstance(using_node, ScalarNode) else None
+        if using not in KNOWN_USING:
+            self.report(using_node, ERROR, "unknown-using",
+                        f"unknown runs.using '{using}' (expected one of {', '.join(sorted(KNOWN_USING))})")
+            return
+        if using in DEPRECATED_USING:
+            self.report(using_node, WARNING, "deprecated-using", f"runs.using '{using}' is deprecated")
+        required = {"composite": ("steps",), "docker": ("image",)}.get(using, ("main",))
+        self.require(runs_node, runs, required, f"runs (using: {using})")
+        if using == "composite":
+            if "steps" in runs:
+                self.steps(runs["steps"][1], "runs", composite=True)
+            outputs = self.mapping(keys["outputs"][1], "outputs") if "outputs" in keys else None
+            for name, (k, v) in (outputs or {}).items():
+                meta = self.mapping(v, f"output '{name}'")
+                if meta is not None and "value" not in meta:
+                    self.report(k, ERROR, "missing-key", f"output '{name}' of a composite action needs 'value'")
+
+    # ---------------- workflows ----------------
+    def workflow(self, root: Node) -> None:
+        keys = self.mapping(root, "workflow")
+        if keys is None:
+            return
+        self.require(root, keys, ("on", "jobs"), "workflow")
+        if "on" in keys and isinstance(keys["on"][1], MappingNode):
+            events = self.mapping(keys["on"][1], "on") or {}
+            for trigger in ("workflow_dispatch", "workflow_call"):
+                if trigger in events and isinstance(events[trigger][1], MappingNode):
+                    spec = self.mapping(events[trigger][1], trigger) or {}
+                    if "inputs" in spec:
+                        self.inputs(spec["inputs"][1], f"{trigger}.inputs", WARNING)
+        if "jobs" not in keys:
+            return
+        jobs = self.mapping(keys["jobs"][1], "jobs")
+        if jobs is None:
+            return
+        # Walk the nodes rather than the dict so a duplicated job id is checked twice.
+        for k, v in keys["jobs"][1].value:
+            job_id = k.value
+            job = self.mapping(v, f"job '{job_id}'")
+            if job is None:
+                continue
+            if "runs-on" not in job and "uses" not in job:
+                self.report(k, ERROR, "job-runner", f"job '{job_id}' needs 'runs-on' or 'uses'")
+            if "uses" in job and "steps" in job:
+                self.report(job["steps"][0], ERROR, "job-steps", f"job '{job_id}' calls a reusable workflow and cannot have steps")
+            elif "steps" in job:
+                self.steps(job["steps"][1], f"job '{job_id}'")
+            if "needs" in job:
+                needs = job["needs"][1]
+                targets = needs.value if isinstance(needs, SequenceNode) else [needs]
+                for t in targets:
+                    if not isinstance(t, ScalarNode) or "${{" in t.value:
+                        continue
+                    if t.value not in jobs:
+                        self.report(t, ERROR, "needs-unknown", f"job '{job_id}' needs unknown job '{t.value}'")
+                    elif t.value == job_id:
+                        self.report(t, ERROR, "needs-unknown", f"job '{job_id}' needs itself")
+
+
+def lint_file(kind: str, path: Path) -> List[Diagnostic]:
+    """Check one action or workflow file; returns its diagnostics in file order."""
+    linter = _Linter(path)
+    try:
+        with path.open("rb") as f:
+            root = yaml.compose(f, Loader=yaml12_loader())
+    except yaml.MarkedYAMLError as e:
+        mark = e.problem_mark or e.context_mark
+        line, col = (mark.line + 1, mark.column + 1) if mark else (1, 1)
+        return [Diagnostic(str(path), line, col, ERROR, "syntax", str(e.problem or e).strip())]
+    except (OSError, yaml.YAMLError) as e:
+        return [Diagnostic(str(path), 1, 1, ERROR, "syntax", str(e))]
+    if root is None:
+        return [Diagnostic(str(path), 1, 1, ERROR, "empty", "file is empty")]
+    if kind == "action":
+        linter.action(root)
+    else:
+        linter.workflow(root)
+    return sorted(linter.diagnostics, key=lambda d: (d.line, d.column))
+
+
+def _lint_task(task: Tuple[str, Path]) -> List[Diagnostic]:
+    return lint_file(*task)
+
+
+def lint_files(files: Sequence[Tuple[str, Path]], jobs: int = 1) -> Iterator[List[Diagnostic]]:
+    """
+    Yield each file's diagnostics in input order, using a process pool for
+    large sets (jobs=0: one worker per CPU core).
+    """
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if jobs == 1 or len(files) < PARALLEL_MIN_FILES:
+        for kind, path in files:
+            yield lint_file(kind, path)
+        return
+    workers = min(jobs, len(files))
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_lint_task, files, chunksize=chunksize)
@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional
+
+from .yaml_loader import parse_action_yaml
+from ..renderers.model import Document, Heading, NONE, Table
+
+
+class ManifestError(Exception):
+    pass
+
+
+class ManifestRepo(NamedTuple):
+    name: str
+    path: Path      # repository root (a directory or an archive)
+    out: Path       # its own output directory
+
+
+class RepoReport(NamedTuple):
+    repo: ManifestRepo
+    docs: int = 0
+    errors: int = 0                 # files that failed to parse
+    seconds: float = 0.0
+    failure: Optional[str] = None   # why the repository could not be documented at all
+
+
+def _inside(p: str, root: str) -> bool:
+    return os.path.commonpath([p, root]) == root
+
+
+def load_manifest(manifest: Path, out: Path) -> List[ManifestRepo]:
+    """
+    Read a batch manifest:
+
+        repos:
+          - path: ../checkouts/repo-a     # relative to the manifest
+            out: repo-a                   # relative to --out (default: the name)
+            name: repo-a                  # default: the last path component
+          - ../checkouts/repo-b           # path only
+
+    A bare list of entries is accepted too. Each repository needs an output
+    directory of its own strictly inside --out, so no repository overwrites
+    another's docs or the combined index.
+    """
+    try:
+        data = parse_action_yaml(manifest)
+    except Exception as e:
+        raise ManifestError(f"cannot read manifest {manifest}: {e}")
+    entries = data.get("repos") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ManifestError(f"{manifest}: expected a non-empty 'repos' list")
+
+    base = manifest.parent
+    top = os.path.abspath(out)
+    repos: List[ManifestRepo] = []
+    names = set()
+    outs: List[str] = []
+    for i, entry in enumerate(entries, start=1):
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        if not isinstance(entry, dict) or not entry.get("path"):
+            raise ManifestError(f"{manifest}: repos entry {i} needs a 'path'")
+        path = base / os.path.expanduser(str(entry["path"]))
+        name = str(entry.get("name") or Path(os.path.normpath(path)).name)
+        repo_out = out / str(entry.get("out") or name)
+        if name in names:
+            raise ManifestError(f"{manifest}: duplicate repository name '{name}' (set 'name' or 'out')")
+        target = os.path.abspath(repo_out)
+        if target == top or not _inside(target, top):
+            raise ManifestError(f"{manifest}: repository '{name}' must write inside {out}, not to {repo_out}")
+        for other in outs:
+            if _inside(target, other) or _inside(other, target):
+                raise ManifestError(f"{manifest}: repositories write to overlapping directories {other} and {target}")
+        names.add(name)
+        outs.append(target)
+        repos.append(ManifestRepo(name, path, repo_out))
+    return repos
+
+
+def repos_index_document(reports: Iterable[RepoReport], out: Path, extension: str) -> Document:
+    """The top-level index of a batch run, linking each repository's own index in one format."""
+    rows = []
+    for r in reports:
+        index = Path(os.path.relpath(r.repo.out / f"INDEX{extension}", out)).as_posix()
+        link = f"[{r.repo.name}]({index})" if r.failure is None else r.repo.name
+        status = r.failure or (f"{r.errors} file(s) failed to parse" if r.errors else "ok")
+        rows.append((link, f"`{r.repo.path}`", str(r.docs), status))
+    title = "CIfolio — Repositories"
+    blocks = (Heading(1, title), Table(("repository", "source", "documents", "status"), tuple(rows)) if rows else NONE)
+    return Document("index", title, "", blocks)
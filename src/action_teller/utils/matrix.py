@@ -0,0 +1,199 @@
+import json
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .yaml_loader import parse_action_yaml
+
+DEFAULT_HINT = "*"      # duration hint key for jobs without their own hint
+
+Axes = Tuple[Tuple[str, Tuple[Tuple[str, int], ...]], ...]    # (axis, ((value key, multiplicity), ...))
+Pattern = Tuple[Tuple[str, str], ...]                          # sorted (axis, value key) pairs
+
+
+class MatrixCount(NamedTuple):
+    combinations: int           # product of the axis lengths
+    excluded: int               # combinations removed by `exclude`
+    added: int                  # `include` entries that became jobs of their own
+    jobs: int                   # job instances actually started
+    max_parallel: Optional[int]
+
+
+class JobEstimate(NamedTuple):
+    job: str
+    instances: Optional[int]            # None when the matrix comes from an expression
+    matrix: Optional[MatrixCount]       # None for jobs without a matrix (or a dynamic one)
+    minutes: Optional[float]            # duration hint per instance
+
+
+def _value_key(v: Any) -> str:
+    return json.dumps(v, sort_keys=True, default=str)
+
+
+def _dynamic(v: Any) -> bool:
+    return isinstance(v, str) and "${{" in v
+
+
+def _count(axes: Axes, patterns: Tuple[Pattern, ...], memo: Dict) -> int:
+    """
+    Number of combinations of axes matched by none of patterns, without
+    enumerating them: split on the axis most patterns constrain, handle each
+    value those patterns name separately and all other values as one branch.
+    """
+    if not patterns:
+        return math.prod(sum(m for _, m in values) for _, values in axes)
+    if any(not p for p in patterns):
+        return 0
+    memo_key = (axes, patterns)
+    if memo_key in memo:
+        return memo[memo_key]
+    mentions = Counter(k for p in patterns for k, _ in p)
+    name = max(mentions, key=lambda k: (mentions[k], k))
+    values = dict(next(v for a, v in axes if a == name))
+    rest = tuple(a for a in axes if a[0] != name)
+    named = {v for p in patterns for k, v in p if k == name}
+    total = 0
+    for v in named & values.keys():
+        narrowed = tuple(
+            tuple(kv for kv in p if kv[0] != name)
+            for p in patterns if dict(p).get(name, v) == v
+        )
+        total += values[v] * _count(rest, narrowed, memo)
+    free = sum(m for v, m in values.items() if v not in named)
+    if free:
+        total += free * _count(rest, tuple(p for p in patterns if name not in dict(p)), memo)
+    memo[memo_key] = total
+    return total
+
+
+def count_matrix(strategy: Any) -> Optional[MatrixCount]:
+    """
+    Count the job instances a `strategy:` block starts, following GitHub's
+    rules: the cartesian product of the axes, minus combinations matching an
+    `exclude` entry, plus each `include` entry that cannot be merged into any
+    remaining combination without overwriting one of its axis values.
+
+    Works on value counts only, so matrices with millions of combinations
+    cost no more than small ones. Returns None when the matrix (or one of
+    its axes, includes or excludes) is an expression resolved at run time.
+    """
+    if not isinstance(strategy, dict) or "matrix" not in strategy:
+        return None
+    matrix = strategy["matrix"]
+    if not isinstance(matrix, dict):
+        return None
+    include = matrix.get("include") or []
+    exclude = matrix.get("exclude") or []
+    if not isinstance(include, list) or not isinstance(exclude, list):
+        return None
+    axes_list = []
+    for name, values in matrix.items():
+        if name in ("include", "exclude"):
+            continue
+        if not isinstance(values, list) or any(_dynamic(v) for v in values):
+            return None
+        axes_list.append((str(name), tuple(sorted(Counter(_value_key(v) for v in values).items()))))
+    axes: Axes = tuple(sorted(axes_list))
+    axis_names = {a for a, _ in axes}
+    memo: Dict = {}
+
+    # Excludes naming a key that is not an axis can never match.
+    patterns = tuple(sorted({
+        tuple(sorted((str(k), _value_key(v)) for k, v in e.items()))
+        for e in exclude if isinstance(e, dict) and e and set(map(str, e)) <= axis_names
+    }))
+    combinations = math.prod(sum(m for _, m in values) for _, values in axes) if axes else 0
+    remaining = _count(axes, patterns, memo) if axes else 0
+
+    added = 0
+    for entry in include:
+        if not isinstance(entry, dict):
+            return None
+        if not axes:
+            added += 1
+            continue
+        fixed = {str(k): _value_key(v) for k, v in entry.items() if str(k) in axis_names}
+        narrowed = tuple(
+            (a, tuple((v, m) for v, m in values if v == fixed[a]) if a in fixed else values) for a, values in axes
+        )
+        if any(not values for _, values in narrowed) or _count(narrowed, patterns, memo) == 0:
+            added += 1
+
+    max_parallel = strategy.get("max-parallel")
+    return MatrixCount(
+        combinations=combinations,
+        excluded=combinations - remaining,
+        added=added,
+        jobs=remaining + added if (axes or include) else 1,
+        max_parallel=max_parallel if isinstance(max_parallel, int) and max_parallel > 0 else None,
+    )
+
+
+def load_duration_hints(p: Path) -> Dict[str, float]:
+    """
+    Read per-job duration hints (minutes per job instance):
+
+        default: 8                      # any job without its own hint
+        jobs:
+          build: 12                     # job `build` in any workflow
+          ci.yml:test: 30               # job `test` in workflows named ci.yml
+          .github/workflows/ci.yml:e2e: 45
+
+    A flat mapping of job keys (plus `default`) works as well.
+    """
+    data = parse_action_yaml(p)
+    if not isinstance(data, dict):
+        raise ValueError(f"{p}: expected a mapping of job keys to minutes")
+    jobs = data.get("jobs") if isinstance(data.get("jobs"), dict) else {k: v for k, v in data.items() if k != "default"}
+    hints: Dict[str, float] = {}
+    for key, minutes in list(jobs.items()) + ([(DEFAULT_HINT, data["default"])] if "default" in data else []):
+        if isinstance(minutes, bool) or not isinstance(minutes, (int, float)) or minutes < 0:
+            raise ValueError(f"{p}: duration for '{key}' must be a number of minutes")
+        hints[str(key)] = float(minutes)
+    return hints
+
+
+def job_minutes(hints: Dict[str, float], workflow: Path, job: str) -> Optional[float]:
+    """The most specific hint for a job: `path:job`, then `job`, then the default."""
+    posix = workflow.as_posix()
+    best = None
+    for key, minutes in hints.items():
+        where, sep, job_id = key.rpartition(":")
+        if sep and job_id == job and (posix == where or posix.endswith("/" + where)):
+            if best is None or len(where) > best[0]:
+                best = (len(where), minutes)
+    if best is not None:
+        return best[1]
+    return hints.get(job, hints.get(DEFAULT_HINT))
+
+
+def job_estimates(data: Dict[str, Any], workflow: Path, hints: Optional[Dict[str, float]] = None) -> List[JobEstimate]:
+    """Job instances and per-instance duration hint for every job of a workflow."""
+    estimates = []
+    for job_id, job in (data.get("jobs") or {}).items():
+        job = job if isinstance(job, dict) else {}
+        strategy = job.get("strategy")
+        matrix = count_matrix(strategy)
+        if matrix is not None:
+            instances = matrix.jobs
+        elif isinstance(strategy, dict) and "matrix" in strategy:
+            instances = None
+        else:
+            instances = 1
+        minutes = job_minutes(hints, workflow, str(job_id)) if hints else None
+        estimates.append(JobEstimate(str(job_id), instances, matrix, minutes))
+    return estimates
+
+
+def runner_totals(estimates: List[JobEstimate]) -> Tuple[int, float, int]:
+    """(job instances, runner-minutes, instances without a duration hint); dynamic matrices count once."""
+    instances = minutes = unhinted = 0
+    for e in estimates:
+        n = e.instances if e.instances is not None else 1
+        instances += n
+        if e.minutes is None:
+            unhinted += n
+        else:
+            minutes += n * e.minutes
+    return instances, float(minutes), unhinted
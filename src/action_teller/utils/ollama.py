@@ -1,11 +1,5 @@
-def ollama_summarize(data: dict, model: str = "mistral") -> str:
-    """Use Ollama locally to summarize a GitHub Action."""
-    try:
-        import ollama
-    except ImportError:
-        return "_(Ollama not installed)_"
-
-    prompt = f"""You are documenting a GitHub Action.
+def build_prompt(data: dict) -> str:
+    return f"""You are documenting a GitHub Action.
 Name: {data.get("name")}
 Description: {data.get("description")}
 Inputs: {list((data.get("inputs") or {}).keys())}
@@ -13,11 +7,65 @@ Outputs: {list((data.get("outputs") or {}).keys())}
 
 Write a 2-3 sentence human-friendly summary of what this Action does."""
 
+
+def ollama_client(host=None, timeout=None):
+    """Return an ollama.Client; raises ImportError when ollama is not installed."""
+    import ollama
+    return ollama.Client(host=host, timeout=timeout)
+
+
+def retryable(error: Exception) -> bool:
+    """
+    Whether a failed chat call may succeed if repeated: timeouts, connection
+    failures and 5xx answers may; a missing model, any other 4xx answer or a
+    malformed response will fail the same way again.
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int) and status >= 400:
+        return status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        import httpx    # what the ollama client runs on; older clients let its errors through
+    except ImportError:
+        return False
+    return isinstance(error, httpx.TransportError)
+
+
+def ollama_chat(client, model: str, prompt: str) -> str:
+    resp = client.chat(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return resp["message"]["content"].strip()
+
+
+def ollama_summarize(data: dict, model: str = "mistral", cache=None) -> str:
+    """Use Ollama locally to summarize a GitHub Action.
+
+    When a SummaryCache is given, a summary for the same model and prompt is
+    reused instead of calling the model again. Errors are never cached.
+    """
+    prompt = build_prompt(data)
+    if cache is not None:
+        cached = cache.get(model, prompt)
+        if cached is not None:
+            return cached
+
+    try:
+        import ollama
+    except ImportError:
+        return "_(Ollama not installed)_"
+
     try:
         resp = ollama.chat(
             model=model,
             messages=[{"role": "user", "content": prompt}],
         )
-        return resp["message"]["content"].strip()
+        summary = resp["message"]["content"].strip()
     except Exception as e:
         return f"_(Ollama error: {e})_"
+
+    if cache is not None:
+        cache.put(model, prompt, summary)
+    return summary
@@ -0,0 +1,15 @@
+# Defaults shown by the CLI options. Kept free of imports so building the
+# command line (and --help, --version) does not load the modules using them.
+
+FORMATS = ("md", "html", "confluence", "json")    # emitters.EMITTERS keys, in --format help order
+
+DEFAULT_EXPAND_DEPTH = 4            # utils.expander
+DEFAULT_MAX_ENTRIES = 5000          # utils.summary_cache
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_CONCURRENCY = 4             # utils.summary_scheduler
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_RETRIES = 2
+DEFAULT_POLL_INTERVAL = 0.25        # utils.watcher
+DEFAULT_SERVE_PORT = 8787           # utils.doc_server / `serve`
+DEFAULT_SERVE_WORKERS = 4
+DEFAULT_SERVE_ENTRIES = 4096
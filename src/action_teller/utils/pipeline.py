@@ -0,0 +1,358 @@
+import os
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .build_cache import BuildCache, content_digest, file_digest
+from .catalog import catalog_line, catalog_record
+from .index_db import index_facts
+from .matrix import job_estimates, runner_totals
+from .yaml_loader import parse_action_yaml, parse_yaml_bytes
+from . import timings
+from ..emitters import emit_all
+from ..renderers.action_markdown import build_action_doc
+from ..renderers.model import Document
+from ..renderers.workflow_markdown import RefIndex, build_workflow_doc, index_references
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from .expander import LocalExpander
+
+# The process pool, local expansion and both summary engines are imported by
+# the code paths using them, so a plain build does not load them at startup.
+
+ACTION = "action"
+WORKFLOW = "workflow"
+
+# Summary engines, see DocTask.summary_engine.
+OLLAMA = "ollama"
+EXTRACTIVE = "extractive"
+
+# Upper bound on tasks handed to a worker at once; keeps IPC overhead low on large trees.
+MAX_CHUNK_SIZE = 8
+# Tasks taken from the input per worker at a time; bounds what build_docs holds.
+WINDOW_PER_WORKER = 64
+
+
+class DocTask(NamedTuple):
+    kind: str
+    path: Path
+    ai_summary: bool = False
+    model: str = "mistral"
+    summary_cache: Optional[Path] = None   # SummaryCache file shared by all workers
+    defer_summaries: bool = False          # leave markers for a SummaryScheduler to fill in
+    timings: bool = False                  # record per-file spans (see utils.timings)
+    formats: Tuple[str, ...] = ("md",)     # output formats, see emitters.EMITTERS
+    catalog: bool = False                  # also produce an NDJSON catalog record
+    index: bool = False                    # also extract rows for the query index (see utils.index_db)
+    content: Optional[bytes] = None        # file content when not read from disk (e.g. a git blob)
+    expand: Optional[Tuple[Path, int, int]] = None   # (root, depth, run) to expand local `uses:` refs
+    durations: Optional[Dict[str, float]] = None     # per-job duration hints (see utils.matrix)
+    summary_engine: str = OLLAMA           # with ai_summary: OLLAMA or EXTRACTIVE
+
+
+class DocResult(NamedTuple):
+    kind: str
+    path: Path
+    name: Optional[str] = None      # None when the file was skipped or failed
+    outputs: Optional[Dict[str, str]] = None   # format -> emitted text
+    error: Optional[str] = None
+    summary_hits: int = 0
+    summary_misses: int = 0
+    pending: Tuple[Tuple[str, str, str], ...] = ()   # deferred (key, model, prompt) summaries
+    digest: Optional[str] = None
+    spans: Tuple[tuple, ...] = ()          # timing spans recorded in a worker process
+    document: Optional[Document] = None    # kept while summaries are pending, to re-emit later
+    catalog: Optional[str] = None          # NDJSON catalog line (see utils.catalog)
+    facts: Optional[str] = None            # JSON-encoded index rows (see utils.index_db)
+    deps: Tuple[str, ...] = ()             # other files read to build it (expanded local refs)
+    runner: Optional[Tuple[int, float, int]] = None  # workflows: (job instances, runner-minutes, unhinted)
+
+
+class _DeferredSummaries:
+    """summarize_fn that answers from the cache or leaves a marker to fill in later."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.pending: List[Tuple[str, str, str]] = []
+
+    def __call__(self, data: dict, model: str = "mistral") -> str:
+        from .ollama import build_prompt
+        from .summary_cache import prompt_key
+        from .summary_scheduler import summary_marker
+        prompt = build_prompt(data)
+        if self.cache is not None:
+            cached = self.cache.get(model, prompt)
+            if cached is not None:
+                return cached
+        key = prompt_key(model, prompt)
+        self.pending.append((key, model, prompt))
+        return summary_marker(key)
+
+
+_expander: Optional["LocalExpander"] = None
+_expander_key: Optional[Tuple[Path, int, int]] = None
+
+
+def _local_expander(spec: Tuple[Path, int, int]) -> "LocalExpander":
+    """The process's expander for this run; its memo tables are shared by every file the process builds."""
+    global _expander, _expander_key
+    if spec != _expander_key:
+        from .expander import LocalExpander
+        root, depth, _run_id = spec
+        _expander, _expander_key = LocalExpander(root, depth), spec
+    return _expander
+
+
+def _extractive(kind: str, data, refs, _payload: dict, model: str = "") -> str:
+    # summarize_fn signature; summarizes the whole file rather than the renderer's payload.
+    from .extractive_summary import extractive_summary
+    return extractive_summary(kind, data, refs)
+
+
+def build_doc(task: DocTask) -> DocResult:
+    """
+    Parse, build and emit a single file in every requested format. Runs inside worker processes, so it only
+    takes and returns picklable values.
+    """
+    if not task.timings or timings.active() is not None:
+        return _build_doc(task)
+    # In a worker: record locally and ship the spans back with the result.
+    recorder = timings.Timings()
+    previous = timings.activate(recorder)
+    try:
+        result = _build_doc(task)
+    finally:
+        timings.activate(previous)
+    return result._replace(spans=tuple(tuple(s) for s in recorder.spans))
+
+
+def _build_doc(task: DocTask) -> DocResult:
+    try:
+        with timings.span("parse", "file", task.path):
+            if task.content is not None:
+                data = parse_yaml_bytes(task.content)
+            else:
+                data = parse_action_yaml(task.path)
+    except Exception as e:
+        return DocResult(task.kind, task.path, error=str(e))
+
+    if not task.ai_summary:
+        return _render(task, data, None)
+    if task.summary_engine == EXTRACTIVE:
+        refs = _references(task, data, always=True)
+        return _render(task, data, partial(_extractive, task.kind, data, refs), refs)._replace(document=None)
+    from .ollama import ollama_summarize
+    from .summary_cache import open_summary_cache
+    cache = open_summary_cache(task.summary_cache) if task.summary_cache else None
+    if task.defer_summaries:
+        summarize_fn = _DeferredSummaries(cache)
+    elif cache is not None:
+        summarize_fn = partial(ollama_summarize, cache=cache)
+    else:
+        return _render(task, data, ollama_summarize)
+
+    hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+    result = _render(task, data, summarize_fn)
+    if cache is not None:
+        result = result._replace(
+            summary_hits=cache.hits - hits,
+            summary_misses=cache.misses - misses,
+        )
+    if task.defer_summaries and summarize_fn.pending:
+        result = result._replace(pending=tuple(summarize_fn.pending))
+    else:
+        result = result._replace(document=None)
+    return result
+
+
+def render_parsed(task: DocTask, data) -> DocResult:
+    """build_doc() for data parsed earlier, e.g. kept in memory by the docs server. No AI summaries."""
+    return _render(task._replace(ai_summary=False), data, None)
+
+
+def _references(task: DocTask, data, always: bool = False) -> Optional[RefIndex]:
+    """
+    Walk data for references once, for every consumer of this file: the
+    workflow page, the catalog record, the index facts and extractive summaries.
+    None when none of them will run.
+    """
+    if not isinstance(data, dict):
+        return None
+    if not (always or task.kind == WORKFLOW or task.catalog or task.index):
+        return None
+    with timings.span("refs", "file", task.path):
+        return index_references(data)
+
+
+def _render(task: DocTask, data, summarize_fn, refs: Optional[RefIndex] = None) -> DocResult:
+    with timings.span("render", "file", task.path):
+        return _render_doc(task, data, summarize_fn, refs)
+
+
+def _render_doc(task: DocTask, data, summarize_fn, refs: Optional[RefIndex] = None) -> DocResult:
+    kind, path, ai_summary, model = task.kind, task.path, task.ai_summary, task.model
+    extra = {}
+    if kind == ACTION:
+        build = build_action_doc
+    elif not isinstance(data, dict) or "on" not in data:
+        return DocResult(kind, path)
+    else:
+        build = build_workflow_doc
+        extra["duration_hints"] = task.durations
+    if refs is None:
+        refs = _references(task, data)
+    if kind == WORKFLOW:
+        extra["refs"] = refs
+    name = data.get("name", path.stem)
+    expander = _local_expander(task.expand) if task.expand else None
+    if expander is not None:
+        expander.begin_document(path)
+    doc = build(
+        data=data,
+        file_path=path,
+        llm_summary=ai_summary,
+        llm_model=model,
+        summarize_fn=summarize_fn,
+        expand_fn=expander,
+        **extra,
+    )
+    with timings.span("emit", "file", path):
+        outputs = emit_all(doc, task.formats)
+    line = None
+    if task.catalog:
+        with timings.span("catalog", "file", path):
+            line = catalog_line(catalog_record(kind, path, data, refs))
+    facts = None
+    if task.index:
+        with timings.span("index", "file", path):
+            facts = index_facts(kind, path, data, refs)
+    runner = runner_totals(job_estimates(data, path, task.durations)) if kind == WORKFLOW else None
+    return DocResult(kind, path, name, outputs, document=doc if ai_summary else None,
+                     catalog=line, facts=facts, deps=expander.deps() if expander else (), runner=runner)
+
+
+def _dep_digest(p: str) -> Optional[str]:
+    try:
+        return file_digest(Path(p))
+    except OSError:
+        return None
+
+
+def store_result(cache: BuildCache, result: DocResult, outputs: Optional[Dict[str, str]] = None, digest_of=None) -> None:
+    """Store a finished result, recording the current digest of every file it depends on."""
+    digest_of = digest_of or _dep_digest
+    cache.store(result.kind, result.path, result.digest, result.name,
+                result.outputs if outputs is None else outputs, result.catalog, result.facts,
+                [(p, digest_of(p)) for p in result.deps], result.runner)
+
+
+def resolve_jobs(jobs: int) -> int:
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+def _submit(tasks: List[DocTask], jobs: int, pool: Optional["Executor"]) -> Iterator[DocResult]:
+    """Hand tasks to the pool right away; results come back in task order."""
+    if pool is None or len(tasks) < 2:
+        return map(build_doc, tasks)
+    chunksize = max(1, min(MAX_CHUNK_SIZE, len(tasks) // (jobs * 4)))
+    return pool.map(build_doc, tasks, chunksize=chunksize)
+
+
+def _windows(tasks: Iterable[DocTask], size: int) -> Iterator[List[DocTask]]:
+    it = iter(tasks)
+    while True:
+        window = list(islice(it, size))
+        if not window:
+            return
+        yield window
+
+
+def build_docs(
+    tasks: Iterable[DocTask],
+    jobs: int = 1,
+    cache: Optional[BuildCache] = None,
+    pool: Optional["Executor"] = None,
+) -> Iterator[DocResult]:
+    """
+    Yield a DocResult per task, in task order.
+
+    With jobs > 1 the work is spread over a process pool (pool, when given,
+    is reused instead of starting one per call); results are still
+    streamed back in submission order so the output matches a serial run.
+    Files whose content hash is found in the cache are neither parsed nor
+    rendered. Results still waiting on deferred summaries are not stored;
+    the caller stores them once the summaries are filled in.
+
+    tasks is consumed a window at a time and cached documents are fetched
+    only as they are yielded, so neither task contents (git blobs, archive
+    members) nor cached outputs pile up for the whole run.
+    """
+    jobs = resolve_jobs(jobs)
+
+    # Shared dependencies are hashed once per run, however many documents use them.
+    dep_digests: Dict[str, Optional[str]] = {}
+
+    def dep_digest(p: str) -> Optional[str]:
+        if p not in dep_digests:
+            dep_digests[p] = _dep_digest(p)
+        return dep_digests[p]
+
+    def deps_current(deps) -> bool:
+        return all(dep_digest(p) == sha for p, sha in deps)
+
+    def check(t: DocTask) -> Tuple[DocTask, Optional[str], bool]:
+        if cache is None:
+            return t, None, False
+        try:
+            digest = content_digest(t.content) if t.content is not None else file_digest(t.path)
+        except OSError:
+            return t, None, False
+        return t, digest, cache.check(t.kind, t.path, digest, deps_current)
+
+    def cached(t: DocTask, digest: str) -> DocResult:
+        entry = cache.fetch(t.kind, t.path)
+        return DocResult(t.kind, t.path, entry["name"], entry["outputs"], digest=digest,
+                         catalog=entry["catalog"], facts=entry["facts"],
+                         deps=tuple(p for p, _ in entry["deps"]), runner=entry["runner"])
+
+    def fresh(t: DocTask, digest: Optional[str], result: DocResult) -> DocResult:
+        result = result._replace(digest=digest)
+        if cache is not None and digest and result.error is None and not result.pending:
+            store_result(cache, result, digest_of=dep_digest)
+        return result
+
+    if jobs == 1:
+        for t in tasks:
+            t, digest, hit = check(t)
+            yield cached(t, digest) if hit else fresh(t, digest, build_doc(t))
+        return
+
+    owned = None
+
+    def dispatch(window: List[DocTask]):
+        nonlocal pool, owned
+        checked = [check(t) for t in window]
+        misses = [t for t, _, hit in checked if not hit]
+        if len(misses) > 1 and pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = owned = ProcessPoolExecutor(max_workers=jobs)
+        return checked, _submit(misses, jobs, pool)
+
+    def drain(checked, results) -> Iterator[DocResult]:
+        for t, digest, hit in checked:
+            yield cached(t, digest) if hit else fresh(t, digest, next(results))
+
+    try:
+        # The next window is already with the workers while this one is yielded.
+        ahead = None
+        for window in _windows(tasks, jobs * WINDOW_PER_WORKER):
+            previous, ahead = ahead, dispatch(window)
+            if previous is not None:
+                yield from drain(*previous)
+        if ahead is not None:
+            yield from drain(*ahead)
+    finally:
+        if owned is not None:
+            owned.shutdown()
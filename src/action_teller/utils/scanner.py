@@ -0,0 +1,203 @@
+import os
+import re
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from .file_finder import YAML_FILENAMES
+from .workflow_finder import CANDIDATE_EXTS
+
+# Directories that never hold documentation sources; pruned without descending.
+DEFAULT_EXCLUDES = (".git", "node_modules", "__pycache__", ".venv", "venv", ".tox")
+
+GITIGNORE = ".gitignore"
+
+
+class ScanResult(NamedTuple):
+    actions: List[Path]
+    workflows: List[Path]
+    dirs: List[Path]    # every directory visited (not pruned), root first
+
+
+class _Rule(NamedTuple):
+    base: str           # directory of the .gitignore, relative to the scan root ("" for root)
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("(?:/.*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = pattern.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def parse_gitignore(text: str, base: str = "") -> List[_Rule]:
+    rules: List[_Rule] = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = re.compile(_translate(line) + r"\Z")
+        rules.append(_Rule(base, regex, negate, dir_only, anchored))
+    return rules
+
+
+def _ignored(rules: Iterable[_Rule], rel: str, name: str, is_dir: bool) -> bool:
+    ignored = False
+    for r in rules:
+        if r.dir_only and not is_dir:
+            continue
+        if r.anchored:
+            if r.base:
+                if not rel.startswith(r.base + "/"):
+                    continue
+                target = rel[len(r.base) + 1:]
+            else:
+                target = rel
+        else:
+            target = name
+        if r.regex.match(target):
+            ignored = not r.negate
+    return ignored
+
+
+def _read_gitignore(directory: str, base: str) -> List[_Rule]:
+    try:
+        with open(os.path.join(directory, GITIGNORE), "r", encoding="utf-8") as f:
+            return parse_gitignore(f.read(), base)
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+def excluded_path(rel: str, excludes: Iterable[str]) -> bool:
+    """
+    True when a root-relative file path lies under a directory that scan_tree
+    would prune for these excludes (by directory name or root-relative path).
+    """
+    skip = set(excludes)
+    parts = rel.split("/")[:-1]
+    for i, name in enumerate(parts):
+        if name in skip or "/".join(parts[:i + 1]) in skip:
+            return True
+    return False
+
+
+def scan_tree(
+    root: Path,
+    want_actions: bool = True,
+    want_workflows: bool = True,
+    excludes: Optional[Iterable[str]] = None,
+    use_gitignore: bool = True,
+) -> ScanResult:
+    """
+    Walk root once with os.scandir and sort files into action and workflow
+    candidates. Directories named in excludes (or matched by .gitignore) are
+    pruned without being descended into.
+    """
+    actions: List[Path] = []
+    workflows: List[Path] = []
+    dirs: List[Path] = []
+
+    if root.is_file():
+        if want_actions and root.name in YAML_FILENAMES:
+            actions.append(root)
+        if want_workflows and root.suffix.lower() in CANDIDATE_EXTS:
+            workflows.append(root)
+        return ScanResult(actions, workflows, dirs)
+
+    skip = set(DEFAULT_EXCLUDES if excludes is None else excludes)
+    # Stack of (directory path, path relative to root, inherited .gitignore rules)
+    stack: List[Tuple[str, str, List[_Rule]]] = [(str(root), "", [])]
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        dirs.append(Path(directory))
+        if use_gitignore:
+            rules = rules + _read_gitignore(directory, rel_dir)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs: List[Tuple[str, str, List[_Rule]]] = []
+        for entry in entries:
+            name = entry.name
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if name in skip or rel in skip:
+                    continue
+                if rules and _ignored(rules, rel, name, True):
+                    continue
+                subdirs.append((entry.path, rel, rules))
+                continue
+
+            is_action = want_actions and name in YAML_FILENAMES
+            is_workflow = want_workflows and os.path.splitext(name)[1].lower() in CANDIDATE_EXTS
+            if not (is_action or is_workflow):
+                continue
+            if rules and _ignored(rules, rel, name, False):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            p = Path(entry.path)
+            if is_action:
+                actions.append(p)
+            if is_workflow:
+                workflows.append(p)
+
+        # Files of a directory come before its subdirectories, depth first.
+        stack.extend(reversed(subdirs))
+
+    return ScanResult(actions, workflows, dirs)
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .option_defaults import DEFAULT_MAX_AGE_DAYS, DEFAULT_MAX_ENTRIES
+
+
+def default_summary_cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "cifolio" / "summaries.sqlite3"
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """
+    On-disk LRU cache of LLM summaries keyed on (model, sha256(prompt)).
+
+    Backed by SQLite so several worker processes can share one cache file.
+    Entries older than max_age_days are dropped, and the least recently used
+    entries are evicted once there are more than max_entries.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " summary TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)")
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        key = prompt_key(model, prompt)
+        now = time.time()
+        row = self._db.execute(
+            "SELECT summary, created FROM summaries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (self.max_age and now - row[1] > self.max_age):
+            self.misses += 1
+            return None
+        self._db.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, model: str, prompt: str, summary: str) -> None:
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO summaries (key, model, summary, created, last_used)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (prompt_key(model, prompt), model, summary, now, now),
+        )
+
+    def evict(self) -> int:
+        """Apply the age and size limits. Returns the number of entries removed."""
+        removed = 0
+        if self.max_age:
+            cur = self._db.execute(
+                "DELETE FROM summaries WHERE created < ?", (time.time() - self.max_age,)
+            )
+            removed += cur.rowcount
+        if self.max_entries:
+            cur = self._db.execute(
+                "DELETE FROM summaries WHERE key IN ("
+                " SELECT key FROM summaries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            removed += cur.rowcount
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_open_caches: Dict[str, SummaryCache] = {}
+
+
+def open_summary_cache(path: Path) -> SummaryCache:
+    """Return this process's SummaryCache for path, opening it on first use."""
+    key = str(path)
+    cache = _open_caches.get(key)
+    if cache is None:
+        cache = _open_caches[key] = SummaryCache(path)
+    return cache
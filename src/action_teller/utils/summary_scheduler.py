@@ -0,0 +1,184 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .option_defaults import DEFAULT_CONCURRENCY, DEFAULT_RETRIES, DEFAULT_TIMEOUT
+from .ollama import ollama_chat, ollama_client, retryable
+from .summary_cache import SummaryCache, prompt_key
+from .timings import span
+from ..renderers.model import replace_text
+
+DEFAULT_BACKOFF = 1.0
+
+DEADLINE_PLACEHOLDER = "_(AI summary skipped: run deadline exceeded)_"
+
+# Marker left in the built document where a deferred summary goes.
+_MARKER = "\x00cifolio-summary:{}\x00"
+
+
+def summary_marker(key: str) -> str:
+    return _MARKER.format(key)
+
+
+class SummaryScheduler:
+    """
+    Runs LLM summary requests on a bounded thread pool.
+
+    Each request gets a per-call timeout and, when it timed out, could not
+    connect or got a 5xx answer, is retried with exponential backoff; a
+    missing model or another 4xx answer fails at once. A deadline for the whole run caps how long resolve() waits; any
+    summary still outstanding then is replaced by a placeholder instead of
+    stalling the build. Identical (model, prompt) pairs are requested once.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        deadline: Optional[float] = None,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        host: Optional[str] = None,
+        cache: Optional[SummaryCache] = None,
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.host = host
+        self.cache = cache
+        self.deadline = deadline
+        self.deadline_at = None
+        self.restart_deadline()
+        self.requested = 0
+        self.failed = 0
+        self.timed_out = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._workers = []
+        self._concurrency = max(1, concurrency)
+        self._futures: Dict[str, Future] = {}
+        self._requests: Dict[str, Tuple[str, str]] = {}
+        self._failed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def restart_deadline(self) -> None:
+        """Start a fresh deadline window, e.g. for each rebuild in watch mode."""
+        self.deadline_at = time.monotonic() + self.deadline if self.deadline else None
+
+    def _remaining(self) -> Optional[float]:
+        if self.deadline_at is None:
+            return None
+        return self.deadline_at - time.monotonic()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = ollama_client(self.host, self.timeout)
+        return client
+
+    def _call(self, key: str, model: str, prompt: str) -> str:
+        try:
+            client = self._client()
+        except ImportError:
+            self._fail(key)
+            return "_(Ollama not installed)_"
+        error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            remaining = self._remaining()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                with span(model, "summary"):
+                    summary = ollama_chat(client, model, prompt)
+            except Exception as e:
+                error = e
+                delay = self.backoff * (2 ** attempt)
+                remaining = self._remaining()
+                if not retryable(e) or attempt == self.retries or (remaining is not None and remaining <= delay):
+                    break
+                time.sleep(delay)
+                continue
+            return summary
+        self._fail(key)
+        if error is None:
+            return DEADLINE_PLACEHOLDER
+        return f"_(Ollama error: {error})_"
+
+    def _fail(self, key: str) -> None:
+        # Failed summaries are never cached, neither here nor in the build cache.
+        with self._lock:
+            self.failed += 1
+            self._failed.add(key)
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, key, model, prompt = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._call(key, model, prompt))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, model: str, prompt: str) -> str:
+        """Queue a summary request and return its key; duplicates share one call."""
+        key = prompt_key(model, prompt)
+        with self._lock:
+            if key not in self._futures:
+                self.requested += 1
+                self._requests[key] = (model, prompt)
+                future: Future = Future()
+                self._futures[key] = future
+                self._queue.put((future, key, model, prompt))
+                if len(self._workers) < self._concurrency:
+                    # Daemon threads: a hung request must not keep the process alive at exit.
+                    t = threading.Thread(target=self._work, name="summary", daemon=True)
+                    t.start()
+                    self._workers.append(t)
+        return key
+
+    def result(self, key: str) -> str:
+        """Wait for a summary, but never past the run deadline."""
+        future = self._futures[key]
+        remaining = self._remaining()
+        try:
+            summary = future.result(timeout=None if remaining is None else max(0.0, remaining))
+        except FutureTimeout:
+            with self._lock:
+                if key not in self._failed:
+                    self.timed_out += 1
+                    self._failed.add(key)
+            return DEADLINE_PLACEHOLDER
+        except Exception as e:
+            # Raised inside _work (or the request was cancelled): a failed summary, not a failed build.
+            with self._lock:
+                if key not in self._failed:
+                    self.failed += 1
+                    self._failed.add(key)
+            return f"_(Ollama error: {e or type(e).__name__})_"
+        if self.cache is not None and key not in self._failed:
+            # SQLite connections are per-thread, so caching happens on the caller's thread.
+            model, prompt = self._requests[key]
+            self.cache.put(model, prompt, summary)
+        return summary
+
+    def resolve(self, doc: Any, keys: Iterable[str]) -> Any:
+        """Replace the summary markers for keys in doc (text or a Document) with their results."""
+        return replace_text(doc, {summary_marker(key): self.result(key) for key in keys})
+
+    def succeeded(self, keys: Iterable[str]) -> bool:
+        """True when every summary for keys was produced (so the doc may be cached)."""
+        return not any(k in self._failed for k in keys)
+
+    def shutdown(self) -> None:
+        """Cancel queued requests and stop idle workers without waiting on stragglers."""
+        for future in self._futures.values():
+            future.cancel()
+        for _ in self._workers:
+            self._queue.put(None)
@@ -0,0 +1,115 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Span(NamedTuple):
+    name: str
+    cat: str          # "phase", "file", "renderer", "summary"
+    start: float      # wall clock, seconds since the epoch
+    dur: float        # seconds
+    blocks: int       # net change in allocated memory blocks
+    pid: int
+    tid: int
+    file: Optional[str] = None
+
+
+class Timings:
+    """
+    Collects wall time and allocation deltas for named spans. Spans from worker
+    processes are shipped back as plain tuples and merged with extend().
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self.pid = os.getpid()
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = "phase", file: Optional[Any] = None):
+        blocks = sys.getallocatedblocks()
+        start = time.time()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append(Span(
+                name, cat, start, time.perf_counter() - t0,
+                sys.getallocatedblocks() - blocks,
+                os.getpid(), threading.get_ident(),
+                None if file is None else str(file),
+            ))
+
+    def extend(self, spans) -> None:
+        self.spans.extend(Span(*s) for s in spans)
+
+    def phase_totals(self) -> Dict[str, Tuple[float, int]]:
+        totals: Dict[str, List] = defaultdict(lambda: [0.0, 0])
+        for s in self.spans:
+            if s.cat != "file":
+                key = s.name if s.cat == "phase" else f"{s.cat}:{s.name}"
+                totals[key][0] += s.dur
+                totals[key][1] += s.blocks
+        return {k: (v[0], v[1]) for k, v in totals.items()}
+
+    def slowest_files(self, n: int) -> List[Tuple[str, float, Dict[str, float]]]:
+        per_file: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for s in self.spans:
+            if s.cat == "file" and s.file:
+                per_file[s.file][s.name] += s.dur
+        ranked = sorted(
+            ((f, sum(parts.values()), dict(parts)) for f, parts in per_file.items()),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        return ranked[:n]
+
+    def write_trace(self, p: Path) -> None:
+        """Write a Chrome trace-event JSON file (chrome://tracing, Perfetto, speedscope)."""
+        events = []
+        for s in self.spans:
+            args: Dict[str, Any] = {"alloc_blocks": s.blocks}
+            if s.file:
+                args["file"] = s.file
+            events.append({
+                "name": s.name if not s.file else f"{s.name} {Path(s.file).name}",
+                "cat": s.cat,
+                "ph": "X",
+                "ts": s.start * 1e6,
+                "dur": s.dur * 1e6,
+                "pid": s.pid,
+                "tid": s.tid,
+                "args": args,
+            })
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+_active: Optional[Timings] = None
+
+
+def active() -> Optional[Timings]:
+    """The recorder owned by this process, if any (forked workers do not inherit it)."""
+    if _active is not None and _active.pid != os.getpid():
+        return None
+    return _active
+
+
+def activate(timings: Optional[Timings]) -> Optional[Timings]:
+    """Make timings the recorder used by span(); returns the previous one."""
+    global _active
+    previous, _active = _active, timings
+    return previous
+
+
+def span(name: str, cat: str = "phase", file: Optional[Any] = None):
+    """Record a span on the active recorder; a no-op when timings are off."""
+    recorder = active()
+    if recorder is None:
+        return contextlib.nullcontext()
+    return recorder.span(name, cat, file)
@@ -0,0 +1,186 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .option_defaults import DEFAULT_POLL_INTERVAL
+from .workflow_finder import CANDIDATE_EXTS
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Editors often save in bursts (write temp file, rename, chmod); gather them.
+DEBOUNCE_SECONDS = 0.02
+# In polling mode, look for new files (a full tree walk) every N polls.
+RESCAN_EVERY = 8
+
+# scan_fn() -> (candidate files, directories to watch)
+ScanFn = Callable[[], Tuple[Set[Path], List[Path]]]
+
+
+def _is_candidate(p: Path) -> bool:
+    return p.suffix.lower() in CANDIDATE_EXTS
+
+
+class _Inotify:
+    """Minimal inotify binding over ctypes (Linux only)."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        self.dirs: Dict[int, Path] = {}
+
+    def watch(self, directory: Path) -> None:
+        wd = self._add(self.fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> List[Tuple[Path, str, int]]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+        events = []
+        pos = 0
+        while pos + _EVENT_HEADER.size <= len(buf):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, pos)
+            pos += _EVENT_HEADER.size
+            name = os.fsdecode(buf[pos:pos + length].rstrip(b"\0"))
+            pos += length
+            directory = self.dirs.get(wd)
+            if directory is not None or mask & IN_Q_OVERFLOW:
+                events.append((directory, name, mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _inotify_changes(scan_fn: ScanFn, known: Set[Path], dirs: List[Path]) -> Iterator[Set[Path]]:
+    ino = _Inotify()
+    try:
+        for d in dirs:
+            ino.watch(d)
+        while True:
+            events = ino.read(None)
+            while True:
+                more = ino.read(DEBOUNCE_SECONDS)
+                if not more:
+                    break
+                events.extend(more)
+
+            changed: Set[Path] = set()
+            rescan = False
+            for directory, name, mask in events:
+                if mask & IN_Q_OVERFLOW or mask & IN_ISDIR:
+                    # Lost events, or a directory appeared/vanished: fall back to a walk.
+                    rescan = True
+                    continue
+                if directory is None or not name:
+                    continue
+                p = directory / name
+                if p in known:
+                    changed.add(p)
+                elif _is_candidate(p):
+                    # Unknown file: only a walk knows whether it is ignored.
+                    rescan = True
+
+            if rescan:
+                current, current_dirs = scan_fn()
+                changed |= known ^ current
+                known = current
+                watched = set(ino.dirs.values())
+                for d in current_dirs:
+                    if d not in watched:
+                        ino.watch(d)
+            if changed:
+                yield changed
+    finally:
+        ino.close()
+
+
+def _stat_key(p: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _polling_changes(scan_fn: ScanFn, known: Set[Path], interval: float) -> Iterator[Set[Path]]:
+    stats = {p: _stat_key(p) for p in known}
+    tick = 0
+    while True:
+        time.sleep(interval)
+        tick += 1
+        changed: Set[Path] = set()
+        # Cheap pass: stat only the files we already know about.
+        for p, old in list(stats.items()):
+            new = _stat_key(p)
+            if new != old:
+                stats[p] = new
+                changed.add(p)
+        if tick % RESCAN_EVERY == 0:
+            current, _ = scan_fn()
+            for p in current - stats.keys():
+                stats[p] = _stat_key(p)
+                changed.add(p)
+            for p in stats.keys() - current:
+                del stats[p]
+                changed.add(p)
+        if changed:
+            yield changed
+
+
+def inotify_available() -> bool:
+    return sys.platform.startswith("linux")
+
+
+def watch_changes(
+    scan_fn: ScanFn,
+    poll: bool = False,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> Iterator[Set[Path]]:
+    """
+    Yield batches of candidate files that were modified, created or deleted.
+
+    Uses inotify where available and falls back to polling file stats. The
+    tree is only walked again (via scan_fn) when something new may have
+    appeared, so an edit to a known file costs a single event.
+    """
+    known, dirs = scan_fn()
+    if not poll and inotify_available():
+        try:
+            yield from _inotify_changes(scan_fn, set(known), dirs)
+            return
+        except (OSError, AttributeError):
+            pass
+    yield from _polling_changes(scan_fn, set(known), poll_interval)
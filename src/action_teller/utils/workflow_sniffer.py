@@ -0,0 +1,63 @@
+import mmap
+import re
+from pathlib import Path
+
+# Bytes read up front; larger files are memory-mapped and searched instead.
+SNIFF_BYTES = 64 * 1024
+
+WORKFLOWS_DIR_PARTS = (".github", "workflows")
+
+# Start of a line; the first may follow a UTF-8 byte-order mark, which YAML ignores.
+_LINE_START = rb"(?:\A\xef\xbb\xbf|^)"
+# Top-level (column 0) keys, plain or quoted.
+_ON_KEY = re.compile(_LINE_START + rb"""(?:on|"on"|'on')[ \t]*:""", re.MULTILINE)
+_FIRST_CONTENT = re.compile(rb"(?:\xef\xbb\xbf)?(?:[ \t]*(?:#[^\n]*)?\r?\n|---[^\n]*\n|%[^\n]*\n)*[ \t]*(\S)")
+
+
+def in_workflows_dir(p: Path) -> bool:
+    parts = p.parent.parts
+    return len(parts) >= 2 and tuple(parts[-2:]) == WORKFLOWS_DIR_PARTS
+
+
+def _undecidable(head: bytes) -> bool:
+    # Byte-order marks (UTF-16/32) and flow-style documents ({on: ..., jobs: ...})
+    # cannot be judged line by line; let the real parser decide.
+    if head.startswith((b"\xff\xfe", b"\xfe\xff", b"\x00")):
+        return True
+    m = _FIRST_CONTENT.match(head)
+    return bool(m and m.group(1) in (b"{", b"?"))
+
+
+def looks_like_workflow(p: Path, sniff_bytes: int = SNIFF_BYTES) -> bool:
+    """
+    Cheaply decide whether p can be a GitHub workflow: it needs a top-level
+    'on' key, the same rule the parsed-file check applies ('jobs' is not
+    required). A leading UTF-8 byte-order mark is allowed. Reads at most
+    sniff_bytes; for larger files the rest is searched through a memory map,
+    never parsed. Errs on the side of True when unsure, so the real YAML
+    parser stays the final judge.
+    """
+    try:
+        with p.open("rb") as f:
+            head = f.read(sniff_bytes)
+            if _undecidable(head):
+                return True
+            if _ON_KEY.search(head) is not None:
+                return True
+            if len(head) < sniff_bytes:
+                return False
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return _ON_KEY.search(mm) is not None
+            except (OSError, ValueError):
+                return True
+    except OSError:
+        # Unreadable here; let the parser report the error the usual way.
+        return True
+
+
+def looks_like_workflow_bytes(data: bytes) -> bool:
+    """looks_like_workflow() for content already in memory, such as a git blob."""
+    if _undecidable(data[:SNIFF_BYTES]):
+        return True
+    return _ON_KEY.search(data) is not None
@@ -0,0 +1,184 @@
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from .timings import span
+from ..emitters import EMITTERS
+from ..renderers.model import BulletList, Document, Heading, ListItem, NONE
+
+
+_umask: Optional[int] = None
+
+
+def _new_file_mode() -> int:
+    """The mode open() would give a new file: 0o666 minus the process umask (read once)."""
+    global _umask
+    if _umask is None:
+        _umask = os.umask(0)
+        os.umask(_umask)
+    return 0o666 & ~_umask
+
+
+def replace_from_temp(tmp: str, p: Path) -> None:
+    """
+    Move a finished temp file over p. mkstemp creates files as 0600, so the
+    temp file first takes p's current mode, or the usual mode for a new
+    file, and generated docs stay readable by whoever serves them.
+    """
+    try:
+        mode = os.stat(p).st_mode & 0o7777
+    except OSError:
+        mode = _new_file_mode()
+    os.chmod(tmp, mode)
+    os.replace(tmp, p)
+
+
+def atomic_write_bytes(p: Path, data: bytes) -> None:
+    """
+    Write data to p through a temp file in the same directory and an atomic
+    rename, so readers never see a half-written file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=str(p.parent), prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        replace_from_temp(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(p: Path, text: str) -> bool:
+    """
+    Write text to p unless p already holds exactly these bytes.
+    Returns True when the file was (re)written.
+    """
+    data = text.encode("utf-8")
+    try:
+        if p.stat().st_size == len(data) and p.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    atomic_write_bytes(p, data)
+    return True
+
+
+# Index entries of the last run, whatever formats it wrote, so a partial run
+# (--since/--diff) can patch every index without re-reading them.
+ENTRIES_FILENAME = ".cifolio-entries.json"
+
+# One INDEX.md entry as written by index_document(): - [name](stem.md) — `path`
+_INDEX_LINE = re.compile(r"^- \[(?P<name>.*?)\]\((?P<stem>.*)\.md\) — `(?P<path>.*)`$")
+
+
+def doc_stem(name: str) -> str:
+    return name.replace(" ", "_").replace("/", "_")
+
+
+def doc_filename(name: str, extension: str = ".md") -> str:
+    return f"{doc_stem(name)}{extension}"
+
+
+def index_document(entries: Iterable[Tuple[str, str, Path]], extension: str) -> Document:
+    """Build the index Document, linking each entry to its file in one format."""
+    items = tuple(ListItem(f"[{name}]({stem}{extension}) — `{f}`") for stem, name, f in entries)
+    blocks = (Heading(1, "CIfolio — Documentation Index"), BulletList(items) if items else NONE)
+    return Document("index", "CIfolio — Documentation Index", "", blocks)
+
+
+class DocWriter:
+    """
+    Writes each emitted document as soon as it is available and keeps only
+    the small index entries in memory. Every document is written once per
+    output format, and each format gets its own index (INDEX.md, INDEX.html, ...).
+    """
+
+    def __init__(self, out: Path, formats: Sequence[str] = ("md",)):
+        self.out = out
+        self.formats = tuple(formats)
+        # key -> (file stem, name, source); insertion order is index order
+        self.entries: Dict[Hashable, Tuple[str, str, Path]] = {}
+        self.count = 0
+        self.changed = 0
+
+    def add(self, f: Path, name: str, key: Optional[Hashable] = None) -> str:
+        """
+        Reserve the index entry for a document and return its file stem.
+        Adding an existing key replaces its entry in place.
+        """
+        key = f if key is None else key
+        stem = doc_stem(name)
+        old = self.entries.get(key)
+        self.entries[key] = (stem, name, f)
+        if old is None:
+            self.count += 1
+        elif old[0] != stem:
+            self._drop_orphan(old[0])
+        return stem
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop a document's index entry and its files. Returns True if it existed."""
+        old = self.entries.pop(key, None)
+        if old is None:
+            return False
+        self.count -= 1
+        self._drop_orphan(old[0])
+        return True
+
+    def _drop_orphan(self, stem: str) -> None:
+        if any(s == stem for s, _, _ in self.entries.values()):
+            return
+        for fmt in self.formats:
+            try:
+                (self.out / f"{stem}{EMITTERS[fmt].extension}").unlink()
+            except OSError:
+                pass
+
+    def write(self, stem: str, outputs: Dict[str, str], source: Optional[Path] = None) -> None:
+        with span("write", "file", source or stem):
+            for fmt, text in outputs.items():
+                self.changed += write_if_changed(self.out / f"{stem}{EMITTERS[fmt].extension}", text)
+
+    def load_index(self, kind_of: Callable[[Path], str]) -> int:
+        """
+        Load the entries of the previous run, so a partial run can update the
+        indexes and remove stale pages instead of starting from scratch. They
+        come from ENTRIES_FILENAME, or from INDEX.md for output written before
+        it existed. kind_of maps a source path to its kind, which neither
+        records. Returns the number of entries loaded.
+        """
+        try:
+            rows = json.loads((self.out / ENTRIES_FILENAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            rows = self._index_md_rows()
+        for stem, name, source in rows:
+            f = Path(source)
+            self.entries[(kind_of(f), f)] = (stem, name, f)
+        self.count = len(self.entries)
+        return self.count
+
+    def _index_md_rows(self) -> List[Tuple[str, str, str]]:
+        try:
+            lines = (self.out / "INDEX.md").read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        matches = (_INDEX_LINE.match(line) for line in lines)
+        return [(m.group("stem"), m.group("name"), m.group("path")) for m in matches if m is not None]
+
+    def write_index(self) -> Path:
+        """Write one index per format and return the first (INDEX.md by default)."""
+        written = []
+        for fmt in self.formats:
+            emitter = EMITTERS[fmt]
+            index = self.out / f"INDEX{emitter.extension}"
+            write_if_changed(index, emitter.emit(index_document(self.entries.values(), emitter.extension)))
+            written.append(index)
+        rows = [[stem, name, str(f)] for stem, name, f in self.entries.values()]
+        write_if_changed(self.out / ENTRIES_FILENAME, json.dumps(rows, ensure_ascii=False))
+        return written[0]
@@ -1,26 +1,79 @@
 import re
-import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
-
-# YAML 1.2-like SafeLoader: only "true"/"false" are booleans
-class Yaml12SafeLoader(yaml.SafeLoader):  # <-- added
-    pass
-
-# remove the broad YAML 1.1 bool resolver (yes/no/on/off/…)
-for first, mappings in list(Yaml12SafeLoader.yaml_implicit_resolvers.items()):  # <-- added
-    Yaml12SafeLoader.yaml_implicit_resolvers[first] = [
-        (tag, reg) for (tag, reg) in mappings if tag != 'tag:yaml.org,2002:bool'
-    ]
-
-# add a strict boolean resolver: only true|false (case-insensitive)
-Yaml12SafeLoader.add_implicit_resolver(  # <-- added
-    'tag:yaml.org,2002:bool',
-    re.compile(r'^(?:true|false)$', re.IGNORECASE),
-    list('tTfF')
-)
-
-def parse_action_yaml(p: Path) -> Dict[str, Any]:
-    with p.open("r", encoding="utf-8") as f:
-        # use Yaml12SafeLoader to keep "on" as a string key
-        return yaml.load(f, Loader=Yaml12SafeLoader) or {}  # <-- changed
+from typing import Any, Dict, Optional, Tuple
+
+
+def _yaml12_bools(loader_cls):
+    """
+    Give loader_cls YAML 1.2-like booleans: only "true"/"false" (any case).
+    The resolver table is copied first so PyYAML's shared Resolver is untouched.
+    """
+    # remove the broad YAML 1.1 bool resolver (yes/no/on/off/…)
+    loader_cls.yaml_implicit_resolvers = {
+        first: [(tag, reg) for (tag, reg) in mappings if tag != 'tag:yaml.org,2002:bool']
+        for first, mappings in loader_cls.yaml_implicit_resolvers.items()
+    }
+    # add a strict boolean resolver: only true|false (case-insensitive)
+    loader_cls.add_implicit_resolver(
+        'tag:yaml.org,2002:bool',
+        re.compile(r'^(?:true|false)$', re.IGNORECASE),
+        list('tTfF')
+    )
+    return loader_cls
+
+
+@lru_cache(maxsize=None)
+def yaml12_loaders() -> Tuple[type, Optional[type]]:
+    """
+    (Yaml12SafeLoader, Yaml12CSafeLoader) — the latter None when PyYAML was
+    built without libyaml. PyYAML is imported and the resolver tables are
+    built on first use, once per process, so commands that never parse YAML
+    do not pay for either.
+    """
+    import yaml
+
+    # YAML 1.2-like SafeLoader: only "true"/"false" are booleans
+    @_yaml12_bools
+    class Yaml12SafeLoader(yaml.SafeLoader):
+        pass
+
+    # Same rules on top of libyaml's C parser, when PyYAML was built with it.
+    if not getattr(yaml, "__with_libyaml__", False):
+        return Yaml12SafeLoader, None
+
+    @_yaml12_bools
+    class Yaml12CSafeLoader(yaml.CSafeLoader):
+        pass
+
+    return Yaml12SafeLoader, Yaml12CSafeLoader
+
+
+def yaml12_loader() -> type:
+    """The fastest YAML 1.2 loader available: libyaml-backed when possible."""
+    safe, fast = yaml12_loaders()
+    return fast or safe
+
+
+def __getattr__(name: str):
+    # The loader classes used to be module attributes; build them on access.
+    if name == "Yaml12SafeLoader":
+        return yaml12_loaders()[0]
+    if name == "Yaml12CSafeLoader":
+        return yaml12_loaders()[1]
+    if name == "Yaml12Loader":
+        return yaml12_loader()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def parse_action_yaml(p: Path, loader=None) -> Dict[str, Any]:
+    import yaml
+    with p.open("rb") as f:
+        # use a YAML 1.2 loader to keep "on" as a string key
+        return yaml.load(f, Loader=loader or yaml12_loader()) or {}
+
+
+def parse_yaml_bytes(data: bytes, loader=None) -> Dict[str, Any]:
+    """parse_action_yaml() for content already in memory, such as a git blob."""
+    import yaml
+    return yaml.load(data, Loader=loader or yaml12_loader()) or {}
@@ -0,0 +1,109 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from action_teller.utils.archive_source import ArchiveError, archive_members, is_archive
+
+MEMBERS = {
+    "repo/action.yml": b"name: Root\n",
+    "repo/.github/workflows/ci.yml": b"name: CI\non: push\n",
+    "repo/tools/lint/action.yaml": b"name: Lint\n",
+    "repo/node_modules/pkg/action.yml": b"name: Vendored\n",
+    "repo/vendor/deps.yml": b"a: 1\n",
+    "repo/README.md": b"# Readme\n",
+    "../evil.yml": b"name: Evil\n",
+    "repo/../../up/action.yml": b"name: Up\n",
+    "/etc/abs.yml": b"name: Abs\n",
+    "repo/./x/../dotted.yml": b"name: Dotted\n",
+}
+
+KEPT = ["repo/action.yml", "repo/.github/workflows/ci.yml", "repo/tools/lint/action.yaml",
+        "repo/vendor/deps.yml", "etc/abs.yml", "repo/dotted.yml"]
+
+
+def _tar(path, mode):
+    with tarfile.open(path, mode) as tf:
+        d = tarfile.TarInfo("repo/.github")
+        d.type = tarfile.DIRTYPE
+        tf.addfile(d)
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("repo/link/action.yml")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "../action.yml"
+        tf.addfile(link)
+    return path
+
+
+def _zip(path):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("repo/.github/", b"")
+        for name, data in MEMBERS.items():
+            zf.writestr(name, data)
+    return path
+
+
+@pytest.fixture(params=["tar.gz", "tgz", "tar", "tar.xz", "zip"])
+def archive(request, tmp_path):
+    suffix = request.param
+    path = tmp_path / f"src.{suffix}"
+    if suffix == "zip":
+        return _zip(path)
+    return _tar(path, {"tar.gz": "w:gz", "tgz": "w:gz", "tar": "w", "tar.xz": "w:xz"}[suffix])
+
+
+def _rel(members, archive):
+    return [str(m.path.relative_to(archive)) for m in members]
+
+
+def test_members_are_selected_and_read(archive):
+    assert is_archive(archive)
+    members = list(archive_members(archive))
+    assert _rel(members, archive) == KEPT
+    assert [m.content for m in members] == [MEMBERS[n] for n in (
+        "repo/action.yml", "repo/.github/workflows/ci.yml", "repo/tools/lint/action.yaml",
+        "repo/vendor/deps.yml", "/etc/abs.yml", "repo/./x/../dotted.yml")]
+
+
+def test_escaping_members_never_leave_the_archive(archive):
+    for m in archive_members(archive):
+        assert archive in m.path.parents
+        assert ".." not in m.path.relative_to(archive).parts
+
+
+def test_kind_and_exclude_filters(archive):
+    assert _rel(archive_members(archive, want_workflows=False), archive) == ["repo/action.yml",
+                                                                             "repo/tools/lint/action.yaml"]
+    # As with scan_tree, action.yml files are workflow candidates too; callers drop them.
+    assert _rel(archive_members(archive, want_actions=False), archive) == KEPT
+    assert _rel(archive_members(archive, want_actions=False, want_workflows=False), archive) == []
+    assert _rel(archive_members(archive, excludes=["vendor", "repo/tools", "etc"]), archive) == [
+        "repo/action.yml", "repo/.github/workflows/ci.yml", "repo/node_modules/pkg/action.yml", "repo/dotted.yml"]
+
+
+def test_unreadable_archives(tmp_path):
+    junk = tmp_path / "junk.tar.gz"
+    junk.write_bytes(b"not an archive")
+    with pytest.raises(ArchiveError, match="cannot read"):
+        list(archive_members(junk))
+    assert not is_archive(tmp_path / "missing.zip")
+    assert not is_archive(tmp_path)
+
+
+@pytest.mark.parametrize("mode", ["w:gz", "w"])
+def test_truncated_tar_is_an_error(tmp_path, mode):
+    # Cut anywhere before the end-of-archive block, tarfile alone would just
+    # report fewer members.
+    whole = _tar(tmp_path / "whole.tar", mode).read_bytes()
+    cut = tmp_path / "cut.tar"
+    for n in range(1, len(whole), max(1, len(whole) // 97)):
+        cut.write_bytes(whole[:n])
+        try:
+            found = len(list(archive_members(cut)))
+        except ArchiveError:
+            continue
+        assert found == len(KEPT), n
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from action_teller.cli import cli
+from action_teller.utils import build_cache
+from action_teller.utils.build_cache import CACHE_FILENAME, BuildCache
+
+OPTIONS = {"formats": ["md"]}
+
+
+def _stored(out, options=OPTIONS, deps=()):
+    cache = BuildCache(out, options)
+    cache.store("action", Path("/r/action.yml"), "d1", "A", {"md": "# A\n"}, deps=deps)
+    cache.save()
+
+
+def test_hit_and_miss(tmp_path):
+    _stored(tmp_path)
+    cache = BuildCache(tmp_path, OPTIONS)
+    assert cache.lookup("action", Path("/r/action.yml"), "d1")["outputs"] == {"md": "# A\n"}
+    assert cache.lookup("action", Path("/r/action.yml"), "d2") is None          # content changed
+    assert cache.lookup("workflow", Path("/r/action.yml"), "d1") is None        # other kind
+    assert cache.lookup("action", Path("/r/other.yml"), "d1") is None
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.save()
+
+
+def test_changed_dependency_is_a_miss(tmp_path):
+    _stored(tmp_path, deps=[("/r/sub/action.yml", "s1")])
+    cache = BuildCache(tmp_path, OPTIONS)
+    seen = []
+
+    def current(digests):
+        def check(deps):
+            seen.append(deps)
+            return all(digests.get(p) == d for p, d in deps)
+        return check
+
+    assert cache.check("action", Path("/r/action.yml"), "d1", current({"/r/sub/action.yml": "s1"}))
+    assert not cache.check("action", Path("/r/action.yml"), "d1", current({"/r/sub/action.yml": "s2"}))
+    assert seen == [[("/r/sub/action.yml", "s1")]] * 2
+    assert cache.dependents(Path("/r/sub/action.yml")) == [("action", Path("/r/action.yml"))]
+    cache.save()
+
+
+def test_format_version_and_option_changes_start_over(tmp_path, monkeypatch):
+    _stored(tmp_path)
+    cache = BuildCache(tmp_path, {"formats": ["md", "html"]})
+    assert cache.lookup("action", Path("/r/action.yml"), "d1") is None
+    cache.save()
+
+    _stored(tmp_path)
+    monkeypatch.setattr(build_cache, "CACHE_FORMAT", build_cache.CACHE_FORMAT + 1)
+    cache = BuildCache(tmp_path, OPTIONS)
+    assert cache.fetch("action", Path("/r/action.yml")) is None
+    cache.save()
+
+    _stored(tmp_path)
+    monkeypatch.setattr(build_cache, "__version__", "0.0.0-other")
+    cache = BuildCache(tmp_path, OPTIONS)
+    assert cache.fetch("action", Path("/r/action.yml")) is None
+    cache.save()
+
+
+def test_save_prunes_entries_not_seen(tmp_path):
+    cache = BuildCache(tmp_path, OPTIONS)
+    for name in ("a", "b"):
+        cache.store("action", Path(f"/r/{name}.yml"), name, name, {"md": name})
+    cache.save()
+    cache = BuildCache(tmp_path, OPTIONS)
+    assert cache.check("action", Path("/r/a.yml"), "a")
+    cache.save(prune=False)
+    cache = BuildCache(tmp_path, OPTIONS)
+    assert cache.check("action", Path("/r/a.yml"), "a")
+    cache.save()
+    cache = BuildCache(tmp_path, OPTIONS)
+    assert cache.fetch("action", Path("/r/a.yml")) is not None
+    assert cache.fetch("action", Path("/r/b.yml")) is None
+    cache.save()
+
+
+def _repo(root):
+    (root / ".github" / "workflows").mkdir(parents=True)
+    (root / ".github" / "workflows" / "ci.yml").write_text(
+        "name: CI\non: push\njobs:\n  a:\n    runs-on: x\n    steps:\n      - run: make\n")
+    for name in ("setup", "deploy"):
+        (root / name).mkdir()
+        (root / name / "action.yml").write_text(f"name: {name}\ndescription: d\nruns:\n  using: node20\n  main: i.js\n")
+
+
+def _build(root, out):
+    result = CliRunner().invoke(cli, ["-p", str(root), "-o", str(out), "--format", "md,html", "--actions", "--workflows"])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def _files(out):
+    # The SQLite cache and query index are updated on every run by design.
+    return {p: (p.stat().st_mtime_ns, p.stat().st_ino) for p in out.rglob("*")
+            if p.is_file() and not p.name.endswith((".sqlite3", "-journal", "-wal", "-shm"))}
+
+
+def test_warm_run_rewrites_nothing(tmp_path):
+    root, out = tmp_path / "repo", tmp_path / "out"
+    _repo(root)
+    assert "Cache: 0 hit(s), 3 miss(es)" in _build(root, out)
+    assert (out / CACHE_FILENAME).exists()
+    before = _files(out)
+    assert len(before) > 6
+
+    assert "Cache: 3 hit(s), 0 miss(es); 0 file(s) changed." in _build(root, out)
+    assert _files(out) == before
+
+    # One edited source writes only its own pages and the index.
+    ci = root / ".github" / "workflows" / "ci.yml"
+    ci.write_text(ci.read_text().replace("run: make", "run: make test"))
+    assert "Cache: 2 hit(s), 1 miss(es)" in _build(root, out)
+    after = _files(out)
+    assert set(after) == set(before)
+    assert sorted(p.name for p in before if after[p] != before[p]) == ["CI.html", "CI.md"]
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Loaded only once a command actually builds, summarizes or queries something.
+HEAVY = (
+    "concurrent.futures",
+    "sqlite3",
+    "yaml",
+    "ollama",
+    "action_teller.emitters",
+    "action_teller.utils.summary_cache",
+    "action_teller.utils.summary_scheduler",
+    "action_teller.utils.ollama",
+    "action_teller.utils.expander",
+    "action_teller.utils.index_db",
+    "action_teller.utils.pipeline",
+)
+
+
+def _imported(statement):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          env=env, capture_output=True, text=True, check=True)
+    # stderr lines: "import time: self | cumulative | <indent>module"
+    return {line.rsplit("|", 1)[1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")}
+
+
+def test_cli_import_leaves_heavy_modules_alone():
+    modules = _imported("import action_teller.cli")
+    assert "action_teller.cli" in modules
+    loaded = sorted(m for m in modules if any(m == h or m.startswith(h + ".") for h in HEAVY))
+    assert loaded == []
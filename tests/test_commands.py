@@ -0,0 +1,160 @@
+import io
+import shutil
+import subprocess
+import tarfile
+
+import pytest
+
+from action_teller.commands.archive import archive_tasks
+from action_teller.commands.build import Build, BuildOptions
+from action_teller.commands.discover import discover, repo_tasks, tree_tasks
+from action_teller.commands.document import document_tree
+from action_teller.commands.git import git_tasks
+from action_teller.commands.manifest import document_repo
+from action_teller.utils.manifest import ManifestRepo
+from action_teller.utils.pipeline import ACTION, EXTRACTIVE, OLLAMA, WORKFLOW
+
+ACTION_YML = "name: Setup\ndescription: Set things up\nruns:\n  using: node20\n  main: index.js\n"
+WORKFLOW_YML = "name: CI\non: push\njobs:\n  build:\n    runs-on: ubuntu-latest\n    steps:\n      - run: make\n"
+
+
+def _write(root, rel, text):
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    _write(root, "action.yml", ACTION_YML)
+    _write(root, ".github/workflows/ci.yml", WORKFLOW_YML)
+    _write(root, "deploy/release.yml", WORKFLOW_YML)
+    _write(root, "k8s/values.yml", "replicas: 2\n")
+    return root
+
+
+def _build(root, out, **options):
+    options.setdefault("index", False)
+    return Build(BuildOptions(path=root, out=out, **options))
+
+
+def test_task_carries_the_build_options(tree, tmp_path):
+    build = _build(tree, tmp_path / "out", formats=("md", "json"), catalog=tmp_path / "c.ndjson",
+                   expand_depth=2)
+    t = build.task(WORKFLOW, tree / ".github/workflows/ci.yml")
+    assert (t.kind, t.formats, t.catalog, t.index) == (WORKFLOW, ("md", "json"), True, False)
+    assert t.expand == (tree, 2, 0)
+    build.expand_run += 1
+    assert build.task(ACTION, tree / "action.yml").expand == (tree, 2, 1)
+
+
+def test_engine_for_sends_ollama_for_globs_to_ollama(tree, tmp_path):
+    build = _build(tree, tmp_path / "out", summary_engine=EXTRACTIVE, ollama_for=("deploy/*",))
+    assert build.task(WORKFLOW, tree / "deploy/release.yml").summary_engine == OLLAMA
+    assert build.task(WORKFLOW, tree / ".github/workflows/ci.yml").summary_engine == EXTRACTIVE
+    assert _build(tree, tmp_path / "o2").task(ACTION, tree / "action.yml").summary_engine == OLLAMA
+
+
+def test_content_tasks_sniff_the_content(tree, tmp_path):
+    build = _build(tree, tmp_path / "out", actions=True, workflows=True)
+    assert [t.kind for t in build.content_tasks(tree / "action.yml", b"name: x\n")] == [ACTION]
+    assert [t.kind for t in build.content_tasks(tree / "x/wf.yml", WORKFLOW_YML.encode())] == [WORKFLOW]
+    assert list(build.content_tasks(tree / "x/values.yml", b"replicas: 2\n")) == []
+    only = _build(tree, tmp_path / "o2", workflows=True, github_workflows_only=True)
+    assert list(only.content_tasks(tree / "x/wf.yml", WORKFLOW_YML.encode())) == []
+    assert [t.content for t in only.content_tasks(tree / ".github/workflows/a.yml", b"a: 1\n")] == [b"a: 1\n"]
+
+
+def test_tree_tasks_skip_non_workflows(tree, tmp_path, capsys):
+    build = _build(tree, tmp_path / "out", actions=True, workflows=True)
+    tasks = tree_tasks(build, discover(build))
+    assert sorted((t.kind, t.path.relative_to(tree).as_posix()) for t in tasks) == [
+        (ACTION, "action.yml"), (WORKFLOW, ".github/workflows/ci.yml"), (WORKFLOW, "deploy/release.yml"),
+    ]
+    assert "Skipped 2 non-workflow YAML file(s)" in capsys.readouterr().err
+
+
+def test_tree_tasks_single_file_needs_no_scan(tree, tmp_path, capsys):
+    build = _build(tree, tmp_path / "out", action=tree / "action.yml")
+    assert discover(build) is None
+    assert [t.path for t in tree_tasks(build, None)] == [tree / "action.yml"]
+    empty = _build(tmp_path / "empty", tmp_path / "o2", actions=True)
+    (tmp_path / "empty").mkdir()
+    assert tree_tasks(empty, discover(empty)) == []
+    assert "No action.yml/.yaml found under" in capsys.readouterr().err
+
+
+def test_document_tree_writes_and_indexes(tree, tmp_path):
+    out = tmp_path / "out"
+    build = _build(tree, out, actions=True, workflows=True, index=True)
+    writer = document_tree(build)
+    build.finish()
+    assert writer.count == 3
+    assert (out / "INDEX.md").is_file() and (out / "Setup.md").is_file()
+    assert build.query_index.updated == 3
+
+    again = _build(tree, out, actions=True, workflows=True, index=True)
+    document_tree(again)
+    again.finish()
+    assert (again.cache.hits, again.cache.misses) == (3, 0)
+
+
+def test_document_tree_without_documents_exits_2(tmp_path):
+    (tmp_path / "empty").mkdir()
+    build = _build(tmp_path / "empty", tmp_path / "out", actions=True)
+    with pytest.raises(SystemExit) as e:
+        document_tree(build)
+    assert e.value.code == 2
+
+
+def test_archive_tasks_stream_members(tmp_path):
+    archive = tmp_path / "repo.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        for name, text in (("repo/action.yml", ACTION_YML), ("repo/.github/workflows/ci.yml", WORKFLOW_YML),
+                           ("repo/k8s/values.yml", "replicas: 2\n")):
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    build = _build(archive, tmp_path / "out", actions=True, workflows=True)
+    found = []
+    tasks = archive_tasks(build, found=found)
+    assert found == []  # nothing is read before the build asks for it
+    assert [(t.kind, t.path.relative_to(archive).as_posix()) for t in tasks] == [
+        (ACTION, "repo/action.yml"), (WORKFLOW, "repo/.github/workflows/ci.yml"),
+    ]
+    assert [p.relative_to(archive).as_posix() for p in found] == ["repo/action.yml", "repo/.github/workflows/ci.yml"]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_git_tasks_reads_changed_and_deleted(tree, tmp_path):
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@example.com", "-c", "commit.gpgsign=false",
+                        *args], cwd=str(tree), check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    git("init", "-q")
+    git("add", "-A")
+    git("commit", "-qm", "base")
+    _write(tree, ".github/workflows/ci.yml", WORKFLOW_YML.replace("make", "make test"))
+    (tree / "deploy/release.yml").unlink()
+    git("commit", "-qam", "change")
+
+    build = _build(tree, tmp_path / "out", workflows=True, git_range="HEAD~1..HEAD")
+    changed, tasks, deleted = git_tasks(build)
+    assert [c.path for c in changed] == [tree / ".github/workflows/ci.yml"]
+    assert deleted == [(WORKFLOW, tree / "deploy/release.yml")]
+    assert [b"make test" in t.content for t in tasks] == [True]
+
+
+def test_document_repo_reports_instead_of_raising(tree, tmp_path, capsys):
+    out = tmp_path / "out"
+    build = _build(tree, out, actions=True, workflows=True)
+    assert len(repo_tasks(build, tree)) == 3
+    report = document_repo(build, ManifestRepo("repo", tree, out / "repo"))
+    assert (report.docs, report.errors, report.failure) == (3, 0, None)
+    assert (out / "repo" / "INDEX.md").is_file()
+
+    missing = document_repo(build, ManifestRepo("gone", tmp_path / "gone", out / "gone"))
+    assert missing.failure.startswith("not a directory or archive")
+    assert "ERROR in gone" in capsys.readouterr().err
@@ -0,0 +1,201 @@
+import io
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from action_teller.utils import doc_server
+from action_teller.utils.doc_server import (
+    INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, NOT_A_WORKFLOW, PARSE_ERROR, RENDER_FAILED,
+    DocServer, RequestError, make_http_server, rpc_answer, serve_stdio,
+)
+from action_teller.utils.pipeline import ACTION, WORKFLOW, DocTask, build_doc
+
+FIXTURES = Path(__file__).parent / "fixtures" / "yaml"
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    (root / ".github" / "workflows").mkdir(parents=True)
+    shutil.copy(FIXTURES / "action.yml", root / "action.yml")
+    shutil.copy(FIXTURES / "workflow.yml", root / ".github" / "workflows" / "ci.yml")
+    (root / "notes.yml").write_text("just: data\n")
+    (root / "broken.yml").write_text("on: [push\n")
+    return root
+
+
+def _rpc(docs, method, params=None, msg_id=1):
+    return rpc_answer(docs, json.dumps({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params}))
+
+
+def _error_code(docs, method, params):
+    with pytest.raises(RequestError) as e:
+        docs.handle(method, params)
+    return e.value.code
+
+
+def test_render_matches_a_build(repo):
+    docs = DocServer(repo, formats=("md", "html"))
+    for kind, rel in ((ACTION, "action.yml"), (WORKFLOW, ".github/workflows/ci.yml")):
+        served = docs.render({"path": rel})
+        built = build_doc(DocTask(kind, repo / rel, formats=("md", "html")))
+        assert served["kind"] == kind and served["name"] == built.name
+        assert served["outputs"] == built.outputs
+
+
+def test_render_of_unsaved_content(repo):
+    docs = DocServer(repo)
+    text = (repo / "action.yml").read_text().replace("Setup Tool", "Setup Other Tool")
+    served = docs.render({"path": "action.yml", "content": text})
+    assert "Setup Other Tool" in served["outputs"]["md"]
+    assert "Setup Other Tool" not in docs.render({"path": "action.yml"})["outputs"]["md"]
+
+
+def test_paths_outside_the_root_are_rejected(repo, tmp_path):
+    (tmp_path / "secret.yml").write_text("name: x\n")
+    (repo / "link.yml").symlink_to(tmp_path / "secret.yml")
+    docs = DocServer(repo)
+    for raw in ("../secret.yml", str(tmp_path / "secret.yml"), "link.yml", ".github/../../secret.yml", "", None):
+        assert _error_code(docs, "render", {"path": raw}) == INVALID_PARAMS
+    assert _error_code(docs, "render_tree", {"path": ".."}) == INVALID_PARAMS
+
+
+def test_request_error_codes(repo):
+    docs = DocServer(repo)
+    assert _error_code(docs, "nope", {}) == METHOD_NOT_FOUND
+    assert _error_code(docs, "render", []) == INVALID_PARAMS
+    assert _error_code(docs, "render", {"path": "action.yml", "formats": ["pdf"]}) == INVALID_PARAMS
+    assert _error_code(docs, "render", {"path": "action.yml", "kind": "job"}) == INVALID_PARAMS
+    assert _error_code(docs, "render", {"path": "missing.yml"}) == RENDER_FAILED
+    assert _error_code(docs, "render", {"path": "broken.yml"}) == RENDER_FAILED
+    assert _error_code(docs, "render", {"path": "notes.yml"}) == NOT_A_WORKFLOW
+
+
+def test_json_rpc_envelope(repo):
+    docs = DocServer(repo)
+    assert rpc_answer(docs, "{")["error"]["code"] == PARSE_ERROR
+    assert rpc_answer(docs, "[]")["error"]["code"] == INVALID_REQUEST
+    assert rpc_answer(docs, '{"id": 3, "method": "metrics"}') == {
+        "jsonrpc": "2.0", "id": 3, "error": {"code": INVALID_REQUEST, "message": "invalid request"}}
+    assert _rpc(docs, "nope", msg_id=4)["error"]["code"] == METHOD_NOT_FOUND
+    assert _rpc(docs, "render", {"path": "../x"})["error"]["code"] == INVALID_PARAMS
+    ok = _rpc(docs, "render", {"path": "action.yml"}, msg_id="a")
+    assert ok["id"] == "a" and ok["result"]["name"] == "Setup Tool"
+    # Notifications get no answer, alone or in a batch.
+    assert rpc_answer(docs, '{"jsonrpc": "2.0", "method": "metrics"}') is None
+    batch = rpc_answer(docs, json.dumps([
+        {"jsonrpc": "2.0", "method": "metrics"},
+        {"jsonrpc": "2.0", "id": 1, "method": "render", "params": {"path": "notes.yml"}},
+        {"jsonrpc": "2.0", "id": 2, "method": "metrics"},
+    ]))
+    assert [r["id"] for r in batch] == [1, 2]
+    assert batch[0]["error"]["code"] == NOT_A_WORKFLOW and "result" in batch[1]
+
+
+def test_stdio_answers_until_shutdown(repo):
+    lines = [json.dumps({"jsonrpc": "2.0", "id": i, "method": "render", "params": {"path": "action.yml"}})
+             for i in range(4)]
+    lines += ['{"jsonrpc": "2.0", "id": 9, "method": "shutdown"}', "not read"]
+    out = io.StringIO()
+    serve_stdio(DocServer(repo), workers=2, stdin=io.StringIO("\n".join(lines) + "\n"), stdout=out)
+    answers = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted(a["id"] for a in answers) == [0, 1, 2, 3, 9]
+    assert all(a["result"]["name"] == "Setup Tool" for a in answers if a["id"] != 9)
+
+
+def test_metrics_count_hits_misses_and_errors(repo):
+    docs = DocServer(repo)
+    docs.render({"path": "action.yml"})
+    docs.render({"path": "action.yml"})
+    docs.render({"path": "action.yml", "formats": ["html"]})
+    with pytest.raises(RequestError):
+        docs.handle("render", {"path": "../x"})
+    with pytest.raises(RequestError):
+        docs.handle("nope", {})
+    m = docs.handle("metrics", {})
+    assert {k: m["rendered"][k] for k in ("hits", "misses", "entries")} == {"hits": 1, "misses": 2, "entries": 2}
+    assert {k: m["parsed"][k] for k in ("hits", "misses", "entries")} == {"hits": 1, "misses": 1, "entries": 1}
+    assert m["latency"]["render"]["requests"] == 1 and m["latency"]["render"]["errors"] == 1
+    assert m["latency"]["?"] == {**m["latency"]["?"], "requests": 1, "errors": 1}
+
+
+def test_an_edited_file_is_rendered_again(repo):
+    docs = DocServer(repo)
+    p = repo / "action.yml"
+    first = docs.render({"path": "action.yml"})
+    p.write_text(p.read_text().replace("Setup Tool", "Setup Tool 2"))
+    second = docs.render({"path": "action.yml"})
+    assert second["digest"] != first["digest"] and second["name"] == "Setup Tool 2"
+
+
+def test_same_size_edit_with_restored_mtime_is_seen(repo):
+    # Freshly written files are always hashed again, whatever their stat says.
+    docs = DocServer(repo)
+    p = repo / "action.yml"
+    before = p.stat()
+    assert docs.render({"path": "action.yml"})["name"] == "Setup Tool"
+    p.write_text(p.read_text().replace("Setup Tool", "Setup Loot"))
+    os.utime(p, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert p.stat().st_size == before.st_size
+    assert docs.render({"path": "action.yml"})["name"] == "Setup Loot"
+
+
+def test_settled_files_cost_a_stat_until_replaced(repo, monkeypatch):
+    monkeypatch.setattr(doc_server, "RACY_NS", 0)
+    reads = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self.name) or read_bytes(self))
+    docs = DocServer(repo)
+    p = repo / "action.yml"
+    before = p.stat()
+    docs.render({"path": "action.yml"})
+    docs.render({"path": "action.yml"})
+    assert reads == ["action.yml"]
+    # Same size and mtime, but a new inode: swapped in by rename, as editors do.
+    tmp = repo / "action.yml.tmp"
+    tmp.write_text(p.read_text().replace("Setup Tool", "Setup Loot"))
+    os.utime(tmp, ns=(before.st_atime_ns, before.st_mtime_ns))
+    os.replace(tmp, p)
+    assert docs.render({"path": "action.yml"})["name"] == "Setup Loot"
+    assert reads == ["action.yml", "action.yml"]
+
+
+@pytest.fixture
+def http(repo):
+    server = make_http_server(DocServer(repo), "127.0.0.1", 0, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://%s:%d" % server.server_address[:2]
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, data=None):
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=10) as r:
+            return r.status, r.headers["Content-Type"], r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers["Content-Type"], e.read()
+
+
+def test_http_render_metrics_and_errors(http, repo):
+    status, ctype, body = _get(http + "/render?path=action.yml&format=html")
+    assert status == 200 and ctype.startswith("text/html")
+    assert body.decode() == build_doc(DocTask(ACTION, repo / "action.yml", formats=("html",))).outputs["html"]
+    assert _get(http + "/render?path=../x")[0] == 400
+    assert _get(http + "/render?path=notes.yml")[0] == 422
+    assert _get(http + "/nope")[0] == 404
+    status, _, body = _get(http + "/render", data=b"{")
+    assert status == 400 and json.loads(body)["error"]["code"] == PARSE_ERROR
+    status, _, body = _get(http + "/rpc", data=json.dumps({"jsonrpc": "2.0", "id": 1, "method": "nope"}).encode())
+    assert status == 200 and json.loads(body)["error"]["code"] == METHOD_NOT_FOUND
+    status, ctype, body = _get(http + "/metrics")
+    m = json.loads(body)
+    assert ctype.startswith("application/json")
+    assert m["rendered"]["misses"] == 2 and m["latency"]["render"] == {**m["latency"]["render"], "requests": 3, "errors": 2}
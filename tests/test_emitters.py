@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import pytest
+
+from action_teller.emitters import EMITTERS, emit_all
+from action_teller.renderers.model import (
+    BulletList, CodeBlock, Document, Heading, ListItem, Paragraph, Quote, Rule, Table, bullets,
+)
+
+GOLDEN = Path(__file__).parent / "fixtures" / "golden"
+
+DOC = Document(
+    kind="action",
+    title="Setup <Tool> & more",
+    source="tools/setup/action.yml",
+    blocks=(
+        Heading(1, "Setup `tool`"),
+        Paragraph("Installs **fast**, see [docs](https://example.com/a?b=1&c=2) or _the guide_.<br/>Second [line](https://example.com/?q=\"x\")."),
+        Quote("_Heads up:_ uses `node20`"),
+        Table(("Name", "Required", "Default"), (
+            ("`version`", "yes", "`1.0`"),
+            ("`cache`", "no", "a | b < c"),
+        )),
+        CodeBlock("echo \"<x>\" && cat <<'EOF'\n]]> end\nEOF", "bash"),
+        CodeBlock("plain"),
+        BulletList((
+            ListItem("**Job:** `build`", (
+                bullets(["step one", "step `two`"]),
+                CodeBlock("make all", "bash"),
+                Paragraph("after"),
+            )),
+            ListItem("second"),
+        )),
+        Rule(),
+        Heading(3, "Done"),
+    ),
+)
+
+
+@pytest.mark.parametrize("fmt", sorted(EMITTERS))
+def test_golden_output(fmt):
+    golden = GOLDEN / f"document{EMITTERS[fmt].extension}"
+    assert emit_all(DOC, [fmt])[fmt] == golden.read_text(encoding="utf-8")
@@ -0,0 +1,23 @@
+from action_teller.utils.expander import LocalExpander
+
+COMPOSITE = "runs:\n  using: composite\n  steps:\n    - run: echo hi\n      shell: bash\n"
+
+
+def test_local_composite_is_expanded(tmp_path):
+    (tmp_path / "repo" / "act").mkdir(parents=True)
+    (tmp_path / "repo" / "act" / "action.yml").write_text(COMPOSITE)
+    item = LocalExpander(tmp_path / "repo")("./act")
+    assert "Not expanded" not in item.text
+
+
+def test_references_outside_root_are_not_read(tmp_path):
+    (tmp_path / "secret").mkdir()
+    (tmp_path / "secret" / "action.yml").write_text(COMPOSITE)
+    (tmp_path / "repo").mkdir()
+    (tmp_path / "repo" / "link").symlink_to(tmp_path / "secret")
+    expander = LocalExpander(tmp_path / "repo")
+    for uses in ("./../secret", "./link"):
+        item = expander(uses)
+        assert item.text == f"_Not expanded: `{uses}` resolves outside the repository_"
+        assert not item.children
+    assert expander.deps() == ()
@@ -0,0 +1,89 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from action_teller.utils.git_source import BlobReader, GitChange, GitError, changed_files, parse_range
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(root, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", "-c", "commit.gpgsign=false", *args],
+        cwd=str(root), check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    ).stdout.decode().strip()
+
+
+def _write(root, rel, text):
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git(root, "init", "-q")
+    _write(root, "ci.yml", "name: CI\n")
+    _write(root, "old name.yml", "name: Old\n")
+    _write(root, "keep.yml", "name: Keep\n")
+    _write(root, "sub/action.yml", "name: Sub\n")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-qm", "base")
+
+    _git(root, "mv", "old name.yml", "new name.yml")
+    _git(root, "rm", "-q", "ci.yml")
+    _write(root, "ünï cødé/action.yml", "name: Ünï\n")
+    _write(root, "sub/action.yml", "name: Sub 2\n")
+    os.symlink("keep.yml", root / "link.yml")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-qm", "head")
+    return root
+
+
+def test_parse_range():
+    assert parse_range("main..feature") == ("main..feature", "feature")
+    assert parse_range("main...") == ("main...HEAD", "HEAD")
+    assert parse_range("v1..") == ("v1..HEAD", "HEAD")
+    for bad in ("main", "..HEAD", "...x"):
+        with pytest.raises(GitError):
+            parse_range(bad)
+
+
+def test_renames_deletes_and_odd_names(repo):
+    changes = sorted(changed_files(repo, "HEAD~1..HEAD"))
+    blob = {c.path: c.blob for c in changes}
+    assert changes == sorted([
+        GitChange(repo / "ci.yml", None),
+        GitChange(repo / "new name.yml", blob[repo / "new name.yml"]),
+        GitChange(repo / "old name.yml", None),
+        GitChange(repo / "sub" / "action.yml", blob[repo / "sub" / "action.yml"]),
+        GitChange(repo / "ünï cødé" / "action.yml", blob[repo / "ünï cødé" / "action.yml"]),
+    ])   # the symlink is left out
+    with BlobReader(repo) as reader:
+        assert reader.read(blob[repo / "new name.yml"]) == b"name: Old\n"
+        assert reader.read(blob[repo / "ünï cødé" / "action.yml"]) == "name: Ünï\n".encode()
+        assert reader.read(blob[repo / "sub" / "action.yml"]) == b"name: Sub 2\n"
+
+
+def test_paths_are_relative_to_a_subdirectory_root(repo):
+    sub = repo / "sub"
+    assert [c.path for c in changed_files(sub, "HEAD~1..HEAD")] == [sub / "action.yml"]
+
+
+def test_missing_objects_and_refs(repo):
+    with BlobReader(repo) as reader:
+        with pytest.raises(GitError, match="missing"):
+            reader.read("0" * 40)
+        # The batch process is still in step after a miss.
+        assert reader.read(_git(repo, "rev-parse", "HEAD:keep.yml")) == b"name: Keep\n"
+    with pytest.raises(GitError):
+        changed_files(repo, "nope..HEAD")
+
+
+def test_outside_a_repository(tmp_path):
+    with pytest.raises(GitError, match="not a git repository"):
+        changed_files(tmp_path, "HEAD~1..HEAD")
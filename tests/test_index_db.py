@@ -0,0 +1,193 @@
+import inspect
+import json
+import sqlite3
+
+import pytest
+from click.testing import CliRunner
+
+from action_teller.cli import cli
+from action_teller.utils.index_db import INDEX_FILENAME, IndexDB, index_facts, open_index_readonly, run_query
+
+WORKFLOW = """name: Deploy
+on:
+  push:
+  workflow_dispatch:
+    inputs:
+      env: {description: Target, required: true}
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - run: make ${{ vars.TARGET }}
+        env: {TOKEN: "${{ secrets.DEPLOY_KEY }}"}
+  ship:
+    needs: build
+    uses: acme/pipelines/.github/workflows/ship.yml@main
+"""
+
+ACTION = """name: Setup
+description: Sets up
+inputs:
+  version: {description: Version, default: "1.0"}
+outputs:
+  path: {description: Where, value: "${{ steps.i.outputs.path }}"}
+runs:
+  using: composite
+  steps:
+    - id: i
+      uses: actions/checkout@v3
+"""
+
+
+def _rows(db_path, sql):
+    db = open_index_readonly(db_path)
+    try:
+        return run_query(db, sql)[1]
+    finally:
+        db.close()
+
+
+def test_facts_of_a_workflow_and_an_action(tmp_path):
+    from action_teller.utils.yaml_loader import parse_yaml_bytes
+    wf = json.loads(index_facts("workflow", tmp_path / "deploy.yml", parse_yaml_bytes(WORKFLOW.encode())))
+    assert wf["name"] == "Deploy"
+    rows = wf["rows"]
+    assert rows["triggers"] == [["push"], ["workflow_dispatch"]]
+    assert rows["inputs"] == [["env", "workflow_dispatch", "Target", "true", ""]]
+    assert rows["jobs"] == [["build", None, "ubuntu-latest", None],
+                            ["ship", None, None, "acme/pipelines/.github/workflows/ship.yml@main"]]
+    assert rows["uses"] == [["build", 1, "actions/checkout@v4", "actions/checkout", "v4"],
+                            ["ship", None, "acme/pipelines/.github/workflows/ship.yml@main",
+                             "acme/pipelines/.github/workflows/ship.yml", "main"]]
+    assert rows["secrets"] == [["DEPLOY_KEY"]] and rows["vars"] == [["TARGET"]]
+
+    action = json.loads(index_facts("action", tmp_path / "action.yml", parse_yaml_bytes(ACTION.encode())))["rows"]
+    assert action["actions"] == [["Setup", "Sets up", "", "composite"]]
+    assert action["outputs"] == [["path", "Where", "${{ steps.i.outputs.path }}"]]
+    assert action["steps"] == [[None, 1, None, "i", "actions/checkout@v3", None]]
+
+
+def _facts(name, secret):
+    return json.dumps({"name": name, "rows": {"workflows": [[name]], "secrets": [[secret]]}})
+
+
+def test_update_replaces_rows_only_when_content_changes(tmp_path):
+    src = tmp_path / "w.yml"
+    src.write_text("x")
+    db_path = tmp_path / INDEX_FILENAME
+    index = IndexDB(db_path)
+    assert index.update("workflow", src, "d1", _facts("W", "A"))
+    index.save()
+
+    index = IndexDB(db_path)
+    assert not index.update("workflow", src, "d1", _facts("W", "B"))     # same hash: rows kept
+    assert index.update("workflow", src, "d2", _facts("W2", "C"))
+    assert index.updated == 1
+    index.save()
+    assert _rows(db_path, "SELECT name FROM files") == [("W2",)]
+    assert _rows(db_path, "SELECT name FROM secrets") == [("C",)]       # old rows cascaded away
+
+
+def test_files_not_seen_are_pruned_and_removed(tmp_path):
+    db_path = tmp_path / INDEX_FILENAME
+    index = IndexDB(db_path)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.yml").write_text(name)
+        index.update("workflow", tmp_path / f"{name}.yml", name, _facts(name, name.upper()))
+    index.save()
+
+    index = IndexDB(db_path)
+    index.update("workflow", tmp_path / "a.yml", "a", None)
+    index.update("workflow", tmp_path / "b.yml", "b", None)
+    index.remove("workflow", tmp_path / "b.yml")
+    index.save(prune=False)
+    assert _rows(db_path, "SELECT name FROM files ORDER BY name") == [("a",), ("c",)]
+
+    index = IndexDB(db_path)
+    index.update("workflow", tmp_path / "a.yml", "a", None)
+    index.save()
+    assert _rows(db_path, "SELECT name FROM files") == [("a",)]
+    assert _rows(db_path, "SELECT name FROM secrets") == [("A",)]
+
+
+def test_content_without_a_hash_is_tracked_by_stat(tmp_path):
+    src = tmp_path / "w.yml"
+    src.write_text("x")
+    index = IndexDB(tmp_path / INDEX_FILENAME)
+    assert index.update("workflow", src, None, _facts("W", "A"))
+    assert not index.update("workflow", src, None, _facts("W", "B"))
+    src.write_text("longer")
+    assert index.update("workflow", src, None, _facts("W", "B"))
+    index.save()
+
+
+@pytest.fixture
+def built(tmp_path):
+    root, out = tmp_path / "repo", tmp_path / "out"
+    (root / ".github" / "workflows").mkdir(parents=True)
+    (root / ".github" / "workflows" / "deploy.yml").write_text(WORKFLOW)
+    (root / "setup").mkdir()
+    (root / "setup" / "action.yml").write_text(ACTION)
+
+    def build():
+        result = CliRunner().invoke(cli, ["-p", str(root), "-o", str(out), "--actions", "--workflows"])
+        assert result.exit_code == 0, result.output
+        return result.output
+
+    build()
+    return root, out, build
+
+
+# Click < 8.2 mixes stderr into stdout unless told not to; 8.2 dropped the switch.
+_SEPARATE_STDERR = {"mix_stderr": False} if "mix_stderr" in inspect.signature(CliRunner).parameters else {}
+
+
+def _query(out, *args):
+    return CliRunner(**_SEPARATE_STDERR).invoke(cli, ["query", "-o", str(out), *args])
+
+
+def test_query_output(built):
+    root, out, _ = built
+    result = _query(out, "secret", "DEPLOY_KEY")
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["kind\tname\tpath",
+                                          f"workflow\tDeploy\t{root / '.github' / 'workflows' / 'deploy.yml'}"]
+    assert result.stderr.startswith("1 row(s) in ")
+
+    result = _query(out, "uses", "actions/checkout", "--json")
+    assert [json.loads(line) for line in result.stdout.splitlines()] == [
+        {"kind": "workflow", "path": str(root / ".github" / "workflows" / "deploy.yml"),
+         "job": "build", "step": 1, "ref": "actions/checkout@v4"},
+        {"kind": "action", "path": str(root / "setup" / "action.yml"), "job": None, "step": 1,
+         "ref": "actions/checkout@v3"},
+    ]
+    assert _query(out, "uses", "actions/checkout@v3", "--no-header").stdout == f"action\t{root / 'setup' / 'action.yml'}\t\t1\tactions/checkout@v3\n"
+    assert _query(out, "--sql", "SELECT count(*) AS n FROM steps WHERE file_id IN"
+                  " (SELECT id FROM files WHERE kind = ?)", "workflow").stdout == "n\n2\n"
+
+
+def test_query_errors(built, tmp_path):
+    _, out, _ = built
+    assert _query(out, "nope").exit_code == 2
+    assert "needs a VALUE" in _query(out, "secret").stderr
+    result = _query(out, "--sql", "DELETE FROM files")
+    assert result.exit_code == 1 and "query failed" in result.stderr
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    result = _query(empty, "actions")
+    assert result.exit_code == 1 and "No index at" in result.stderr
+    assert _rows(out / INDEX_FILENAME, "SELECT count(*) FROM files") == [(2,)]
+
+
+def test_rebuild_drops_deleted_and_reindexes_changed_files(built):
+    root, out, build = built
+    (root / "setup" / "action.yml").unlink()
+    wf = root / ".github" / "workflows" / "deploy.yml"
+    wf.write_text(wf.read_text().replace("DEPLOY_KEY", "SHIP_KEY"))
+    assert "Index: 1 file(s) re-indexed" in build()
+    assert _query(out, "actions").stdout == "name\tusing\tpath\n"
+    assert _query(out, "secret", "DEPLOY_KEY").stdout == "kind\tname\tpath\n"
+    assert _query(out, "secret", "SHIP_KEY", "--no-header").stdout.startswith("workflow\tDeploy\t")
+    with sqlite3.connect(out / INDEX_FILENAME) as db:
+        assert db.execute("SELECT count(*) FROM uses").fetchone() == (2,)
@@ -0,0 +1,73 @@
+from action_teller.utils.job_graph import analyze, job_graph, mermaid
+
+
+def _graph(**needs):
+    return job_graph({"jobs": {j: ({"needs": n} if n is not None else {}) for j, n in needs.items()}})
+
+
+def test_unknown_and_expression_needs_are_set_aside():
+    g = _graph(build=None, test=["build", "build", "lint", "${{ inputs.after }}"], deploy="test")
+    assert g.needs == {"build": [], "test": ["build"], "deploy": ["test"]}
+    assert g.unknown == [("test", "lint")]
+
+
+def test_critical_path_follows_durations():
+    g = _graph(a=None, b=None, c=["a"], d=["b"], e=["c", "d"])
+    assert analyze(g).critical_path == ["a", "c", "e"]       # ties go to the job first in the file
+    r = analyze(g, {"b": 10})
+    assert r.critical_path == ["b", "d", "e"] and r.critical_length == 12
+
+
+def test_width_is_the_widest_longest_path_level():
+    g = _graph(a=None, b=None, c=None, d=["a"], e=["a", "b"])
+    r = analyze(g)
+    assert (r.width, r.widest_level) == (3, ["a", "b", "c"])
+    assert r.leaves == ["c", "d", "e"]
+
+
+def test_width_is_not_the_true_maximum_concurrency():
+    # Levels are {a}, {b, x}, {c, y}, {d, z}, so the widest has 2 jobs, yet x, y,
+    # z and d need nothing of each other and can all be running at once.
+    g = _graph(a=None, b="a", c="b", d="c", x="a", y="b", z="c")
+    r = analyze(g)
+    assert (r.width, r.widest_level) == (2, ["b", "x"])
+    assert r.leaves == ["d", "x", "y", "z"]
+
+
+def test_cycles_are_found_and_left_out_of_the_path():
+    g = _graph(a=None, b=["a", "d"], c="b", d="c", e="e", f="d")
+    r = analyze(g)
+    assert r.cycles == [["b", "c", "d"], ["e"]]
+    assert r.critical_path == ["a"]
+    assert "f" not in r.widest_level
+
+
+def test_long_chains_do_not_recurse():
+    n = 5000
+    jobs = {f"j{i}": ({"needs": f"j{i - 1}"} if i else {}) for i in range(n)}
+    jobs["j0"] = {"needs": f"j{n - 1}"}
+    r = analyze(job_graph({"jobs": jobs}))
+    assert len(r.cycles) == 1 and len(r.cycles[0]) == n
+
+
+def test_mermaid_output():
+    g = _graph(build=None, test=["build", "lint"], deploy="test", docs="build")
+    assert mermaid(g, analyze(g)) == "\n".join([
+        "flowchart LR",
+        '    j0["build"]',
+        '    j1["test"]',
+        '    j2["deploy"]',
+        '    j3["docs"]',
+        "    j0 ==> j1",
+        "    j1 ==> j2",
+        "    j0 --> j3",
+        '    u0["lint (missing)"] -.-> j1',
+        "    classDef critical stroke-width:3px",
+        "    class j0,j1,j2 critical",
+    ])
+
+
+def test_mermaid_marks_cycles():
+    g = _graph(a="b", b="a")
+    out = mermaid(g, analyze(g))
+    assert out.endswith('    classDef cycle stroke:#d00,stroke-dasharray:4\n    class j0,j1 cycle')
@@ -0,0 +1,146 @@
+import inspect
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from action_teller.cli import cli
+from action_teller.utils import lint
+from action_teller.utils.lint import ERROR, WARNING, lint_file, lint_files
+
+BAD_ACTION = """name: Bad
+description: d
+runs:
+  using: node99
+  main: index.js
+"""
+
+OLD_ACTION = """name: Old
+description: d
+inputs:
+  token: {description: Token}
+runs:
+  using: node16
+  main: index.js
+"""
+
+BAD_WORKFLOW = """on: push
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+      - run: make
+  test:
+    needs: [build, lint]
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+"""
+
+VAGUE_WORKFLOW = """on:
+  workflow_dispatch:
+    inputs:
+      env:
+        type: string
+jobs:
+  a:
+    runs-on: x
+    steps:
+      - run: make
+"""
+
+GOOD_WORKFLOW = """on: push
+jobs:
+  a:
+    runs-on: x
+    steps:
+      - run: make
+"""
+
+_SEPARATE_STDERR = {"mix_stderr": False} if "mix_stderr" in inspect.signature(CliRunner).parameters else {}
+
+
+def _file(tmp_path, rel, text):
+    p = tmp_path / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text)
+    return p
+
+
+def _brief(diagnostics):
+    return [(d.line, d.column, d.severity, d.code) for d in diagnostics]
+
+
+def test_action_error_and_warning_positions(tmp_path):
+    bad = _file(tmp_path, "bad/action.yml", BAD_ACTION)
+    [d] = lint_file("action", bad)
+    assert (d.line, d.column, d.severity, d.code) == (4, 10, ERROR, "unknown-using")
+    assert d.format() == f"{bad}:4:10: error: {d.message} [unknown-using]"
+
+    old = _file(tmp_path, "old/action.yml", OLD_ACTION)
+    assert _brief(lint_file("action", old)) == [(6, 10, WARNING, "deprecated-using")]
+
+
+def test_workflow_error_and_warning_positions(tmp_path):
+    bad = _file(tmp_path, "bad.yml", BAD_WORKFLOW)
+    [d] = lint_file("workflow", bad)
+    assert (d.line, d.column, d.code) == (8, 20, "needs-unknown")
+    assert "'lint'" in d.message
+
+    vague = _file(tmp_path, "vague.yml", VAGUE_WORKFLOW)
+    assert _brief(lint_file("workflow", vague)) == [(4, 7, WARNING, "input-description")]
+
+
+def test_syntax_errors_and_structure(tmp_path):
+    broken = _file(tmp_path, "broken.yml", "on: push\njobs: [a\n")
+    [d] = lint_file("workflow", broken)
+    assert (d.severity, d.code) == (ERROR, "syntax") and d.line == 3
+
+    assert _brief(lint_file("workflow", _file(tmp_path, "empty.yml", ""))) == [(1, 1, ERROR, "empty")]
+    dup = _file(tmp_path, "dup.yml", "on: push\njobs:\n  a:\n    runs-on: x\n  a:\n    uses: o/r/.github/workflows/w.yml@v1\n"
+                                     "    steps: []\n")
+    assert _brief(lint_file("workflow", dup)) == [(5, 3, ERROR, "duplicate-key"), (7, 5, ERROR, "job-steps")]
+    composite = _file(tmp_path, "c/action.yml", "name: C\ndescription: d\noutputs:\n  o: {description: x}\n"
+                                                "runs:\n  using: composite\n  steps:\n    - run: make\n")
+    assert _brief(lint_file("action", composite)) == [(4, 3, ERROR, "missing-key"), (8, 7, ERROR, "shell-required")]
+
+
+def test_pool_keeps_file_order(tmp_path, monkeypatch):
+    files = [("workflow", _file(tmp_path, f"w{i}.yml", (BAD_WORKFLOW, GOOD_WORKFLOW, VAGUE_WORKFLOW)[i % 3]))
+             for i in range(9)]
+    serial = list(lint_files(files))
+    monkeypatch.setattr(lint, "PARALLEL_MIN_FILES", 2)
+    assert list(lint_files(files, jobs=2)) == serial
+    assert [len(d) for d in serial] == [1, 0, 1] * 3
+
+
+def _lint(*args):
+    return CliRunner(**_SEPARATE_STDERR).invoke(cli, ["lint", *args])
+
+
+@pytest.fixture
+def tree(tmp_path):
+    _file(tmp_path, ".github/workflows/ok.yml", GOOD_WORKFLOW)
+    _file(tmp_path, "old/action.yml", OLD_ACTION)
+    _file(tmp_path, "config.yml", "key: value\n")
+    return tmp_path
+
+
+def test_exit_codes(tree):
+    warned = _lint("-p", str(tree))
+    assert warned.exit_code == 0
+    assert warned.stdout == f"{tree / 'old' / 'action.yml'}:6:10: warning: runs.using 'node16' is deprecated [deprecated-using]\n"
+    assert warned.stderr == "2 file(s) checked: 0 error(s), 1 warning(s).\n"
+    assert _lint("-p", str(tree), "--strict").exit_code == 1
+
+    bad = _file(tree, ".github/workflows/bad.yml", BAD_WORKFLOW)
+    failed = _lint("-p", str(tree), "--json")
+    assert failed.exit_code == 1
+    records = [json.loads(line) for line in failed.stdout.splitlines()]
+    assert [(r["path"], r["line"], r["column"], r["severity"]) for r in records] == [
+        (str(tree / "old" / "action.yml"), 6, 10, "warning"), (str(bad), 8, 20, "error")]
+
+    # Named files: only those are checked, and plain YAML is skipped.
+    clean = _lint(str(tree / ".github" / "workflows" / "ok.yml"), str(tree / "config.yml"))
+    assert clean.exit_code == 0 and clean.stdout == ""
+    assert clean.stderr == "1 file(s) checked: 0 error(s), 0 warning(s).\n"
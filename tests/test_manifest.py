@@ -0,0 +1,35 @@
+import pytest
+
+from action_teller.utils.manifest import ManifestError, load_manifest
+
+
+def _manifest(tmp_path, text):
+    p = tmp_path / "repos.yaml"
+    p.write_text(text)
+    return p
+
+
+def test_entries_resolve_against_the_manifest_and_out(tmp_path):
+    repos = load_manifest(_manifest(tmp_path, "repos:\n  - path: a\n    out: docs-a\n  - b\n"), tmp_path / "out")
+    assert [(r.name, r.path, r.out) for r in repos] == [
+        ("a", tmp_path / "a", tmp_path / "out" / "docs-a"),
+        ("b", tmp_path / "b", tmp_path / "out" / "b"),
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "- path: a\n  out: .\n",                                   # would overwrite the combined index
+    "- path: a\n  out: ..\n",
+    "- path: a\n  out: ../elsewhere\n",
+    "- path: a\n  out: x\n- path: b\n  out: x\n",
+    "- path: a\n  out: x\n- path: b\n  out: x/nested\n",
+    "- path: a\n  out: x/nested\n- path: b\n  out: x\n",
+], ids=["root", "parent", "outside", "same", "nested", "enclosing"])
+def test_root_and_overlapping_outputs_are_rejected(tmp_path, text):
+    with pytest.raises(ManifestError):
+        load_manifest(_manifest(tmp_path, text), tmp_path / "out")
+
+
+def test_duplicate_names_are_rejected(tmp_path):
+    with pytest.raises(ManifestError, match="duplicate"):
+        load_manifest(_manifest(tmp_path, "- one/repo\n- two/repo\n"), tmp_path / "out")
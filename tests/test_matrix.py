@@ -0,0 +1,88 @@
+import pytest
+
+from action_teller.utils.matrix import MatrixCount, count_matrix, job_estimates
+
+
+def _matrix(**matrix):
+    return {"matrix": matrix}
+
+
+def test_plain_product():
+    assert count_matrix(_matrix(os=["linux", "mac"], py=["3.8", "3.9", "3.10"])) == MatrixCount(6, 0, 0, 6, None)
+
+
+def test_exclude_with_a_partial_key_removes_every_match():
+    # {os: mac} names one axis and matches all three mac combinations.
+    c = count_matrix(_matrix(os=["linux", "mac"], py=[1, 2, 3], exclude=[{"os": "mac"}, {"os": "linux", "py": 1}]))
+    assert (c.combinations, c.excluded, c.jobs) == (6, 4, 2)
+
+
+def test_overlapping_and_impossible_excludes_count_once():
+    c = count_matrix(_matrix(os=["linux", "mac"], py=[1, 2], exclude=[
+        {"os": "mac"}, {"os": "mac", "py": 1},      # the second is inside the first
+        {"os": "windows"},                           # no such value
+        {"arch": "arm"},                             # no such axis
+    ]))
+    assert (c.excluded, c.jobs) == (2, 2)
+
+
+def test_include_that_extends_an_existing_combination_adds_no_job():
+    # New keys, or axis values that match, merge into the existing combination.
+    c = count_matrix(_matrix(os=["linux", "mac"], include=[{"os": "mac", "xcode": "15"}, {"experimental": True}]))
+    assert (c.added, c.jobs) == (0, 2)
+
+
+def test_include_that_cannot_merge_adds_a_combination():
+    c = count_matrix(_matrix(os=["linux", "mac"], py=[1, 2], include=[
+        {"os": "windows"},                  # value not on the axis
+        {"os": "linux", "py": 3},           # would overwrite py
+        {"os": "linux", "py": 2, "x": 1},   # merges
+    ]))
+    assert (c.combinations, c.added, c.jobs) == (4, 2, 6)
+
+
+def test_include_can_bring_back_an_excluded_combination():
+    c = count_matrix(_matrix(os=["linux", "mac"], exclude=[{"os": "mac"}], include=[{"os": "mac"}]))
+    assert (c.excluded, c.added, c.jobs) == (1, 1, 2)
+
+
+def test_include_only_matrix():
+    assert count_matrix(_matrix(include=[{"os": "a"}, {"os": "b"}])).jobs == 2
+
+
+def test_duplicate_axis_values_each_start_a_job():
+    assert count_matrix(_matrix(os=["linux", "linux"])).jobs == 2
+
+
+def test_max_parallel():
+    assert count_matrix({"matrix": {"os": ["a"]}, "max-parallel": 2}).max_parallel == 2
+
+
+def test_large_matrix_is_counted_without_enumeration():
+    axes = {f"a{i}": list(range(10)) for i in range(7)}
+    c = count_matrix(_matrix(**axes, exclude=[{"a0": 0}, {"a1": 1, "a2": 2}]))
+    assert c.combinations == 10 ** 7
+    assert c.jobs == 10 ** 7 - 10 ** 6 - 10 ** 5 + 10 ** 4
+
+
+@pytest.mark.parametrize("strategy", [
+    {"matrix": "${{ fromJSON(needs.setup.outputs.matrix) }}"},
+    _matrix(os="${{ fromJSON(needs.setup.outputs.os) }}"),
+    _matrix(os=["linux", "${{ inputs.extra }}"]),
+    _matrix(os=["linux"], include="${{ fromJSON(inputs.include) }}"),
+    _matrix(os=["linux"], exclude="${{ fromJSON(inputs.exclude) }}"),
+], ids=["matrix", "axis", "axis-value", "include", "exclude"])
+def test_expression_valued_matrices_are_unknown(strategy):
+    assert count_matrix(strategy) is None
+
+
+def test_job_estimates_report_unknown_instances_for_expressions(tmp_path):
+    data = {"on": "push", "jobs": {
+        "static": {"strategy": _matrix(os=["a", "b"])},
+        "dynamic": {"strategy": {"matrix": "${{ fromJSON(x) }}"}},
+        "plain": {},
+    }}
+    est = {e.job: e for e in job_estimates(data, tmp_path / "ci.yml")}
+    assert est["static"].instances == 2
+    assert est["dynamic"].instances is None and est["dynamic"].matrix is None
+    assert est["plain"].instances == 1
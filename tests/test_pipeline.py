@@ -0,0 +1,52 @@
+from action_teller.utils import pipeline
+from action_teller.utils.build_cache import BuildCache
+from action_teller.utils.pipeline import ACTION, WORKFLOW, DocTask, build_docs
+
+WORKFLOW_YAML = "name: W{i}\non: push\njobs:\n  a:\n    runs-on: x\n    steps:\n      - run: echo ${{{{ secrets.S{i} }}}}\n"
+ACTION_YAML = "name: A{i}\ndescription: d\nruns:\n  using: node20\n  main: index.js\n"
+
+
+def _tasks(root, n=6):
+    tasks = []
+    for i in range(n):
+        wf = root / f"w{i}.yml"
+        wf.write_text(WORKFLOW_YAML.format(i=i))
+        d = root / f"a{i}"
+        d.mkdir()
+        (d / "action.yml").write_text(ACTION_YAML.format(i=i))
+        tasks += [DocTask(WORKFLOW, wf), DocTask(ACTION, d / "action.yml")]
+    return tasks
+
+
+def _summary(results):
+    return [(r.kind, r.path, r.name, r.outputs) for r in results]
+
+
+def test_pool_windows_keep_task_order(tmp_path, monkeypatch):
+    tasks = _tasks(tmp_path)
+    serial = _summary(build_docs(tasks, jobs=1))
+    monkeypatch.setattr(pipeline, "WINDOW_PER_WORKER", 2)
+    assert _summary(build_docs(tasks, jobs=2)) == serial
+
+
+def test_tasks_and_cached_entries_are_taken_one_at_a_time(tmp_path):
+    tasks = _tasks(tmp_path)
+    out = tmp_path / "out"
+    out.mkdir()
+    cache = BuildCache(out, options={})
+    list(build_docs(tasks, cache=cache))
+    cache.save()
+
+    consumed = []
+
+    def stream():
+        for t in tasks:
+            consumed.append(t)
+            yield t
+
+    warm = BuildCache(out, options={})
+    results = build_docs(stream(), cache=warm)
+    first = next(results)
+    assert first.outputs and warm.hits == 1 and len(consumed) == 1
+    assert len(list(results)) == len(tasks) - 1
+    assert warm.hits == len(tasks) and warm.misses == 0
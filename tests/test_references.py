@@ -0,0 +1,67 @@
+import datetime
+from pathlib import Path
+
+import pytest
+
+from action_teller.bench.corpus import CorpusSpec, generate_corpus
+from action_teller.bench.legacy_refs import legacy_references
+from action_teller.renderers.workflow_markdown import index_references
+from action_teller.utils.yaml_loader import parse_action_yaml
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "yaml").glob("*.yml"))
+
+
+def _same_as_legacy(data):
+    old, new = legacy_references(data), index_references(data)
+    assert new.expressions == old.expressions
+    assert new.contexts == old.contexts
+    assert new.secrets == old.secrets
+    assert new.vars == old.vars
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda p: p.name)
+def test_fixtures_match_the_old_scans(path):
+    _same_as_legacy(parse_action_yaml(path))
+
+
+def test_generated_corpus_matches_the_old_scans(tmp_path):
+    generate_corpus(tmp_path, CorpusSpec(actions=10, workflows=10, noise=0, jobs=4, job_steps=3))
+    files = sorted(tmp_path.rglob("*.yml")) + sorted(tmp_path.rglob("*.yaml"))
+    assert files
+    for f in files:
+        _same_as_legacy(parse_action_yaml(f))
+
+
+@pytest.mark.parametrize("data", [
+    {"on": "push", "env": {"secrets.FROM_KEY": "x"}},                       # keys are scanned too
+    {"on": "push", "run": 'echo "${{ github.ref }}" ${{ vars.A }}${{ vars.B }}'},
+    {"on": "push", "run": "${{\n  steps.build.outputs.tag }}"},
+    {"on": "push", "run": "a\\${{ env.X }}\ttab"},                            # backslashes and tabs
+    {"on": "push", "run": "${{ x\nsecrets.A }}"},                           # "\n" joins n+secrets
+    {"on": "push", "run": "é ${{ \x85secrets.X }} ü"},                       # kept raw, as ensure_ascii=False
+    {"on": "push", "jobs": {"a": {"steps": [{"run": "${{ matrix.os }}"}] * 3}}},
+    {"on": ["push"], "x": [1, 2.5, True, None, {"y": "${{ inputs.z }}"}]},
+], ids=range(8))
+def test_escaping_and_shapes_match_the_old_scans(data):
+    _same_as_legacy(data)
+
+
+def test_datetimes_are_skipped_where_the_old_path_fell_back_to_str():
+    # json.dumps rejects dates, so the old path scanned str(data) instead, with
+    # Python repr escaping. The walk ignores the date and keeps JSON escaping.
+    data = {"on": "push", "when": datetime.date(2024, 1, 1), "run": "${{ github.sha }} ${{ secrets.T }}"}
+    _same_as_legacy(data)
+    data["run"] = "${{ \x85secrets.X }}"
+    old, new = legacy_references(data), index_references(data)
+    assert old.expressions == {"\\x85secrets.X "} and old.contexts == set()
+    assert new.expressions == {"secrets.X "} and new.contexts == {"secrets"}  # U+0085 is \s to the regex
+    assert index_references({"on": "push", "run": data["run"]}).contexts == new.contexts
+
+
+def test_expressions_never_span_two_strings():
+    # The old regex ran over the whole dump and could join the end of one
+    # string to the start of the next; the walk scans each string on its own.
+    data = {"on": "push", "a": "${{ github", "b": "ref }}"}
+    old, new = legacy_references(data), index_references(data)
+    assert old.expressions == {'github",\n  "b": "ref '} and old.contexts == {"github"}
+    assert new.expressions == set() and new.contexts == set()
@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from action_teller.utils import summary_scheduler
+from action_teller.utils.ollama import retryable
+from action_teller.utils.summary_cache import SummaryCache
+from action_teller.utils.summary_scheduler import DEADLINE_PLACEHOLDER, SummaryScheduler
+
+pytest.importorskip("ollama")
+
+
+class FakeOllama(ThreadingHTTPServer):
+    """Answers /api/chat like Ollama; `status` and `delay` shape the next responses."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.status = 200
+        self.delay = 0.0
+        self.calls = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.calls += 1
+        time.sleep(self.server.delay)
+        if self.server.status != 200:
+            payload = {"error": "model not found"}
+        else:
+            payload = {"model": body["model"], "created_at": "2024-01-01T00:00:00Z", "done": True,
+                       "message": {"role": "assistant", "content": " summary of " + body["messages"][0]["content"]}}
+        out = json.dumps(payload).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def ollama_server():
+    server = FakeOllama()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = SummaryCache(tmp_path / "summaries.sqlite3")
+    yield c
+    c.close()
+
+
+def scheduler(server, cache, **kwargs):
+    kwargs.setdefault("retries", 0)
+    kwargs.setdefault("backoff", 0.01)
+    kwargs.setdefault("timeout", 5)
+    return SummaryScheduler(host=server.url, cache=cache, **kwargs)
+
+
+def test_summary_is_returned_and_cached(ollama_server, cache):
+    s = scheduler(ollama_server, cache)
+    key = s.submit("m", "prompt")
+    assert s.result(key) == "summary of prompt"
+    assert s.succeeded([key])
+    assert cache.get("m", "prompt") == "summary of prompt"
+    s.shutdown()
+
+
+def test_identical_requests_share_one_call(ollama_server, cache):
+    s = scheduler(ollama_server, cache)
+    keys = {s.submit("m", "same") for _ in range(5)}
+    assert len(keys) == 1
+    assert s.result(keys.pop()) == "summary of same"
+    assert ollama_server.calls == 1 and s.requested == 1
+    s.shutdown()
+
+
+def test_http_errors_are_retried_and_never_cached(ollama_server, cache):
+    ollama_server.status = 500
+    s = scheduler(ollama_server, cache, retries=2)
+    key = s.submit("m", "prompt")
+    assert s.result(key).startswith("_(Ollama error:")
+    assert ollama_server.calls == 3
+    assert not s.succeeded([key]) and s.failed == 1
+    assert cache.get("m", "prompt") is None
+    s.shutdown()
+
+
+def test_missing_model_and_other_4xx_are_not_retried(ollama_server, cache):
+    for status in (404, 400):
+        ollama_server.status, ollama_server.calls = status, 0
+        s = scheduler(ollama_server, cache, retries=3)
+        key = s.submit("m", f"prompt {status}")
+        assert "model not found" in s.result(key)
+        assert ollama_server.calls == 1 and s.failed == 1
+        s.shutdown()
+
+
+def test_timeouts_and_connection_errors_are_retried(ollama_server, cache, monkeypatch):
+    ollama_server.delay = 0.3
+    s = scheduler(ollama_server, cache, retries=1, timeout=0.1)
+    assert s.result(s.submit("m", "slow")).startswith("_(Ollama error:")
+    assert ollama_server.calls == 2
+    s.shutdown()
+
+    attempts = []
+
+    def refused(client, model, prompt):
+        attempts.append(model)
+        if len(attempts) < 3:
+            raise ConnectionError("Failed to connect to Ollama.")
+        return "third time"
+
+    monkeypatch.setattr(summary_scheduler, "ollama_chat", refused)
+    s = scheduler(ollama_server, cache, retries=2)
+    assert s.result(s.submit("m", "prompt")) == "third time" and len(attempts) == 3
+    s.shutdown()
+
+
+def test_retryable():
+    import httpx
+    from ollama import ResponseError
+
+    assert retryable(ResponseError("boom", 500)) and retryable(ResponseError("busy", 503))
+    assert not retryable(ResponseError("model 'x' not found", 404))
+    assert not retryable(ResponseError("bad request", 400))
+    assert retryable(TimeoutError()) and retryable(ConnectionError())
+    assert retryable(httpx.ReadTimeout("slow")) and retryable(httpx.ConnectError("refused"))
+    assert not retryable(KeyError("message")) and not retryable(ValueError("bad json"))
+
+
+def test_deadline_gives_placeholder_and_is_not_cached(ollama_server, cache):
+    ollama_server.delay = 0.5
+    s = scheduler(ollama_server, cache, deadline=0.1)
+    key = s.submit("m", "slow")
+    assert s.result(key) == DEADLINE_PLACEHOLDER
+    assert not s.succeeded([key]) and s.timed_out == 1
+    assert cache.get("m", "slow") is None
+    s.shutdown()
+
+
+def test_missing_ollama_is_a_failure_not_a_summary(ollama_server, cache, monkeypatch):
+    def no_ollama(host=None, timeout=None):
+        raise ImportError("No module named 'ollama'")
+
+    monkeypatch.setattr(summary_scheduler, "ollama_client", no_ollama)
+    s = scheduler(ollama_server, cache)
+    key = s.submit("m", "prompt")
+    assert s.result(key) == "_(Ollama not installed)_"
+    assert not s.succeeded([key]) and s.failed == 1
+    assert cache.get("m", "prompt") is None
+    s.shutdown()
+
+
+def test_unexpected_worker_error_gives_placeholder(ollama_server, cache, monkeypatch):
+    def broken(self, key, model, prompt):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(SummaryScheduler, "_call", broken)
+    s = scheduler(ollama_server, cache)
+    key = s.submit("m", "prompt")
+    assert s.result(key) == "_(Ollama error: boom)_"
+    assert not s.succeeded([key]) and s.failed == 1
+    assert cache.get("m", "prompt") is None
+    s.shutdown()
@@ -0,0 +1,29 @@
+from action_teller.utils.workflow_sniffer import looks_like_workflow, looks_like_workflow_bytes
+
+
+def test_top_level_on_is_enough(tmp_path):
+    p = tmp_path / "reusable.yml"
+    p.write_text("on:\n  workflow_call:\n")
+    assert looks_like_workflow(p)
+    assert looks_like_workflow_bytes(p.read_bytes())
+
+
+def test_files_without_top_level_on_are_skipped(tmp_path):
+    p = tmp_path / "config.yml"
+    p.write_text("jobs:\n  build: {}\nnested:\n  on: push\n")
+    assert not looks_like_workflow(p)
+    assert not looks_like_workflow_bytes(p.read_bytes())
+
+
+def test_on_past_the_sniffed_prefix_is_found(tmp_path):
+    p = tmp_path / "big.yml"
+    p.write_text("# " + "x" * 200 + "\n" + '"on": push\n')
+    assert looks_like_workflow(p, sniff_bytes=64)
+
+
+def test_utf8_bom_before_on_is_a_workflow(tmp_path):
+    p = tmp_path / "bom.yml"
+    p.write_bytes(b"\xef\xbb\xbfon: push\njobs: {}\n")
+    assert looks_like_workflow(p)
+    assert looks_like_workflow_bytes(p.read_bytes())
+    assert not looks_like_workflow_bytes(b"\xef\xbb\xbfname: x\n")
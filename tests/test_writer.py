@@ -0,0 +1,91 @@
+import os
+import stat
+from pathlib import Path
+
+from action_teller.utils.catalog import CatalogWriter
+from action_teller.utils.writer import DocWriter, atomic_write_bytes
+
+
+def _mode(p):
+    return stat.S_IMODE(os.stat(p).st_mode)
+
+
+def test_new_files_get_the_umask_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        p = tmp_path / "INDEX.md"
+        atomic_write_bytes(p, b"# Index\n")
+        assert p.read_bytes() == b"# Index\n"
+        assert _mode(p) == 0o644
+    finally:
+        os.umask(umask)
+
+
+def test_replaced_files_keep_their_mode(tmp_path):
+    p = tmp_path / "CI.md"
+    p.write_bytes(b"old")
+    os.chmod(p, 0o640)
+    atomic_write_bytes(p, b"new")
+    assert p.read_bytes() == b"new"
+    assert _mode(p) == 0o640
+    assert [f.name for f in tmp_path.iterdir()] == ["CI.md"]
+
+
+def test_catalog_gets_the_same_modes(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        p = tmp_path / "catalog.ndjson"
+        with CatalogWriter(p) as out:
+            out.add(("action", "a"), "{}")
+        assert _mode(p) == 0o644
+        os.chmod(p, 0o640)
+        with CatalogWriter(p) as out:
+            out.add(("action", "a"), "{}")
+        assert _mode(p) == 0o640
+    finally:
+        os.umask(umask)
+
+
+def test_catalog_appears_only_on_a_clean_close(tmp_path):
+    p = tmp_path / "catalog.ndjson"
+    p.write_text('{"old":1}\n')
+    with CatalogWriter(p) as out:
+        out.add(("action", "a"), '{"new":1}')
+        assert p.read_text() == '{"old":1}\n'
+    assert p.read_text() == '{"new":1}\n'
+
+    try:
+        with CatalogWriter(p) as out:
+            out.add(("action", "b"), '{"new":2}')
+            raise RuntimeError("build failed")
+    except RuntimeError:
+        pass
+    assert p.read_text() == '{"new":1}\n'
+    assert [f.name for f in tmp_path.iterdir()] == ["catalog.ndjson"]
+
+
+def _kind(f):
+    return "workflow"
+
+
+def test_partial_run_without_md_keeps_other_entries(tmp_path):
+    first = DocWriter(tmp_path, ("html",))
+    for name in ("CI", "Lint"):
+        f = Path(f"{name.lower()}.yml")
+        first.write(first.add(f, name, key=("workflow", f)), {"html": f"<p>{name}</p>"})
+    first.write_index()
+
+    second = DocWriter(tmp_path, ("html",))
+    assert second.load_index(_kind) == 2
+    assert second.remove(("workflow", Path("ci.yml")))
+    second.write_index()
+    assert not (tmp_path / "CI.html").exists()
+    index = (tmp_path / "INDEX.html").read_text()
+    assert "Lint.html" in index and "CI.html" not in index
+
+
+def test_entries_fall_back_to_index_md(tmp_path):
+    (tmp_path / "INDEX.md").write_text("# CIfolio — Documentation Index\n\n- [CI](CI.md) — `ci.yml`\n")
+    w = DocWriter(tmp_path, ("md",))
+    assert w.load_index(_kind) == 1
+    assert w.entries == {("workflow", Path("ci.yml")): ("CI", "CI", Path("ci.yml"))}
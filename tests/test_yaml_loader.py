@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+from action_teller.utils.yaml_loader import parse_action_yaml, yaml12_loaders
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "yaml").glob("*.yml"))
+
+SAFE, FAST = yaml12_loaders()
+needs_libyaml = pytest.mark.skipif(FAST is None, reason="PyYAML built without libyaml")
+
+
+@needs_libyaml
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda p: p.name)
+def test_libyaml_and_pure_python_loaders_agree(path):
+    assert parse_action_yaml(path, loader=FAST) == parse_action_yaml(path, loader=SAFE)
+
+
+@pytest.mark.parametrize("loader", [SAFE, FAST] if FAST else [SAFE], ids=lambda c: c.__name__)
+def test_yaml11_booleans_stay_strings(loader):
+    data = parse_action_yaml(Path(__file__).parent / "fixtures" / "yaml" / "booleans.yml", loader=loader)
+    assert data["on"] == "push"
+    assert data["yes"] == "y"
+    assert data["off"] == ["on", "off", "yes", "no", "On", "OFF", "Yes", "NO", "y", "n"]
+    assert data["flags"] == {"enabled": True, "disabled": False, "loud": True, "quoted": "yes"}
+
+
+@pytest.mark.parametrize("loader", [SAFE, FAST] if FAST else [SAFE], ids=lambda c: c.__name__)
+def test_anchors_and_merge_keys(loader):
+    data = parse_action_yaml(Path(__file__).parent / "fixtures" / "yaml" / "anchors.yml", loader=loader)
+    build, test = data["jobs"]["build"], data["jobs"]["test"]
+    assert build["runs-on"] == "ubuntu-latest" and build["timeout-minutes"] == 10
+    assert test["timeout-minutes"] == 10    # the first mapping in a merge list wins
+    assert test["env"] == {"CI": "true", "DEBUG": "off"}
+    assert test["steps"] == build["steps"]
+
+
+def test_on_key_is_a_string():
+    data = parse_action_yaml(Path(__file__).parent / "fixtures" / "yaml" / "workflow.yml")
+    assert "on" in data and True not in data
+    assert data["on"]["workflow_dispatch"]["inputs"]["debug"]["default"] == "no"
+
+
+def test_shared_resolver_is_untouched():
+    import yaml
+    yaml12_loaders()
+    assert yaml.safe_load("on: yes") == {True: True}